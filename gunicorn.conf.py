@@ -0,0 +1,43 @@
+"""
+gunicorn 프로덕션 설정 (pre-fork, 데이터 한 번 읽고 워커가 공유)
+
+    gunicorn                      # 저장소 최상위에서 실행하면 이 파일을 자동으로 읽음
+    gunicorn -c gunicorn.conf.py
+
+환경 변수:
+- WSGI_APP: 실행할 앱 (기본 mobile_app:app, 관리자 앱은 app:app)
+- BIND: 주소 (기본 0.0.0.0:5001)
+- WEB_CONCURRENCY: 워커 수 (기본 CPU 코어 수)
+- GUNICORN_THREADS: 워커당 스레드 수 (기본 1)
+"""
+
+import multiprocessing
+import os
+import sys
+
+pythonpath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+sys.path.insert(0, pythonpath)
+
+import prefork  # noqa: E402
+
+wsgi_app = os.environ.get("WSGI_APP", "mobile_app:app")
+bind = os.environ.get("BIND", "0.0.0.0:5001")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+
+# 마스터에서 앱(용어 데이터, 색인)을 한 번 읽고 워커는 fork로 물려받음
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+
+# 앱을 읽는 동안 GC를 꺼 두고 fork 직전에 고정 (prefork.py 참고)
+prefork.disable_gc()
+
+
+def when_ready(server):
+    prefork.prepare_master()
+
+
+def post_fork(server, worker):
+    prefork.init_worker()
@@ -12,7 +12,10 @@ from datetime import datetime
 # 현재 디렉토리를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from term_manager import AgriculturalTermManager
+from term_storage import create_term_manager
+from pagination import clamp_page_size
+from http_cache import conditional_get
+from compression import ResponseCompressor
 
 app = Flask(__name__, 
            template_folder=os.path.join(os.path.dirname(__file__), '..', 'templates'),
@@ -20,7 +23,14 @@ app = Flask(__name__,
 app.secret_key = 'agricultural_terms_secret_key_2024'
 
 # 전역 매니저 인스턴스
-manager = AgriculturalTermManager()
+manager = create_term_manager()
+
+# pre-fork 워커끼리 용어 변경 공유 (요청마다 다른 워커가 바꾼 데이터를 먼저 반영)
+app.before_request(manager.refresh)
+
+# JSON/HTML 응답 gzip 압축 (RESPONSE_COMPRESSION_LEVEL, RESPONSE_COMPRESSION_MIN_SIZE)
+compressor = ResponseCompressor()
+compressor.init_app(app)
 
 @app.route('/')
 def index():
@@ -36,20 +46,35 @@ def search():
     category = request.args.get('category', '')
     difficulty = request.args.get('difficulty', '')
     verified_only = request.args.get('verified_only') == 'on'
+    cursor = request.args.get('cursor', '')
     
-    # 검색 실행
-    results = manager.search_terms(
-        keyword=keyword,
-        category=category,
-        difficulty_level=difficulty,
-        verified_only=verified_only
-    )
+    # 검색 실행 (한 페이지씩)
+    try:
+        page = manager.search_terms_page(
+            keyword=keyword,
+            category=category,
+            difficulty_level=difficulty,
+            verified_only=verified_only,
+            cursor=cursor
+        )
+    except ValueError:
+        # 잘못되었거나 오래된 커서는 첫 페이지부터
+        cursor = ''
+        page = manager.search_terms_page(
+            keyword=keyword,
+            category=category,
+            difficulty_level=difficulty,
+            verified_only=verified_only
+        )
     
     # 카테고리 목록
     categories = manager.get_categories()
     
     return render_template('search.html', 
-                         results=results, 
+                         results=page['terms'], 
+                         total_count=page['total_count'],
+                         next_cursor=page['next_cursor'],
+                         cursor=cursor,
                          categories=categories,
                          search_params={
                              'keyword': keyword,
@@ -189,30 +214,68 @@ def statistics():
     return render_template('statistics.html', stats=stats)
 
 @app.route('/api/search')
+@conditional_get(manager.get_data_generation)
 def api_search():
-    """API: 용어 검색"""
+    """API: 용어 검색 (cursor/page_size 커서 페이지, 예전 limit은 page_size와 같음)"""
     keyword = request.args.get('keyword', '')
     category = request.args.get('category', '')
     difficulty = request.args.get('difficulty', '')
+    sort = request.args.get('sort', '')
+    cursor = request.args.get('cursor', '')
+    
+    try:
+        page = manager.search_terms_page(
+            keyword=keyword,
+            category=category,
+            difficulty_level=difficulty,
+            sort=sort,
+            cursor=cursor,
+            # 1 ~ MAX_PAGE_SIZE로 제한 (limit만 주면 상위 limit개)
+            page_size=clamp_page_size(request.args.get('page_size') or request.args.get('limit'))
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    return jsonify({
+        'success': True,
+        'results': page['terms'],
+        'count': len(page['terms']),
+        'total_count': page['total_count'],
+        'next_cursor': page['next_cursor']
+    })
+
+@app.route('/api/suggest')
+@conditional_get(manager.get_data_generation)
+def api_suggest():
+    """API: 자동완성 (용어 접두어 일치)"""
+    query = request.args.get('q', '')
+    lang = request.args.get('lang', '')
     
-    results = manager.search_terms(
-        keyword=keyword,
-        category=category,
-        difficulty_level=difficulty
-    )
+    try:
+        limit = clamp_page_size(request.args.get('limit', 10))
+        suggestions = manager.suggest_terms(query, lang, limit)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     
     return jsonify({
         'success': True,
-        'results': results,
-        'count': len(results)
+        'query': query,
+        'lang': lang,
+        'suggestions': suggestions
     })
 
 @app.route('/api/statistics')
+@conditional_get(manager.get_data_generation)
 def api_statistics():
     """API: 통계 정보"""
     stats = manager.get_statistics()
     return jsonify(stats)
 
+@app.route('/api/cache_stats')
+def api_cache_stats():
+    """API: 조회 결과 캐시 통계 (적중/실패/제거 횟수, 응답 압축 통계)"""
+    return jsonify({**manager.get_query_cache_stats(), 'compression': compressor.stats()})
+
 @app.route('/export/csv')
 def export_csv():
     """CSV 파일로 내보내기"""
@@ -239,6 +302,14 @@ def get_categories_list():
         "종자", "농약", "기타"
     ]
 
+def before_fork():
+    """pre-fork 서버(gunicorn) 마스터에서 워커를 만들기 전 호출 (워커가 물려받으면 안 되는 파일/연결 닫기)"""
+    manager.before_fork()
+
+def after_fork():
+    """pre-fork 서버 워커가 시작될 때 호출 (워커 전용 DB 연결 열기)"""
+    manager.after_fork()
+
 if __name__ == '__main__':
     # 개발 모드에서 실행
     print("캄보디아 농업용어 사전 웹 애플리케이션을 시작합니다...")
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+농업용어 관리자 성능 측정 스크립트
+Micro-benchmarks for the term managers
+
+실행: python3 src/benchmarks.py [항목 ...]
+임시 디렉토리의 데이터 파일만 사용하므로 data/ 아래 파일은 건드리지 않습니다.
+"""
+
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, Any, List
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from term_manager import AgriculturalTermManager
+from enhanced_term_manager import EnhancedAgriculturalTermManager
+from generate_extended_data import ExtendedDataGenerator
+from index_file import index_path_for
+from review_scheduler import ReviewScheduler, LearnerDeck
+from daily_packs import format_word, render_daily_packs
+
+
+def _temp_enhanced_manager() -> EnhancedAgriculturalTermManager:
+    """빈 임시 데이터 파일을 쓰는 확장 관리자"""
+    temp_dir = tempfile.mkdtemp(prefix="agri_bench_")
+    return EnhancedAgriculturalTermManager(os.path.join(temp_dir, "terms.json"))
+
+
+def _write_minimal_terms(count: int) -> str:
+    """ID와 핵심 필드만 가진 용어 count개의 임시 데이터 파일 경로"""
+    temp_dir = tempfile.mkdtemp(prefix="agri_bench_")
+    data_file_path = os.path.join(temp_dir, "terms.json")
+
+    terms = [
+        {"id": i, "korean_term": f"용어 {i}", "khmer_term": f"ពាក្យ{i}", "category": "작물재배",
+         "difficulty_level": "중급", "related_terms": [], "tags": [], "verified": False}
+        for i in range(1, count + 1)
+    ]
+    with open(data_file_path, 'w', encoding='utf-8') as f:
+        json.dump({"metadata": {"version": "1.0", "total_terms": count}, "terms": terms}, f, ensure_ascii=False)
+
+    return data_file_path
+
+
+def _generated_terms(count: int) -> List[Dict[str, Any]]:
+    """데이터 생성기와 같은 방식으로 용어 필드 생성"""
+    random.seed(42)
+    generator = ExtendedDataGenerator()
+    categories = list(generator.base_terms.keys())
+
+    terms = []
+    for i in range(count):
+        category = categories[i % len(categories)]
+        base_term = random.choice(generator.base_terms[category])
+        terms.append(generator._create_term_variation(base_term, category, (i // 60) + 1, i + 1))
+    return terms
+
+
+def _timed(func, *args) -> float:
+    """함수 실행 시간 (초)"""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def benchmark_bulk_insert(counts=(8000, 80000), sequential_limit: int = 1000) -> None:
+    """add_enhanced_term 반복 호출 vs add_enhanced_terms_bulk"""
+    print("\n📥 용어 일괄 추가 (add_enhanced_term × N vs add_enhanced_terms_bulk)")
+
+    for count in counts:
+        terms = _generated_terms(count)
+
+        manager = _temp_enhanced_manager()
+        bulk_seconds = _timed(manager.add_enhanced_terms_bulk, terms)
+
+        # 반복 호출은 O(N²)이라 일부만 측정하고 나머지는 추정
+        sample = min(count, sequential_limit)
+        manager = _temp_enhanced_manager()
+        start = time.perf_counter()
+        for fields in terms[:sample]:
+            manager.add_enhanced_term(**fields)
+        sequential_seconds = time.perf_counter() - start
+        if sample < count:
+            sequential_seconds *= (count / sample) ** 2
+            note = f" (앞 {sample:,}개 측정 후 N² 추정)"
+        else:
+            note = ""
+
+        print(f"  {count:>7,}개: 반복 {sequential_seconds:10.1f}s{note} → 일괄 {bulk_seconds:6.2f}s")
+
+
+def benchmark_id_lookup(counts=(1000, 10000, 100000, 1000000), lookups: int = 100000, inserts: int = 200) -> None:
+    """get_term_by_id 조회와 add_term(ID 할당 + 저널 기록) 지연시간"""
+    print("\n🔑 ID 조회 / 추가 지연시간 (AgriculturalTermManager)")
+
+    for count in counts:
+        manager = AgriculturalTermManager(_write_minimal_terms(count))
+
+        random.seed(7)
+        term_ids = [random.randint(1, count) for _ in range(lookups)]
+        lookup_seconds = _timed(lambda: [manager.get_term_by_id(term_id) for term_id in term_ids])
+
+        def add_terms():
+            for i in range(inserts):
+                manager.add_term(f"새 용어 {i}", "ពាក្យថ្មី", "작물재배", "정의", "និយមន័យ")
+        insert_seconds = _timed(add_terms)
+
+        print(f"  {count:>9,}개: 조회 {lookup_seconds / lookups * 1e9:7.0f} ns/회, "
+              f"추가 {insert_seconds / inserts * 1e6:7.0f} µs/회")
+
+
+def _populated_enhanced_manager(count: int, query_cache: bool = False) -> EnhancedAgriculturalTermManager:
+    """생성기 형태의 용어 count개가 들어 있는 임시 확장 관리자
+
+    같은 질의를 반복해 재므로 query_cache=True가 아니면 조회 결과 캐시는 끔
+    """
+    manager = _temp_enhanced_manager()
+    manager.add_enhanced_terms_bulk(_generated_terms(count))
+    if not query_cache:
+        manager._query_cache.maxsize = 0
+    return manager
+
+
+def _time_per_call(func, repeat: int) -> float:
+    """func()의 평균 실행 시간 (ms)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+SEARCH_QUERIES = ["벼 기술", "트랙터 관리", "ស្រូវ", "비료", "tractor"]
+
+
+def benchmark_search(counts=(5000, 8000, 100000), repeat: int = 20) -> None:
+    """search_enhanced_terms 키워드 검색 지연시간 (n-gram 색인)"""
+    print("\n🔍 키워드 검색 지연시간 (search_enhanced_terms, limit=20)")
+
+    for count in counts:
+        manager = _populated_enhanced_manager(count)
+        timings = []
+        for query in SEARCH_QUERIES:
+            hits = len(manager.search_enhanced_terms(query))
+            ms = _time_per_call(lambda: manager.search_enhanced_terms(query, limit=20), repeat)
+            timings.append(f"{query}({hits:,}) {ms:.3f}ms")
+        print(f"  {count:>7,}개: " + ", ".join(timings))
+
+
+def benchmark_relevance(counts=(8000, 100000), repeat: int = 20) -> None:
+    """sort="relevance" BM25 정렬 지연시간 (첫 질의 / 토큰 점수 캐시 적중)"""
+    print("\n🏅 관련도 정렬 지연시간 (search_enhanced_terms sort=relevance, limit=20)")
+
+    for count in counts:
+        manager = _populated_enhanced_manager(count)
+        timings = []
+        for query in SEARCH_QUERIES:
+            hits = len(manager.search_enhanced_terms(query))
+            cold_ms = _timed(lambda: manager.search_enhanced_terms(query, limit=20, sort="relevance")) * 1000
+            ms = _time_per_call(lambda: manager.search_enhanced_terms(query, limit=20, sort="relevance"), repeat)
+            timings.append(f"{query}({hits:,}) {cold_ms:.2f}ms → {ms:.3f}ms")
+        print(f"  {count:>7,}개: " + ", ".join(timings))
+
+
+def benchmark_facets(counts=(8000, 100000), repeat: int = 20) -> None:
+    """패싯 비트맵 필터 / popcount 지연시간"""
+    print("\n🧮 패싯 필터 지연시간 (비트맵 AND, limit=20)")
+
+    for count in counts:
+        manager = _populated_enhanced_manager(count)
+        category_ms = _time_per_call(lambda: manager.get_words_by_category("비료", 20), repeat)
+        filter_ms = _time_per_call(
+            lambda: manager.search_enhanced_terms(category="비료", difficulty_level="기초", frequency_level=5, limit=20),
+            repeat)
+        counts_ms = _time_per_call(manager.get_facet_counts, repeat)
+        histogram_ms = _time_per_call(lambda: manager.get_search_facets("비료"), repeat)
+        print(f"  {count:>7,}개: 카테고리 {category_ms:.3f}ms, 카테고리+난이도+빈도 {filter_ms:.3f}ms, "
+              f"패싯 개수 {counts_ms:.3f}ms, 검색 결과 패싯(비료) {histogram_ms:.3f}ms")
+
+
+def benchmark_query_cache(counts=(8000, 100000), repeat: int = 200) -> None:
+    """조회 결과 캐시 적중 시 지연시간 (첫 호출 → 같은 인자 반복 호출)"""
+    print("\n🗃️ 조회 결과 캐시 (첫 호출 → 캐시 적중)")
+
+    calls = [
+        ("1일차 단어", lambda manager: manager.get_daily_words(1)),
+        ("카테고리", lambda manager: manager.get_words_by_category("비료", 20)),
+        ("키워드", lambda manager: manager.search_enhanced_terms("비료", limit=20)),
+    ]
+    for count in counts:
+        manager = _populated_enhanced_manager(count, query_cache=True)
+        timings = []
+        for label, call in calls:
+            cold_ms = _timed(call, manager) * 1000
+            ms = _time_per_call(lambda: call(manager), repeat)
+            timings.append(f"{label} {cold_ms:.3f}ms → {ms * 1000:.1f}µs")
+        stats = manager.get_query_cache_stats()
+        print(f"  {count:>7,}개: " + ", ".join(timings) +
+              f" [적중 {stats['hits']:,}, 실패 {stats['misses']:,}]")
+
+
+# (정확한 표기, 소리로 들은 표기)
+SOUND_QUERIES = [("까찌업", "가찌업"), ("다이 추", "다이추"), ("빽째끄떼스", "벡제그데스")]
+
+
+def benchmark_sound(counts=(8000, 100000), repeat: int = 20) -> None:
+    """mode="sound" 소리 검색과 같은 표기의 일반 검색 지연시간 비교"""
+    print("\n🔊 소리 검색 지연시간 (search_enhanced_terms mode=sound, limit=20)")
+
+    for count in counts:
+        manager = _populated_enhanced_manager(count)
+        timings = []
+        for exact, heard in SOUND_QUERIES:
+            hits = len(manager.search_enhanced_terms(heard, mode="sound"))
+            exact_ms = _time_per_call(lambda: manager.search_enhanced_terms(exact, limit=20), repeat)
+            sound_ms = _time_per_call(lambda: manager.search_enhanced_terms(heard, limit=20, mode="sound"), repeat)
+            timings.append(f"{exact} {exact_ms:.3f}ms / {heard}({hits:,}) {sound_ms:.3f}ms")
+        print(f"  {count:>7,}개: " + ", ".join(timings))
+
+
+SUGGEST_QUERIES = [("ㅂ", ""), ("빌", "ko"), ("트랙", "ko"), ("ស្រ", "km"), ("스라", "pron"), ("비료 기", "")]
+
+
+def benchmark_suggest(counts=(8000, 100000), repeat: int = 2000) -> None:
+    """suggest_terms 자동완성 지연시간 (접두어 트라이, limit=10)"""
+    print("\n💡 자동완성 지연시간 (suggest_terms, limit=10)")
+
+    for count in counts:
+        manager = _populated_enhanced_manager(count)
+        timings = []
+        for query, lang in SUGGEST_QUERIES:
+            hits = len(manager.suggest_terms(query, lang))
+            ms = _time_per_call(lambda: manager.suggest_terms(query, lang), repeat)
+            timings.append(f"{query}/{lang or '*'}({hits}) {ms * 1000:.1f}µs")
+        print(f"  {count:>7,}개: " + ", ".join(timings))
+
+
+FUZZY_QUERIES = ["비로", "트렉터", "유기비로 기슬", "경운귀"]
+
+
+def benchmark_fuzzy(counts=(8000, 100000), repeat: int = 20) -> None:
+    """fuzzy=True 오타 허용 검색 지연시간 (삭제 변형 색인 후보만 거리 계산)"""
+    print("\n🔤 오타 허용 검색 지연시간 (search_enhanced_terms fuzzy=True, limit=20)")
+
+    for count in counts:
+        manager = _populated_enhanced_manager(count)
+        timings = []
+        for query in FUZZY_QUERIES:
+            hits = len(manager.search_enhanced_terms(query, fuzzy=True))
+            ms = _time_per_call(lambda: manager.search_enhanced_terms(query, limit=20, fuzzy=True), repeat)
+            lookup_ms = _time_per_call(lambda: manager._fuzzy_index.lookup(query.split()[0]), repeat * 10)
+            timings.append(f"{query}({hits:,}) {ms:.3f}ms [단어 조회 {lookup_ms * 1000:.0f}µs]")
+        print(f"  {count:>7,}개: " + ", ".join(timings))
+
+
+def benchmark_daily_words(counts=(8000, 80000), days=(1, 800), repeat: int = 200) -> None:
+    """get_daily_words 지연시간 (학습 순서 색인 구간 vs 매 요청 전체 정렬)"""
+    print("\n📅 일일 단어 지연시간 (get_daily_words, limit=10)")
+
+    for count in counts:
+        manager = _populated_enhanced_manager(count)
+        terms = manager.data["terms"]
+        timings = []
+        for day in days:
+            start = (day - 1) * 10
+            sort_ms = _time_per_call(
+                lambda: sorted(terms, key=lambda x: x.get("learning_order", 999999))[start:start + 10], 10)
+            index_ms = _time_per_call(lambda: manager.get_daily_words(day), repeat)
+            timings.append(f"{day}일차 색인 {index_ms * 1000:.1f}µs / 전체 정렬 {sort_ms:.2f}ms")
+        print(f"  {count:>7,}개: " + ", ".join(timings))
+
+
+def benchmark_daily_packs(counts=(8000, 80000), repeat: int = 200) -> None:
+    """일일 단어 묶음 빌드 시간과 전송 크기 (요청마다 단어 조회+JSON vs 미리 압축한 묶음)"""
+    print("\n📦 일일 단어 묶음 (7일 묶음, gzip 미리 압축)")
+
+    for count in counts:
+        manager = _populated_enhanced_manager(count)
+        build_seconds = _timed(render_daily_packs, manager)
+        manifest, packs = render_daily_packs(manager)
+        raw_size = sum(entry["bytes"] for entry in manifest["packs"])
+        gzip_size = sum(entry["gzip_bytes"] for entry in manifest["packs"])
+
+        days = random.sample(range(1, manifest["total_days"] + 1), min(repeat, manifest["total_days"]))
+        request_ms = _time_per_call(
+            lambda: json.dumps([format_word(word) for word in manager.get_daily_words(random.choice(days))],
+                               ensure_ascii=False), repeat)
+        print(f"  {count:>7,}개: 빌드 {build_seconds * 1000:6.0f}ms, 묶음 {len(packs):,}개 "
+              f"{raw_size / 1024:,.0f}KB → gzip {gzip_size / 1024:,.0f}KB, "
+              f"요청마다 조회+직렬화 {request_ms * 1000:.0f}µs")
+
+
+def benchmark_learning_order(counts=(8000, 80000), edits: int = 200) -> None:
+    """학습 순서 전체 재계산 vs 용어 하나 이동 (순위 엔진 배치, 파일 기록 제외)"""
+    print("\n🔢 학습 순서 순위 엔진 (전체 재계산 / 용어 하나 배치)")
+
+    for count in counts:
+        manager = _populated_enhanced_manager(count)
+        recompute_seconds = _timed(manager.recompute_learning_order)
+
+        random.seed(7)
+        terms = random.sample(manager.data["terms"], edits)
+        start = time.perf_counter()
+        for term in terms:
+            term["frequency_level"] = random.randint(1, 5)
+            manager._assign_learning_order(term)
+        place_seconds = time.perf_counter() - start
+        print(f"  {count:>7,}개: 전체 재계산 {recompute_seconds * 1000:7.0f}ms, "
+              f"용어 하나 배치 {place_seconds / edits * 1e6:7.1f}µs")
+
+
+def benchmark_review(learners: int = 200, cards: int = 8000, repeat: int = 2000) -> None:
+    """복습 카드 조회 지연시간 (학습자별 최소 힙 vs 학습자 카드 전체 확인)"""
+    print(f"\n🔁 복습 스케줄러 (학습자 {learners:,}명 × 카드 {cards:,}장, next_cards limit=10)")
+
+    scheduler = ReviewScheduler(os.path.join(tempfile.mkdtemp(prefix="agri_bench_"), "review_state.json"),
+                                new_cards=lambda start, count: list(range(start + 1, min(start + count, cards) + 1)))
+    random.seed(11)
+    now = 1_700_000_000
+    start = time.perf_counter()
+    for learner in range(learners):
+        deck = scheduler.decks[str(learner)] = LearnerDeck()
+        for term_id in range(1, cards + 1):
+            deck.answer(term_id, random.choice((1, 3, 4, 5)), now - random.randint(0, 30 * 86400))
+    build_seconds = time.perf_counter() - start
+
+    learner_ids = [str(random.randrange(learners)) for _ in range(repeat)]
+    later = now + 3 * 86400
+    heap_ms = _time_per_call(lambda: scheduler.next_cards(random.choice(learner_ids), 10, now=later), repeat)
+
+    def scan():
+        deck = scheduler.decks[random.choice(learner_ids)]
+        return sorted((due, slot) for slot, due in enumerate(deck.due) if due <= later)[:10]
+    scan_ms = _time_per_call(scan, 50)
+
+    print(f"  카드 {learners * cards:,}장 구성 {build_seconds:.1f}s, "
+          f"next_cards {heap_ms * 1000:.1f}µs / 전체 확인 {scan_ms:.2f}ms")
+
+
+def benchmark_sync(events: int = 500) -> None:
+    """오프라인 응답 동기화 (묶음 sync 한 번 vs 응답마다 answer, 각각 fsync 한 번)"""
+    print(f"\n🔄 학습 기록 동기화 (응답 {events:,}개)")
+
+    random.seed(13)
+    now = 1_700_000_000
+    batch = [{"event_id": f"e{i}", "term_id": i % 300 + 1, "grade": random.choice((1, 3, 4, 5)),
+              "at": now - (events - i) * 10} for i in range(events)]
+
+    def scheduler():
+        return ReviewScheduler(os.path.join(tempfile.mkdtemp(prefix="agri_bench_"), "review_state.json"),
+                               new_cards=lambda start, count: [], clock=lambda: now)
+
+    batched = scheduler()
+    sync_seconds = _timed(batched.sync, "learner", batch)
+    resend_seconds = _timed(batched.sync, "learner", batch)
+
+    single = scheduler()
+    answer_seconds = _timed(lambda: [single.answer("learner", event["term_id"], event["grade"], now=event["at"])
+                                     for event in batch])
+
+    print(f"  묶음 sync {sync_seconds * 1000:.1f}ms (같은 묶음 재전송 {resend_seconds * 1000:.1f}ms), "
+          f"응답마다 answer {answer_seconds * 1000:.1f}ms")
+
+
+def benchmark_compression(counts=(1000, 8000), levels=(1, 6, 9)) -> None:
+    """JSON 응답 gzip 압축 수준별 CPU 시간과 크기 (키워드 없는 전체 search_enhanced 응답)"""
+    print("\n🗜️ 응답 압축 (search_enhanced 전체 결과 JSON, gzip 수준별)")
+
+    for count in counts:
+        manager = _populated_enhanced_manager(count)
+        body = json.dumps({"success": True, "results": manager.search_enhanced_terms()},
+                          ensure_ascii=False).encode("utf-8")
+        timings = []
+        for level in levels:
+            repeat = max(3, 2_000_000 // len(body))
+            ms = _time_per_call(lambda: gzip.compress(body, compresslevel=level), repeat)
+            size = len(gzip.compress(body, compresslevel=level))
+            timings.append(f"수준 {level} {ms:.1f}ms → {size / 1024:,.0f}KB ({size / len(body):.1%})")
+        print(f"  {count:>7,}개 ({len(body) / 1024 / 1024:.1f}MB): " + ", ".join(timings))
+
+
+def benchmark_startup(counts=(8000, 100000)) -> None:
+    """관리자 시작 시간 (색인 새로 생성 vs 색인 파일에서 복원)"""
+    print("\n🗂️ 시작 시간 (EnhancedAgriculturalTermManager, 색인 재생성 / 색인 파일 로드)")
+
+    for count in counts:
+        data_file_path = _populated_enhanced_manager(count).data_file_path
+        index_path = index_path_for(data_file_path)
+        if os.path.exists(index_path):
+            os.remove(index_path)
+
+        rebuild_seconds = _timed(EnhancedAgriculturalTermManager, data_file_path)
+        size_mb = os.path.getsize(index_path) / 1024 / 1024
+        load_seconds = _timed(EnhancedAgriculturalTermManager, data_file_path)
+        print(f"  {count:>7,}개: 재생성 {rebuild_seconds * 1000:7.0f}ms, "
+              f"색인 파일 로드 {load_seconds * 1000:7.0f}ms ({size_mb:.1f}MB)")
+
+
+BENCHMARKS = {
+    "bulk_insert": benchmark_bulk_insert,
+    "id_lookup": benchmark_id_lookup,
+    "search": benchmark_search,
+    "relevance": benchmark_relevance,
+    "facets": benchmark_facets,
+    "query_cache": benchmark_query_cache,
+    "sound": benchmark_sound,
+    "suggest": benchmark_suggest,
+    "fuzzy": benchmark_fuzzy,
+    "daily_words": benchmark_daily_words,
+    "daily_packs": benchmark_daily_packs,
+    "learning_order": benchmark_learning_order,
+    "review": benchmark_review,
+    "sync": benchmark_sync,
+    "compression": benchmark_compression,
+    "startup": benchmark_startup,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    print("⏱️ 농업용어 관리자 성능 측정")
+    for name in names:
+        BENCHMARKS[name]()
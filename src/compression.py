@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+JSON/HTML 응답 gzip 압축
+Transparent gzip compression of Flask responses with a reuse cache
+
+jsonify나 render_template 응답 중 클라이언트가 gzip을 받고 본문이 임계값 이상인 것만 압축합니다.
+ETag가 있는(캐시 가능한) 응답은 압축한 본문을 ETag로 보관해 두고, 같은 응답을 다시 보낼 때는
+압축하지 않고 그대로 씁니다. ETag는 http_cache가 Accept-Encoding별로 붙이므로(gzip이면 "-gzip")
+압축해도 바꾸지 않고, 200과 304가 항상 같은 ETag를 가집니다.
+
+환경 변수:
+- RESPONSE_COMPRESSION_LEVEL: gzip 압축 수준 1~9 (기본 6, 0이면 압축 안 함)
+- RESPONSE_COMPRESSION_MIN_SIZE: 압축할 최소 본문 크기 바이트 (기본 1024)
+"""
+
+import gzip
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict
+
+from flask import Flask, Response, request
+
+DEFAULT_LEVEL = 6
+DEFAULT_MIN_SIZE = 1024
+
+# 압축 본문 재사용 캐시 최대 크기 (압축한 바이트 합계)
+DEFAULT_REUSE_BYTES = 32 * 1024 * 1024
+
+COMPRESSIBLE_MIMETYPES = frozenset(("application/json", "text/html"))
+
+
+def _env_int(name: str, default: int) -> int:
+    """환경 변수의 0 이상 정수 (없거나 잘못되면 기본값)"""
+    try:
+        return max(0, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+class ResponseCompressor:
+    """after_request에서 응답 본문을 gzip으로 압축 (압축 시간과 줄인 바이트 집계)"""
+
+    def __init__(self, level: int = None, min_size: int = None, reuse_bytes: int = DEFAULT_REUSE_BYTES):
+        self.level = min(9, _env_int("RESPONSE_COMPRESSION_LEVEL", DEFAULT_LEVEL) if level is None else level)
+        self.min_size = _env_int("RESPONSE_COMPRESSION_MIN_SIZE", DEFAULT_MIN_SIZE) if min_size is None else min_size
+        self.reuse_bytes = reuse_bytes
+        self._compressed: "OrderedDict[str, bytes]" = OrderedDict()
+        self._compressed_size = 0
+        self._lock = threading.Lock()
+        self.compressed_responses = 0
+        self.reused_responses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+    def init_app(self, app: Flask) -> None:
+        """앱의 모든 응답에 압축 적용"""
+        app.after_request(self.compress_response)
+
+    def _should_compress(self, response: Response) -> bool:
+        if self.level <= 0 or response.status_code != 200:
+            return False
+        if response.direct_passthrough or response.is_streamed or "Content-Encoding" in response.headers:
+            return False
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return False
+        response.vary.add("Accept-Encoding")
+        return request.accept_encodings["gzip"] > 0 and response.content_length is not None \
+            and response.content_length >= self.min_size
+
+    def compress_response(self, response: Response) -> Response:
+        """조건에 맞으면 본문을 gzip으로 바꾼 응답 (아니면 그대로, 304는 200과 같은 Vary만 추가)
+
+        304에 Vary가 있어야 공유 캐시가 다시 확인한 항목을 다른 압축 방식의 본문과 짝짓지 않습니다.
+        """
+        if response.status_code == 304:
+            response.vary.add("Accept-Encoding")
+            return response
+        if not self._should_compress(response):
+            return response
+
+        etag, weak = response.get_etag()
+        key = f"{self.level}:{etag}" if etag and not weak else None
+        body = response.get_data()
+        compressed = None
+        if key is not None:
+            with self._lock:
+                compressed = self._compressed.get(key)
+                if compressed is not None:
+                    self._compressed.move_to_end(key)
+                    self.reused_responses += 1
+
+        if compressed is None:
+            started = time.process_time()
+            compressed = gzip.compress(body, compresslevel=self.level)
+            elapsed = time.process_time() - started
+            with self._lock:
+                self.cpu_seconds += elapsed
+                if key is not None and key not in self._compressed and len(compressed) <= self.reuse_bytes:
+                    self._compressed[key] = compressed
+                    self._compressed_size += len(compressed)
+                    while self._compressed_size > self.reuse_bytes:
+                        self._compressed_size -= len(self._compressed.popitem(last=False)[1])
+
+        with self._lock:
+            self.compressed_responses += 1
+            self.bytes_in += len(body)
+            self.bytes_out += len(compressed)
+
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = "gzip"
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        """압축 응답 수, 재사용 수, 원본/압축 바이트, 압축에 쓴 CPU 시간"""
+        with self._lock:
+            return {
+                "level": self.level,
+                "min_size": self.min_size,
+                "compressed_responses": self.compressed_responses,
+                "reused_responses": self.reused_responses,
+                "reuse_cache_bytes": self._compressed_size,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "saved_ratio": round(1 - self.bytes_out / self.bytes_in, 4) if self.bytes_in else 0.0,
+                "cpu_ms": round(self.cpu_seconds * 1000, 3)
+            }
@@ -6,6 +6,7 @@ Unity 프로젝트용 완벽한 Cambodia Agri App 생성
 
 import json
 import os
+from collections import Counter
 from datetime import datetime
 
 def create_perfect_unity_app():
@@ -65,6 +66,9 @@ def create_perfect_unity_app():
     
     print(f"✅ 최종 용어 수: {len(all_terms)}개 (농업용어 4,800개 + 농업기관 20개)")
     
+    # 카테고리별 용어 수는 생성 시 한 번만 집계해 함께 넣음 (브라우저에서 카테고리마다 전체를 다시 세지 않도록)
+    category_counts = Counter(term['category'] for term in all_terms)
+    
     # 완벽한 카테고리 구성 (24개 농업용어 카테고리 + 1개 웹사이트 카테고리)
     perfect_categories = {
         "all": {"name": "전체", "icon": "🌾", "description": "모든 농업용어"},
@@ -741,6 +745,9 @@ def create_perfect_unity_app():
         // 농업용어 데이터
         const allTerms = {json.dumps(all_terms, ensure_ascii=False, indent=12)};
         
+        // 카테고리별 용어 수
+        const categoryCounts = {json.dumps(category_counts, ensure_ascii=False)};
+        
         // 예문 데이터
         const examples = {json.dumps(filtered_examples, ensure_ascii=False, indent=12)};
     </script>
@@ -798,7 +805,7 @@ def create_perfect_unity_app():
             for (const [key, category] of Object.entries(categories)) {{
                 if (key === 'all') continue;
                 
-                const count = allTerms.filter(term => term.category === key).length;
+                const count = categoryCounts[key] || 0;
                 
                 const btn = document.createElement('button');
                 btn.className = `category-btn ${{key === state.currentCategory ? 'active' : ''}}`;
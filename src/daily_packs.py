@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+농업용어 일일 단어 묶음 (정적 파일)
+Immutable, gzip-precompressed daily word packs named by content hash
+
+일일 단어를 요청마다 다시 꺼내고 형식을 바꾸는 대신, 며칠 분량(기본 7일)을 한 묶음으로
+미리 만들어 gzip으로 압축해 둡니다. 파일 이름에 내용 해시가 들어가므로 내용이 같으면 이름도 같고,
+클라이언트는 한 번 받은 묶음을 만료 없이 캐시할 수 있습니다.
+어떤 날짜가 어느 묶음에 있는지는 작은 목록 파일(manifest.json)에 기록합니다.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from term_journal import atomic_write_json
+
+# 묶음 형식이 바뀌면 올림
+PACK_VERSION = 1
+
+DEFAULT_WORDS_PER_DAY = 10
+DEFAULT_DAYS_PER_PACK = 7
+
+MANIFEST_NAME = "manifest.json"
+PACK_PREFIX = "daily-"
+PACK_SUFFIX = ".json.gz"
+
+# 내용 해시 이름의 묶음은 바뀌지 않으므로 1년간 다시 확인하지 않음
+PACK_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def format_word(word: Dict[str, Any]) -> Dict[str, Any]:
+    """개선된 앱 형식의 단어"""
+    return {
+        'id': word.get('id'),
+        'korean': word.get('korean_term', ''),
+        'khmer': word.get('khmer_term', ''),
+        'pronunciation': word.get('khmer_pronunciation', ''),
+        'category': word.get('category', ''),
+        'definition_ko': word.get('korean_definition', ''),
+        'definition_km': word.get('khmer_definition', ''),
+        'example_ko': word.get('korean_example', ''),
+        'example_km': word.get('khmer_example', ''),
+        'example_pronunciation': word.get('khmer_example_pronunciation', ''),
+        'frequency': word.get('frequency_level', 3),
+        'difficulty': word.get('difficulty_level', '중급'),
+        'tags': word.get('tags', [])
+    }
+
+
+def default_pack_dir(data_file_path: str) -> str:
+    """데이터 파일 옆의 묶음 디렉토리"""
+    return os.path.join(os.path.dirname(data_file_path), "daily_packs")
+
+
+def _pack_name(first_day: int, last_day: int, digest: str) -> str:
+    return f"{PACK_PREFIX}{first_day:04d}-{last_day:04d}.{digest}{PACK_SUFFIX}"
+
+
+def render_daily_packs(manager, words_per_day: int = DEFAULT_WORDS_PER_DAY,
+                       days_per_pack: int = DEFAULT_DAYS_PER_PACK) -> Tuple[Dict[str, Any], Dict[str, bytes]]:
+    """학습 순서 전체를 묶음으로 만들어 (목록, 파일 이름 → gzip 본문) 반환 (디스크에 쓰지 않음)
+
+    묶음 하나의 용어는 학습 순서 색인에서 한 번에 꺼내므로 날짜마다 조회하지 않습니다.
+    gzip 헤더의 시각을 0으로 고정해 같은 내용이면 같은 바이트가 나옵니다.
+    """
+    if words_per_day <= 0 or days_per_pack <= 0:
+        raise ValueError("하루 단어 수와 묶음 일수는 1 이상이어야 합니다")
+
+    pack_size = words_per_day * days_per_pack
+    packs: Dict[str, bytes] = {}
+    entries: List[Dict[str, Any]] = []
+    first_day = 1
+    while True:
+        term_ids = manager.get_learning_order_ids((first_day - 1) * words_per_day, pack_size)
+        if not term_ids:
+            break
+
+        words = [format_word(manager.get_term_by_id(term_id)) for term_id in term_ids]
+        days = {str(first_day + offset // words_per_day): words[offset:offset + words_per_day]
+                for offset in range(0, len(words), words_per_day)}
+        last_day = first_day + len(days) - 1
+        body = json.dumps({
+            "version": PACK_VERSION,
+            "first_day": first_day,
+            "last_day": last_day,
+            "words_per_day": words_per_day,
+            "days": days
+        }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        digest = hashlib.sha256(body).hexdigest()[:16]
+        name = _pack_name(first_day, last_day, digest)
+        packs[name] = gzip.compress(body, compresslevel=9, mtime=0)
+        entries.append({
+            "first_day": first_day,
+            "last_day": last_day,
+            "file": name,
+            "etag": digest,
+            "bytes": len(body),
+            "gzip_bytes": len(packs[name])
+        })
+
+        if len(term_ids) < pack_size:
+            break
+        first_day = last_day + 1
+
+    manifest = {
+        "version": PACK_VERSION,
+        "words_per_day": words_per_day,
+        "days_per_pack": days_per_pack,
+        "total_days": entries[-1]["last_day"] if entries else 0,
+        "etag": hashlib.sha256("".join(entry["etag"] for entry in entries).encode("ascii")).hexdigest()[:16],
+        "generated": datetime.now().isoformat(),
+        "packs": entries
+    }
+    return manifest, packs
+
+
+def write_daily_packs(pack_dir: str, manifest: Dict[str, Any], packs: Dict[str, bytes]) -> int:
+    """묶음 파일과 목록을 디렉토리에 저장하고 새로 쓴 묶음 수를 반환
+
+    이름이 같은 묶음은 내용도 같으므로 다시 쓰지 않습니다.
+    목록을 먼저 바꾼 뒤 목록에 없는 이전 묶음 파일을 지웁니다.
+    """
+    os.makedirs(pack_dir, exist_ok=True)
+    written = 0
+    for name, compressed in packs.items():
+        path = os.path.join(pack_dir, name)
+        if os.path.exists(path):
+            continue
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        written += 1
+
+    atomic_write_json(os.path.join(pack_dir, MANIFEST_NAME), manifest)
+
+    for name in os.listdir(pack_dir):
+        if name.startswith(PACK_PREFIX) and name.endswith(PACK_SUFFIX) and name not in packs:
+            os.remove(os.path.join(pack_dir, name))
+    return written
+
+
+class DailyPackStore:
+    """서버가 제공하는 일일 단어 묶음 (메모리에 gzip 본문 보관)
+
+    처음에는 바로 만들고, 이후 관리자 데이터 세대가 바뀌면(용어 추가/수정) 백그라운드에서 다시 만듭니다.
+    다시 만드는 동안에는 이전 묶음을 그대로 제공하되 is_current()가 False이므로
+    날짜별 API는 묶음 ETag를 쓰지 않습니다.
+    """
+
+    def __init__(self, manager, pack_dir: Optional[str] = None,
+                 words_per_day: int = DEFAULT_WORDS_PER_DAY,
+                 days_per_pack: int = DEFAULT_DAYS_PER_PACK):
+        self.manager = manager
+        self.pack_dir = pack_dir or default_pack_dir(manager.data_file_path)
+        self.words_per_day = words_per_day
+        self.days_per_pack = days_per_pack
+        self.generation = None
+        self.manifest: Dict[str, Any] = {}
+        # 파일 이름 → (ETag, gzip 본문), 다시 만들 때 통째로 교체
+        self.packs: Dict[str, Tuple[str, bytes]] = {}
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self._rebuild_thread: Optional[threading.Thread] = None
+
+    def is_current(self) -> bool:
+        """묶음이 현재 데이터로 만들어졌는지"""
+        return self.generation == self.manager.get_data_generation()
+
+    def refresh(self) -> Dict[str, Any]:
+        """현재 목록 반환 (아직 없으면 만들고, 데이터가 바뀌었으면 백그라운드에서 다시 만듦)"""
+        if self.is_current():
+            return self.manifest
+        if self.generation is None:
+            self.rebuild()
+        else:
+            self._start_background_rebuild()
+        return self.manifest
+
+    def rebuild(self) -> None:
+        """현재 데이터로 묶음을 다시 만들어 교체하고 디스크에도 저장"""
+        with self._rebuild_lock:
+            # 만드는 중에 데이터가 바뀌면 세대가 달라 다음 요청에서 다시 만듦
+            generation = self.manager.get_data_generation()
+            if generation == self.generation:
+                return
+            manifest, packs = render_daily_packs(self.manager, self.words_per_day, self.days_per_pack)
+            self.packs = {entry["file"]: (entry["etag"], packs[entry["file"]]) for entry in manifest["packs"]}
+            self.manifest = manifest
+            self.generation = generation
+            try:
+                write_daily_packs(self.pack_dir, manifest, packs)
+            except OSError as e:
+                print(f"⚠️ 일일 단어 묶음 저장 실패: {e}")
+
+    def _start_background_rebuild(self) -> None:
+        """백그라운드 재생성 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._rebuild_thread is not None and self._rebuild_thread.is_alive():
+                return
+            self._rebuild_thread = threading.Thread(target=self.rebuild, daemon=True)
+            self._rebuild_thread.start()
+
+    def pack(self, name: str) -> Optional[Tuple[str, bytes]]:
+        """묶음의 (ETag, gzip 본문) (없으면 None)"""
+        self.refresh()
+        return self.packs.get(name)
+
+    def pack_for_day(self, day: int) -> Optional[Dict[str, Any]]:
+        """day가 들어 있는 현재 묶음의 목록 항목 (범위 밖이거나 다시 만드는 중이면 None)"""
+        self.refresh()
+        # 교체할 때 목록을 세대보다 먼저 바꾸므로 세대를 먼저 읽으면 목록이 그보다 오래되지 않음
+        generation = self.generation
+        manifest = self.manifest
+        if day < 1 or generation != self.manager.get_data_generation():
+            return None
+        index = (day - 1) // self.days_per_pack
+        packs = manifest.get("packs", [])
+        return packs[index] if index < len(packs) else None
+
+
+if __name__ == "__main__":
+    # 빌드 단계: 일일 단어 묶음을 data/daily_packs/에 만듦 (TERM_STORAGE_BACKEND에 따라 JSON 또는 SQLite)
+    import sys
+    import time
+
+    from term_storage import create_enhanced_term_manager
+
+    data_file_path = sys.argv[1] if len(sys.argv) > 1 else None
+    manager = create_enhanced_term_manager(data_file_path)
+
+    print("📦 일일 단어 묶음 빌드")
+    started = time.perf_counter()
+    manifest = manager.build_daily_packs()
+    elapsed = (time.perf_counter() - started) * 1000
+    raw_size = sum(entry["bytes"] for entry in manifest["packs"])
+    gzip_size = sum(entry["gzip_bytes"] for entry in manifest["packs"])
+    print(f"  ✅ {manifest['total_days']:,}일치 → 묶음 {len(manifest['packs']):,}개, "
+          f"{raw_size / 1024:.0f}KB → gzip {gzip_size / 1024:.0f}KB ({elapsed:.0f}ms)")
@@ -4,37 +4,108 @@
 Enhanced Agricultural Terms Manager for Mobile Learning App
 """
 
+import heapq
 import json
 import os
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterable, Iterator, Tuple
 import random
 import urllib.parse
+from contextlib import contextmanager
+
+from search_index import NgramIndex, HangulIndex, PhoneticIndex, SuggestIndex, FuzzyIndex, HEADWORD_FIELDS
+from khmer_text import normalize_khmer, contains_khmer, is_khmer_query
+from search_ranking import RelevanceIndex
+from facet_index import FacetIndex
+from learning_order import LearningOrderIndex, LearningOrderRanker, RANKING_VERSION
+from query_cache import QueryCache, cached_query
+from pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor, paginate
+from index_file import index_path_for, content_hash, code_fingerprint, read_index_file, write_index_file
+from daily_packs import DEFAULT_DAYS_PER_PACK, DEFAULT_WORDS_PER_DAY, default_pack_dir, render_daily_packs, write_daily_packs
+from term_journal import SharedVersion, atomic_write_text, shared_mutation
 
 class EnhancedAgriculturalTermManager:
+    # 확장된 카테고리 목록
+    DEFAULT_CATEGORIES = [
+        "작물재배", "축산업", "농기계", "토양관리", "비료", "병해충방제",
+        "수확후처리", "저장기술", "가공기술", "유통", "농업정책", "농업경영",
+        "원예", "임업", "수산업", "농업기술", "수자원관리", "농업시설",
+        "종자기술", "농약", "유기농업", "스마트농업", "농업환경", "기후변화대응",
+        "농촌개발", "농업교육", "농업금융", "농업보험", "농산물품질", "농업안전"
+    ]
+    
+    # 입력기별 코드 순서 차이를 없애기 위해 정규화하는 크메르어 필드
+    KHMER_FIELDS = ("khmer_term", "khmer_definition", "khmer_example")
+    
+    # 관련도 정렬(BM25) 필드 가중치 (표제어 > 태그 > 정의 > 예문)
+    RELEVANCE_FIELDS = {
+        "korean_term": 3.0,
+        "khmer_term": 3.0,
+        "english_term": 2.5,
+        "khmer_pronunciation": 2.0,
+        "tags": 1.5,
+        "korean_definition": 1.0,
+        "khmer_definition": 1.0,
+        "korean_example": 0.5,
+        "khmer_example": 0.5
+    }
+    
+    # 색인 파일(.idx)에 저장하는 색인 속성과, 색인 내용을 결정하는 모듈 (소스가 바뀌면 색인 파일을 다시 만듦)
+    PERSISTED_INDEXES = ("_search_index", "_korean_index", "_khmer_index", "_phonetic_index",
+                         "_suggest_index", "_fuzzy_index", "_relevance_index", "_facet_index",
+                         "_learning_order_index", "_learning_order_ranker")
+    INDEX_MODULES = ("search_index", "search_ranking", "facet_index", "learning_order",
+                     "korean_text", "khmer_text", __name__)
+    
+    # update_enhanced_term으로 수정할 수 있는 필드와, 그중 학습 순서 순위에 영향을 주는 필드
+    EDITABLE_FIELDS = (
+        "korean_term", "khmer_term", "khmer_pronunciation", "english_term", "category",
+        "korean_definition", "khmer_definition", "korean_example", "khmer_example",
+        "khmer_example_pronunciation", "english_example", "image_url", "frequency_level",
+        "difficulty_level", "tags", "mnemonics", "cultural_notes", "related_terms", "verified"
+    )
+    RANKING_FIELDS = ("frequency_level", "difficulty_level", "category")
+    
     def __init__(self, data_file_path: str = None):
         """확장된 농업용어 관리자 초기화"""
         # 확장된 카테고리 목록을 먼저 정의
-        self.categories = [
-            "작물재배", "축산업", "농기계", "토양관리", "비료", "병해충방제",
-            "수확후처리", "저장기술", "가공기술", "유통", "농업정책", "농업경영",
-            "원예", "임업", "수산업", "농업기술", "수자원관리", "농업시설",
-            "종자기술", "농약", "유기농업", "스마트농업", "농업환경", "기후변화대응",
-            "농촌개발", "농업교육", "농업금융", "농업보험", "농산물품질", "농업안전"
-        ]
+        self.categories = list(self.DEFAULT_CATEGORIES)
         
         if data_file_path is None:
             self.data_file_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'enhanced_agricultural_terms.json')
         else:
             self.data_file_path = data_file_path
         
-        self.data = self._load_data()
+        # 조회 결과 캐시 (용어가 추가될 때마다 세대가 올라가 이전 결과는 쓰지 않음)
+        self._query_cache = QueryCache()
+        
+        # 데이터 내용 해시가 같은 색인 파일이 있으면 색인을 새로 만들지 않고 불러옴
+        self.index_file_path = index_path_for(self.data_file_path)
+        self._data_hash = None
+        
+        # 여러 프로세스(pre-fork 워커)가 같은 데이터 파일을 쓰므로 변경 번호가 바뀌면 파일을 다시 읽음
+        self._shared = SharedVersion(self.data_file_path + '.lock')
+        with self._shared.lock():
+            self.data = self._load_data()
+            self.index_file_loaded = self._load_index_file()
+            if not self.index_file_loaded:
+                self._rebuild_indexes()
+            self._shared.mark_seen()
+            
+            # 순위 엔진으로 계산하지 않은 데이터는 처음 읽을 때 한 번 전체 재계산 (이후 편집은 그 용어만 이동)
+            ranked = self._learning_order_ranked()
+            if not ranked:
+                self.recompute_learning_order()
+            if not self.index_file_loaded or not ranked:
+                self._write_index_file_quietly()
     
     def _load_data(self) -> Dict[str, Any]:
-        """데이터 파일 로드"""
+        """데이터 파일 로드 (색인 파일 확인용 내용 해시도 기록)"""
         try:
-            with open(self.data_file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(self.data_file_path, 'rb') as f:
+                raw = f.read()
+            self._data_hash = content_hash(raw)
+            return json.loads(raw.decode('utf-8'))
         except FileNotFoundError:
             # 초기 확장된 데이터 구조 생성
             initial_data = {
@@ -53,8 +124,67 @@ class EnhancedAgriculturalTermManager:
         except json.JSONDecodeError as e:
             raise Exception(f"데이터 파일 형식 오류: {e}")
     
+    def _load_index_file(self) -> bool:
+        """데이터 해시와 코드 지문이 맞는 색인 파일에서 색인 복원 (성공하면 True)"""
+        if self._data_hash is None:
+            return False
+        state = read_index_file(self.index_file_path, self._data_hash, code_fingerprint(self.INDEX_MODULES))
+        if not isinstance(state, dict) or set(state.get("indexes", ())) != set(self.PERSISTED_INDEXES):
+            return False
+        
+        for name, index in state["indexes"].items():
+            setattr(self, name, index)
+        # 색인을 만들 때 정규화한 크메르어 필드를 그대로 반영
+        self._normalized_fields = state["normalized_fields"]
+        for term in self.data["terms"]:
+            term.update(self._normalized_fields.get(term.get("id"), {}))
+        self._index_lookup_tables()
+        return True
+    
+    def save_index_file(self) -> int:
+        """현재 색인을 색인 파일로 저장하고 파일 크기(바이트)를 반환 (빌드 단계)"""
+        if self._data_hash is None:
+            raise ValueError("데이터 파일에서 읽은 색인만 저장할 수 있습니다")
+        state = {
+            "indexes": {name: getattr(self, name) for name in self.PERSISTED_INDEXES},
+            "normalized_fields": self._normalized_fields
+        }
+        return write_index_file(self.index_file_path, self._data_hash,
+                                code_fingerprint(self.INDEX_MODULES), state)
+    
+    def _write_index_file_quietly(self) -> None:
+        """다음 시작을 위해 색인 파일 저장 (쓸 수 없는 위치이면 건너뜀)"""
+        if self._data_hash is None:
+            return
+        try:
+            self.save_index_file()
+        except OSError as e:
+            print(f"⚠️ 색인 파일 저장 실패: {e}")
+    
+    @contextmanager
+    def _shared_state(self) -> Iterator[None]:
+        """다른 프로세스의 변경을 반영한 뒤 잠금 안에서 작업"""
+        with self._shared.lock():
+            self._catch_up()
+            yield
+    
+    def _catch_up(self) -> None:
+        """다른 프로세스가 데이터 파일을 바꿨으면 다시 읽고 색인 재구성 (편집 후의 색인 파일은 내용 해시가 달라 쓰지 않음)"""
+        if self._shared.is_current():
+            return
+        self.data = self._load_data()
+        if not self._load_index_file():
+            self._rebuild_indexes()
+        self._shared.mark_seen()
+    
+    def refresh(self) -> None:
+        """다른 프로세스(pre-fork 워커)가 바꾼 데이터 반영 (요청마다 호출, 바뀌지 않았으면 잠금 파일만 읽음)"""
+        if self._shared.changed():
+            with self._shared_state():
+                pass
+    
     def _save_data(self, data: Dict[str, Any] = None) -> None:
-        """데이터 파일 저장"""
+        """데이터 파일 저장 (임시 파일에 쓴 뒤 교체하므로 다른 프로세스는 항상 완성된 파일을 읽음)"""
         if data is None:
             data = self.data
         
@@ -62,12 +192,12 @@ class EnhancedAgriculturalTermManager:
         data["metadata"]["total_terms"] = len(data["terms"])
         data["metadata"]["last_updated"] = datetime.now().isoformat()
         
-        # 디렉토리 생성 (없는 경우)
-        os.makedirs(os.path.dirname(self.data_file_path), exist_ok=True)
-        
-        with open(self.data_file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+        atomic_write_text(self.data_file_path, text)
+        self._data_hash = content_hash(text.encode('utf-8'))
+        self._shared.bump()
     
+    @shared_mutation
     def add_enhanced_term(self, 
                          korean_term: str,
                          khmer_term: str,
@@ -88,17 +218,86 @@ class EnhancedAgriculturalTermManager:
                          cultural_notes: str = "") -> int:
         """확장된 농업용어 추가"""
         
+        new_term = self._build_enhanced_term(
+            self._next_term_id(),
+            self._term_count(),
+            korean_term=korean_term,
+            khmer_term=khmer_term,
+            khmer_pronunciation=khmer_pronunciation,
+            category=category,
+            korean_definition=korean_definition,
+            khmer_definition=khmer_definition,
+            korean_example=korean_example,
+            khmer_example=khmer_example,
+            khmer_example_pronunciation=khmer_example_pronunciation,
+            english_term=english_term,
+            english_example=english_example,
+            image_url=image_url,
+            frequency_level=frequency_level,
+            difficulty_level=difficulty_level,
+            tags=tags,
+            mnemonics=mnemonics,
+            cultural_notes=cultural_notes
+        )
+        
+        self._insert_terms([new_term])
+        
+        return new_term["id"]
+    
+    @shared_mutation
+    def add_enhanced_terms_bulk(self, terms: Iterable[Dict[str, Any]]) -> List[int]:
+        """여러 농업용어를 한 번에 추가 (ID는 카운터로 부여, 저장은 한 번만)
+        
+        각 항목은 add_enhanced_term의 키워드 인자와 같은 dict입니다.
+        """
+        next_id = self._next_term_id()
+        current_count = self._term_count()
+        
+        new_terms = []
+        for fields in terms:
+            new_terms.append(self._build_enhanced_term(next_id, current_count, **fields))
+            next_id += 1
+            current_count += 1
+        
+        if new_terms:
+            self._insert_terms(new_terms)
+        
+        return [term["id"] for term in new_terms]
+    
+    def _build_enhanced_term(self,
+                             new_id: int,
+                             current_count: int,
+                             korean_term: str,
+                             khmer_term: str,
+                             khmer_pronunciation: str,
+                             category: str,
+                             korean_definition: str,
+                             khmer_definition: str,
+                             korean_example: str,
+                             khmer_example: str,
+                             khmer_example_pronunciation: str,
+                             english_term: str = "",
+                             english_example: str = "",
+                             image_url: str = "",
+                             frequency_level: int = 3,
+                             difficulty_level: str = "중급",
+                             tags: List[str] = None,
+                             mnemonics: str = "",
+                             cultural_notes: str = "") -> Dict[str, Any]:
+        """새 용어 dict 생성"""
+        
         if tags is None:
             tags = []
         
-        # 새 ID 생성 (기존 최대 ID + 1)
-        existing_ids = [term.get("id", 0) for term in self.data["terms"]]
-        new_id = max(existing_ids, default=0) + 1
-        
         # 학습 순서 계산 (frequency_level 기반)
-        learning_order = self._calculate_learning_order(frequency_level, difficulty_level)
+        learning_order = self._calculate_learning_order(frequency_level, difficulty_level, current_count)
         
-        new_term = {
+        # 저장 시 크메르어 정규화
+        khmer_term = normalize_khmer(khmer_term)
+        khmer_definition = normalize_khmer(khmer_definition)
+        khmer_example = normalize_khmer(khmer_example)
+        
+        return {
             "id": new_id,
             "korean_term": korean_term,
             "khmer_term": khmer_term,
@@ -126,14 +325,230 @@ class EnhancedAgriculturalTermManager:
             "verified": False,
             "last_reviewed": None
         }
+    
+    def _rebuild_indexes(self) -> None:
+        """메모리 색인 구성 (ID → 용어, 다음 ID 카운터, 검색 n-gram, 한글 자모/초성, 크메르어, 발음 소리 키, 자동완성, 오타 허용, 관련도, 패싯 비트맵, 학습 순서)"""
+        self._search_index = NgramIndex()
+        self._korean_index = HangulIndex()
+        self._khmer_index = NgramIndex()
+        self._phonetic_index = PhoneticIndex()
+        self._suggest_index = SuggestIndex()
+        self._fuzzy_index = FuzzyIndex()
+        self._relevance_index = RelevanceIndex(self.RELEVANCE_FIELDS)
+        self._normalized_fields = {}
+        for term in self.data["terms"]:
+            # 로드 시 한 번 크메르어 필드 정규화 (바뀐 값은 색인 파일에 함께 저장)
+            changed = self._normalize_khmer_fields(term)
+            if changed:
+                self._normalized_fields[term.get("id")] = changed
+            self._index_term(term)
         
-        self.data["terms"].append(new_term)
-        self._save_data()
+        self._facet_index = FacetIndex()
+        self._facet_index.add_many(self.data["terms"])
+        self._learning_order_index = LearningOrderIndex(self.data["terms"])
+        self._learning_order_ranker = LearningOrderRanker(self.categories)
+        self._learning_order_ranker.index_terms(self.data["terms"])
+        self._index_lookup_tables()
+    
+    def _index_lookup_tables(self) -> None:
+        """ID → 용어 사전과 다음 ID 카운터 (색인 파일에서 복원할 때도 다시 계산)"""
+        self._terms_by_id = {term.get("id"): term for term in self.data["terms"]}
+        
+        max_id = max(self._terms_by_id, default=0) or 0
+        metadata = self.data["metadata"]
+        metadata["next_id"] = max(metadata.get("next_id", 1), max_id + 1)
+        self._query_cache.bump_generation()
+    
+    def _index_term(self, term: Dict[str, Any]) -> None:
+        """용어 하나를 검색 색인에 반영"""
+        self._search_index.add(term.get("id"), self._searchable_text(term))
+        self._korean_index.add(term.get("id"), term.get("korean_term", ""))
+        self._khmer_index.add(term.get("id"), self._khmer_text(term))
+        self._phonetic_index.add(term.get("id"), term)
+        self._suggest_index.add(term.get("id"), term)
+        self._fuzzy_index.add(term.get("id"), self._headwords(term))
+        self._relevance_index.add(term.get("id"), term)
+    
+    def _normalize_khmer_fields(self, term: Dict[str, Any]) -> Dict[str, str]:
+        """크메르어 필드를 정규형으로 변환 (제자리 수정, 값이 바뀐 필드를 반환)"""
+        changed = {}
+        for field in self.KHMER_FIELDS:
+            if term.get(field):
+                normalized = normalize_khmer(term[field])
+                if normalized != term[field]:
+                    term[field] = changed[field] = normalized
+        return changed
+    
+    def _khmer_text(self, term: Dict[str, Any]) -> str:
+        """크메르어 색인 키 (필드 경계를 넘는 일치를 막기 위해 줄바꿈으로 연결)"""
+        return "\n".join(term.get(field, "") for field in self.KHMER_FIELDS)
+    
+    @staticmethod
+    def _headwords(term: Dict[str, Any]) -> List[str]:
+        """오타 허용 검색 대상 표제어 (한국어, 크메르어, 영어, 발음)"""
+        return [term.get(field, "") for field in HEADWORD_FIELDS]
+    
+    def _fuzzy_matches(self, keyword: str) -> Dict[int, int]:
+        """표제어가 키워드와 편집 거리 2 이내인 용어 ID → 거리"""
+        return self._fuzzy_index.search(keyword)
+    
+    @staticmethod
+    def _rank_by_distance(results: List[Dict[str, Any]], distances: Dict[int, int],
+                          limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """오타 허용 검색 정렬 (거리 가까운 순, 빈도 높은 순, 학습 순서, limit이 있으면 상위 limit개만)"""
+        def rank(term):
+            return (distances.get(term.get("id"), 0), -term.get("frequency_level", 3), term.get("learning_order", 999999))
+        
+        if limit:
+            return heapq.nsmallest(limit, results, key=rank)
+        return sorted(results, key=rank)
+    
+    def _rank_by_relevance(self, keyword: str, results: List[Dict[str, Any]],
+                           limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """관련도(BM25) 높은 순 정렬 (같으면 학습 순서, limit이 있으면 상위 limit개만)"""
+        return self._relevance_index.rank(keyword, results, limit,
+                                          tiebreak=lambda x: x.get("learning_order", 999999))
+    
+    def _match_keyword(self, keyword: str, mode: str = "") -> set:
+        """검색 모드별 키워드 일치 용어 ID
         
-        return new_id
+        mode: "" = 전체 필드 부분 문자열, "jamo" = 한국어 용어의 자모/초성 부분열,
+              "sound" = 크메르어 발음 한글 표기의 소리 키 부분열 (띄어쓰기, ㄲ/ㄱ, ㅆ/ㅅ, ㅐ/ㅔ 차이 무시)
+        크메르어 질의는 정규화한 뒤 크메르어 색인에서 찾습니다.
+        """
+        if mode == "jamo":
+            return self._korean_index.search(keyword)
+        if mode == "sound":
+            return self._phonetic_index.search(keyword)
+        
+        if contains_khmer(keyword):
+            keyword = normalize_khmer(keyword)
+            if is_khmer_query(keyword):
+                return self._khmer_index.search(keyword)
+        return self._search_index.search(keyword.lower())
+    
+    def _next_term_id(self) -> int:
+        """새 ID (메타데이터의 next_id 카운터)"""
+        return self.data["metadata"]["next_id"]
     
-    def _calculate_learning_order(self, frequency_level: int, difficulty_level: str) -> int:
-        """학습 순서 계산 (빈도와 난이도 기반)"""
+    def _term_count(self) -> int:
+        """현재 용어 수"""
+        return len(self.data["terms"])
+    
+    def _insert_terms(self, new_terms: List[Dict[str, Any]]) -> None:
+        """새 용어들 저장 (파일 기록은 한 번)"""
+        self.data["terms"].extend(new_terms)
+        placed = True
+        for term in new_terms:
+            self._terms_by_id[term["id"]] = term
+            self._index_term(term)
+            placed = self._assign_learning_order(term) and placed
+        self._facet_index.add_many(new_terms)
+        
+        metadata = self.data["metadata"]
+        metadata["next_id"] = max(metadata["next_id"], new_terms[-1]["id"] + 1)
+        self._query_cache.bump_generation()
+        if placed:
+            self._save_data()
+        else:
+            self.recompute_learning_order()
+    
+    @shared_mutation
+    def update_enhanced_term(self, term_id: int, **kwargs) -> bool:
+        """용어 정보 수정 (빈도/난이도/카테고리가 바뀌면 그 용어만 학습 순서에서 이동)"""
+        term = self.get_term_by_id(term_id)
+        if not term:
+            return False
+        
+        # 허용된 필드만 업데이트
+        fields = {field: value for field, value in kwargs.items() if field in self.EDITABLE_FIELDS}
+        fields["updated_date"] = datetime.now().isoformat()
+        term.update(fields)
+        self._normalize_khmer_fields(term)
+        
+        self._index_term(term)
+        self._facet_index.add(term_id, term)
+        placed = True
+        if any(field in fields for field in self.RANKING_FIELDS):
+            placed = self._assign_learning_order(term)
+        
+        self._query_cache.bump_generation()
+        if placed:
+            self._save_data()
+        else:
+            self.recompute_learning_order()
+        return True
+    
+    def _learning_order_state(self) -> Tuple[LearningOrderRanker, LearningOrderIndex]:
+        """학습 순서 순위 엔진과 정렬 색인"""
+        return self._learning_order_ranker, self._learning_order_index
+    
+    def _learning_order_ranked(self) -> bool:
+        """전체 learning_order를 순위 엔진으로 계산한 데이터인지 (메타데이터 learning_order_ranking)"""
+        return self.data["metadata"].get("learning_order_ranking") == RANKING_VERSION
+    
+    def _assign_learning_order(self, term: Dict[str, Any]) -> bool:
+        """용어 하나를 학습 순서 색인에 반영 (다른 용어의 learning_order는 그대로)
+        
+        순위 엔진으로 계산한 데이터이면 이웃 사이 값으로 learning_order를 새로 정하고,
+        이웃 사이에 빈 값이 없으면 False (호출한 쪽에서 전체 재계산)
+        """
+        ranker, order_index = self._learning_order_state()
+        if not self._learning_order_ranked():
+            ranker.add(term)
+            order_index.add(term)
+            return True
+        
+        order = ranker.place(term, order_index)
+        if order is None:
+            return False
+        term["learning_order"] = order
+        order_index.add(term)
+        return True
+    
+    @shared_mutation
+    def recompute_learning_order(self) -> int:
+        """전체 learning_order를 순위 엔진으로 한 번에 다시 계산하고 바뀐 용어 수 반환
+        
+        이후 추가/수정되는 용어는 다른 용어를 건드리지 않고 이웃 사이 값으로 배치됩니다.
+        """
+        terms = self.data["terms"]
+        orders = self._learning_order_ranker.rank(terms)
+        changed = 0
+        for term in terms:
+            order = orders[term["id"]]
+            if term.get("learning_order") != order:
+                term["learning_order"] = order
+                changed += 1
+        
+        self._learning_order_index.build(terms)
+        self.data["metadata"]["learning_order_ranking"] = RANKING_VERSION
+        self._query_cache.bump_generation()
+        self._save_data()
+        return changed
+    
+    def get_term_by_id(self, term_id: int) -> Optional[Dict[str, Any]]:
+        """ID로 용어 검색"""
+        return self._terms_by_id.get(term_id)
+    
+    @staticmethod
+    def _searchable_text(term: Dict[str, Any]) -> str:
+        """키워드 검색 대상 텍스트 (다양한 필드)"""
+        return " ".join([
+            term.get("korean_term", ""),
+            term.get("khmer_term", ""),
+            term.get("khmer_pronunciation", ""),
+            term.get("english_term", ""),
+            term.get("korean_definition", ""),
+            term.get("khmer_definition", ""),
+            term.get("korean_example", ""),
+            term.get("khmer_example", ""),
+            " ".join(term.get("tags", []))
+        ]).lower()
+    
+    def _calculate_learning_order(self, frequency_level: int, difficulty_level: str,
+                                  current_count: Optional[int] = None) -> int:
+        """학습 순서 계산 (빈도와 난이도 기반, 순위 엔진으로 전체 재계산하기 전의 데이터에 사용)"""
         # 기본 점수
         base_score = 0
         
@@ -145,86 +560,217 @@ class EnhancedAgriculturalTermManager:
         difficulty_score = difficulty_scores.get(difficulty_level, 3000)
         
         # 현재 용어 수에 따른 순서
-        current_count = len(self.data["terms"])
+        if current_count is None:
+            current_count = self._term_count()
         
         return frequency_score + difficulty_score + current_count
     
+    @cached_query
     def get_daily_words(self, day: int, limit: int = 10) -> List[Dict[str, Any]]:
         """일일 학습용 단어 가져오기"""
         start_index = (day - 1) * limit
         
-        # 학습 순서대로 정렬
-        sorted_terms = sorted(self.data["terms"], key=lambda x: x.get("learning_order", 999999))
-        
-        # 해당 날짜의 단어들
-        daily_words = sorted_terms[start_index:start_index + limit]
-        
-        return daily_words
+        # 해당 날짜의 단어들 (학습 순서 색인에서 구간만 잘라 냄, 전체 정렬 없음)
+        term_ids = self._learning_order_index.slice(start_index, start_index + limit)
+        return [self._terms_by_id[term_id] for term_id in term_ids]
     
-    def get_words_by_category(self, category: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """카테고리별 단어 가져오기"""
-        filtered_words = [term for term in self.data["terms"] if term.get("category") == category]
-        
-        # 학습 순서대로 정렬
-        sorted_words = sorted(filtered_words, key=lambda x: x.get("learning_order", 999999))
-        
+    def get_learning_order_ids(self, start: int, count: int) -> List[int]:
+        """학습 순서 start번째(0부터)부터 count개 용어 ID (복습 스케줄러의 새 카드)"""
+        return self._learning_order_index.slice(start, start + count)
+    
+    def _filtered_ids(self,
+                      ids: Optional[Iterable[int]] = None,
+                      category: str = "",
+                      difficulty_level: str = "",
+                      frequency_level: int = 0,
+                      verified_only: bool = False) -> Iterable[int]:
+        """필터 조건을 만족하는 용어 ID (패싯 비트맵 AND, ids가 있으면 그 안에서만)"""
+        return self._facet_index.select(
+            ids,
+            category=category or None,
+            difficulty_level=difficulty_level or None,
+            frequency_level=frequency_level if frequency_level > 0 else None,
+            verified=True if verified_only else None
+        )
+    
+    def _terms_in_learning_order(self, term_ids: Iterable[int], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """용어를 학습 순서대로 (limit이 있으면 앞의 limit개만)"""
+        terms = (self._terms_by_id[term_id] for term_id in term_ids)
         if limit:
-            return sorted_words[:limit]
-        return sorted_words
+            return heapq.nsmallest(limit, terms, key=lambda x: x.get("learning_order", 999999))
+        return sorted(terms, key=lambda x: x.get("learning_order", 999999))
+    
+    def build_daily_packs(self, pack_dir: Optional[str] = None,
+                          words_per_day: int = DEFAULT_WORDS_PER_DAY,
+                          days_per_pack: int = DEFAULT_DAYS_PER_PACK) -> Dict[str, Any]:
+        """일일 단어 묶음(gzip, 내용 해시 이름)과 목록을 pack_dir(기본 data/daily_packs)에 만들고 목록 반환 (빌드 단계)"""
+        manifest, packs = render_daily_packs(self, words_per_day, days_per_pack)
+        write_daily_packs(pack_dir or default_pack_dir(self.data_file_path), manifest, packs)
+        return manifest
+    
+    def get_data_generation(self) -> int:
+        """데이터 세대 (용어가 추가/수정될 때마다 올라가는 프로세스 공유 변경 번호, 응답 캐시 검증용)"""
+        return self._shared.version
+    
+    def before_fork(self) -> None:
+        """pre-fork 서버가 워커를 만들기 전 마스터에서 호출 (JSON 저장소는 열어 둔 파일이 없음)"""
+    
+    def after_fork(self) -> None:
+        """워커 프로세스가 시작될 때 호출 (JSON 저장소는 색인을 마스터와 공유하므로 할 일 없음)"""
+    
+    def get_query_cache_stats(self) -> Dict[str, Any]:
+        """조회 결과 캐시 적중/실패/제거 횟수"""
+        return self._query_cache.stats()
     
+    def get_facet_counts(self) -> Dict[str, Dict[Any, int]]:
+        """패싯(category, difficulty_level, frequency_level, verified) 값별 용어 수 (비트맵 popcount)"""
+        return self._facet_index.counts()
+    
+    @cached_query
+    def get_words_by_category(self, category: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """카테고리별 단어 가져오기 (카테고리 비트맵, 학습 순서)"""
+        return self._terms_in_learning_order(self._filtered_ids(category=category), limit)
+    
+    @cached_query
     def search_enhanced_terms(self, 
                             keyword: str = "", 
                             category: str = "", 
                             difficulty_level: str = "",
                             frequency_level: int = 0,
                             verified_only: bool = False,
-                            limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """확장된 용어 검색"""
-        results = []
-        keyword_lower = keyword.lower()
+                            limit: Optional[int] = None,
+                            mode: str = "",
+                            fuzzy: bool = False,
+                            sort: str = "") -> List[Dict[str, Any]]:
+        """확장된 용어 검색
         
-        for term in self.data["terms"]:
-            # 검증된 용어만 필터링
-            if verified_only and not term.get("verified", False):
-                continue
-                
-            # 카테고리 필터링
-            if category and term.get("category", "") != category:
-                continue
-                
-            # 난이도 필터링
-            if difficulty_level and term.get("difficulty_level", "") != difficulty_level:
-                continue
-            
-            # 빈도 필터링
-            if frequency_level > 0 and term.get("frequency_level", 0) != frequency_level:
-                continue
-            
-            # 키워드 검색 (다양한 필드에서)
-            if keyword:
-                searchable_text = " ".join([
-                    term.get("korean_term", ""),
-                    term.get("khmer_term", ""),
-                    term.get("khmer_pronunciation", ""),
-                    term.get("english_term", ""),
-                    term.get("korean_definition", ""),
-                    term.get("khmer_definition", ""),
-                    term.get("korean_example", ""),
-                    term.get("khmer_example", ""),
-                    " ".join(term.get("tags", []))
-                ]).lower()
-                
-                if keyword_lower not in searchable_text:
-                    continue
-            
-            results.append(term)
+        mode="jamo"이면 초성/입력 중인 음절로 한국어 용어 검색
+        mode="sound"이면 크메르어 발음 한글 표기를 소리로 검색 ("크룽욘가시깜" → "크룽 욘 까시깜")
+        fuzzy=True이면 표제어 오타(편집 거리 2 이내)도 허용하고 거리, 빈도 순으로 정렬
+        sort="relevance"이면 키워드 관련도(BM25) 높은 순, 같으면 학습 순서
+        """
+        term_ids, distances = self._search_ids(keyword, category, difficulty_level, frequency_level,
+                                               verified_only, mode, fuzzy)
+        
+        if keyword and (sort == "relevance" or fuzzy):
+            results = [self._terms_by_id[term_id] for term_id in term_ids]
+            if sort == "relevance":
+                return self._rank_by_relevance(keyword, results, limit)
+            return self._rank_by_distance(results, distances, limit)
         
         # 학습 순서대로 정렬
-        results.sort(key=lambda x: x.get("learning_order", 999999))
+        return self._terms_in_learning_order(term_ids, limit)
+    
+    def _search_ids(self,
+                    keyword: str = "",
+                    category: str = "",
+                    difficulty_level: str = "",
+                    frequency_level: int = 0,
+                    verified_only: bool = False,
+                    mode: str = "",
+                    fuzzy: bool = False) -> Tuple[Iterable[int], Dict[int, int]]:
+        """검색 조건을 만족하는 용어 ID와 오타 허용 검색의 편집 거리 (fuzzy가 아니면 빈 dict)"""
+        distances = {}
+        matched_ids = None
         
-        if limit:
-            return results[:limit]
-        return results
+        if keyword:
+            # 색인으로 키워드와 일치하는 용어만 추림
+            matched_ids = self._match_keyword(keyword, mode)
+            if fuzzy:
+                # 정확히 일치하는 용어는 거리 0
+                distances = self._fuzzy_matches(keyword)
+                distances.update(dict.fromkeys(matched_ids, 0))
+                matched_ids = distances.keys()
+        
+        # 검증 여부, 카테고리, 난이도, 빈도 필터는 패싯 비트맵 AND
+        term_ids = self._filtered_ids(matched_ids, category, difficulty_level, frequency_level, verified_only)
+        return term_ids, distances
+    
+    def _page_keys(self, terms: Iterable[Dict[str, Any]], keyword: str, sort: str,
+                   fuzzy: bool, distances: Dict[int, int]) -> Tuple[str, Iterable[Tuple]]:
+        """커서 페이지용 정렬 이름과 용어별 정렬 키 (search_enhanced_terms와 같은 순서, 마지막은 ID)"""
+        if keyword and sort == "relevance":
+            terms = list(terms)
+            scores = self._relevance_index.score(keyword, (term["id"] for term in terms))
+            return "relevance", ((-scores[term["id"]], term.get("learning_order", 999999), term["id"])
+                                 for term in terms)
+        if keyword and fuzzy:
+            return "fuzzy", ((distances.get(term["id"], 0), -term.get("frequency_level", 3),
+                              term.get("learning_order", 999999), term["id"]) for term in terms)
+        return "learning_order", ((term.get("learning_order", 999999), term["id"]) for term in terms)
+    
+    @cached_query
+    def search_enhanced_page(self,
+                             keyword: str = "",
+                             category: str = "",
+                             difficulty_level: str = "",
+                             frequency_level: int = 0,
+                             verified_only: bool = False,
+                             mode: str = "",
+                             fuzzy: bool = False,
+                             sort: str = "",
+                             cursor: str = "",
+                             page_size: int = DEFAULT_PAGE_SIZE,
+                             facets: bool = False) -> Dict[str, Any]:
+        """확장 검색 결과 한 페이지 (terms, next_cursor, total_count, facets=True이면 facets)
+        
+        정렬은 search_enhanced_terms와 같고, 전체 결과 대신 커서 다음 page_size개만 꺼냅니다.
+        cursor는 이전 페이지의 next_cursor (첫 페이지는 빈 문자열), 잘못된 커서는 ValueError
+        facets는 페이지가 아닌 검색 결과 전체의 패싯별 값 개수 (get_search_facets와 같음)
+        """
+        term_ids, distances = self._search_ids(keyword, category, difficulty_level, frequency_level,
+                                               verified_only, mode, fuzzy)
+        term_ids = list(term_ids)
+        
+        sort, keys = self._page_keys((self._terms_by_id[term_id] for term_id in term_ids),
+                                     keyword, sort, fuzzy, distances)
+        keys, has_more = paginate(keys, decode_cursor(cursor, sort), page_size)
+        
+        page = {
+            "terms": [self._terms_by_id[key[-1]] for key in keys],
+            "next_cursor": encode_cursor(sort, keys[-1]) if has_more else None,
+            "total_count": len(term_ids)
+        }
+        if facets:
+            page["facets"] = self._facet_index.histogram(term_ids)
+        return page
+    
+    @cached_query
+    def get_search_facets(self,
+                          keyword: str = "",
+                          category: str = "",
+                          difficulty_level: str = "",
+                          frequency_level: int = 0,
+                          verified_only: bool = False,
+                          mode: str = "",
+                          fuzzy: bool = False) -> Dict[str, Dict[Any, int]]:
+        """검색 결과 전체의 패싯(category, difficulty_level, frequency_level, verified)별 값 개수
+        
+        패싯 값마다 검색을 다시 하지 않고 결과 ID와 값별 비트맵의 교집합 비트 수로 한 번에 계산합니다.
+        """
+        term_ids, _ = self._search_ids(keyword, category, difficulty_level, frequency_level,
+                                       verified_only, mode, fuzzy)
+        return self._facet_index.histogram(term_ids)
+    
+    def suggest_terms(self, query: str, lang: str = "", limit: int = 10) -> List[Dict[str, Any]]:
+        """자동완성 후보 (용어 접두어 일치, 빈도 높은 순)
+        
+        lang: "ko" 한국어, "km" 크메르어, "en" 영어, "pron" 크메르어 발음, "" 전체
+        """
+        suggestions = []
+        for term_id in self._suggest_index.suggest(query, lang, limit):
+            term = self.get_term_by_id(term_id)
+            if term:
+                suggestions.append({
+                    "id": term_id,
+                    "korean_term": term.get("korean_term", ""),
+                    "khmer_term": term.get("khmer_term", ""),
+                    "khmer_pronunciation": term.get("khmer_pronunciation", ""),
+                    "english_term": term.get("english_term", ""),
+                    "category": term.get("category", ""),
+                    "frequency_level": term.get("frequency_level", 3)
+                })
+        return suggestions
     
     def generate_sample_enhanced_data(self, count: int = 100) -> None:
         """확장된 샘플 데이터 생성"""
@@ -284,6 +830,7 @@ class EnhancedAgriculturalTermManager:
         
         print(f"확장된 샘플 데이터 {count}개 생성 중...")
         
+        new_terms = []
         for i in range(count):
             base_term = sample_base_terms[i % len(sample_base_terms)]
             
@@ -301,37 +848,35 @@ class EnhancedAgriculturalTermManager:
                 "cultural_notes": "캄보디아 농업 문화에서 중요한 의미를 가집니다."
             }
             
-            try:
-                self.add_enhanced_term(**enhanced_term)
-                if (i + 1) % 20 == 0:
-                    print(f"  {i + 1}개 완료...")
-            except Exception as e:
-                print(f"  오류 ({i+1}번째): {e}")
+            new_terms.append(enhanced_term)
+        
+        # 한 번에 추가하고 파일은 한 번만 저장
+        self.add_enhanced_terms_bulk(new_terms)
         
         print(f"✅ {count}개 샘플 데이터 생성 완료!")
     
     def get_learning_statistics(self) -> Dict[str, Any]:
         """학습용 통계 정보"""
         total_terms = len(self.data["terms"])
-        verified_terms = len([t for t in self.data["terms"] if t.get("verified", False)])
         
-        # 카테고리별 통계
+        # 카테고리/빈도/난이도별 통계는 패싯 비트맵 popcount (값이 없으면 미분류, 3, 중급)
+        facet_counts = self.get_facet_counts()
+        verified_terms = facet_counts["verified"].get(True, 0)
+        
         category_stats = {}
+        for category, count in facet_counts["category"].items():
+            category = category or "미분류"
+            category_stats[category] = category_stats.get(category, 0) + count
+        
         frequency_stats = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-        difficulty_stats = {}
+        for frequency, count in facet_counts["frequency_level"].items():
+            frequency = frequency or 3
+            frequency_stats[frequency] = frequency_stats.get(frequency, 0) + count
         
-        for term in self.data["terms"]:
-            # 카테고리별
-            category = term.get("category", "미분류")
-            category_stats[category] = category_stats.get(category, 0) + 1
-            
-            # 빈도별
-            frequency = term.get("frequency_level", 3)
-            frequency_stats[frequency] += 1
-            
-            # 난이도별
-            difficulty = term.get("difficulty_level", "중급")
-            difficulty_stats[difficulty] = difficulty_stats.get(difficulty, 0) + 1
+        difficulty_stats = {}
+        for difficulty, count in facet_counts["difficulty_level"].items():
+            difficulty = difficulty or "중급"
+            difficulty_stats[difficulty] = difficulty_stats.get(difficulty, 0) + count
         
         # 일일 학습 통계
         total_days_needed = (total_terms + 9) // 10  # 올림
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+농업용어 패싯 비트맵 색인
+Per-facet-value bitmaps (Python int bitsets) for filtering and counting
+
+용어 ID를 비트 위치로 하는 비트맵을 패싯 값마다 유지합니다.
+필터 조합은 비트 AND, 패싯별 개수는 비트 수(popcount)로 계산하므로 용어를 하나씩 확인하지 않습니다.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+# 패싯 필드와 값이 없을 때의 기본값 (검색 필터의 기존 비교와 같은 값)
+FACET_DEFAULTS = {
+    "category": "",
+    "difficulty_level": "",
+    "frequency_level": 0,
+    "verified": False
+}
+
+
+if hasattr(int, "bit_count"):
+    def popcount(bits: int) -> int:
+        """켜진 비트 수"""
+        return bits.bit_count()
+else:
+    # Python 3.10 미만
+    def popcount(bits: int) -> int:
+        """켜진 비트 수"""
+        return bin(bits).count("1")
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """켜진 비트 위치 (오름차순)"""
+    text = bin(bits)[:1:-1]
+    position = text.find("1")
+    while position >= 0:
+        yield position
+        position = text.find("1", position + 1)
+
+
+def bitmap_from_ids(ids: Iterable[int]) -> int:
+    """ID 목록을 비트맵으로 변환"""
+    ids = list(ids)
+    if not ids:
+        return 0
+    buffer = bytearray(max(ids) // 8 + 1)
+    for doc_id in ids:
+        buffer[doc_id >> 3] |= 1 << (doc_id & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def facet_histogram(terms: Iterable[Dict[str, Any]], facets: Dict[str, Any] = None) -> Dict[str, Dict[Any, int]]:
+    """용어 목록을 한 번 순회해 패싯별 값 개수 집계 (색인이 없는 결과용)"""
+    facets = FACET_DEFAULTS if facets is None else facets
+    result: Dict[str, Dict[Any, int]] = {facet: {} for facet in facets}
+    for term in terms:
+        for facet, default in facets.items():
+            value = term.get(facet, default)
+            if isinstance(default, bool):
+                value = bool(value)
+            counts = result[facet]
+            counts[value] = counts.get(value, 0) + 1
+    return result
+
+
+class FacetIndex:
+    """패싯 값별 용어 ID 비트맵 (category, difficulty_level, frequency_level, verified)"""
+
+    def __init__(self, facets: Dict[str, Any] = None):
+        self.defaults = dict(FACET_DEFAULTS if facets is None else facets)
+        self.bitmaps: Dict[str, Dict[Any, int]] = {facet: {} for facet in self.defaults}
+        self.all = 0
+        self._values: Dict[int, Tuple] = {}
+
+    def _facet_values(self, term: Dict[str, Any]) -> Tuple:
+        """용어의 패싯 값 (없으면 기본값, verified는 bool)"""
+        values = []
+        for facet, default in self.defaults.items():
+            value = term.get(facet, default)
+            values.append(bool(value) if isinstance(default, bool) else value)
+        return tuple(values)
+
+    def add(self, doc_id: int, term: Dict[str, Any]) -> None:
+        """용어 추가 (이미 있으면 교체)"""
+        self.remove(doc_id)
+
+        values = self._facet_values(term)
+        self._values[doc_id] = values
+        bit = 1 << doc_id
+        self.all |= bit
+        for facet, value in zip(self.defaults, values):
+            bitmaps = self.bitmaps[facet]
+            bitmaps[value] = bitmaps.get(value, 0) | bit
+
+    def add_many(self, terms: Iterable[Dict[str, Any]]) -> None:
+        """여러 용어 추가 (값별로 ID를 모아 비트맵을 한 번씩만 갱신)"""
+        groups: Dict[Tuple[str, Any], list] = {}
+        added = []
+        for term in terms:
+            doc_id = term["id"]
+            self.remove(doc_id)
+
+            values = self._facet_values(term)
+            self._values[doc_id] = values
+            added.append(doc_id)
+            for facet, value in zip(self.defaults, values):
+                groups.setdefault((facet, value), []).append(doc_id)
+
+        if not added:
+            return
+        self.all |= bitmap_from_ids(added)
+        for (facet, value), ids in groups.items():
+            bitmaps = self.bitmaps[facet]
+            bitmaps[value] = bitmaps.get(value, 0) | bitmap_from_ids(ids)
+
+    def remove(self, doc_id: int) -> None:
+        """용어 제거"""
+        values = self._values.pop(doc_id, None)
+        if values is None:
+            return
+
+        mask = ~(1 << doc_id)
+        self.all &= mask
+        for facet, value in zip(self.defaults, values):
+            bitmaps = self.bitmaps[facet]
+            bits = bitmaps[value] & mask
+            if bits:
+                bitmaps[value] = bits
+            else:
+                del bitmaps[value]
+
+    def match(self, within: Optional[int] = None, **criteria) -> int:
+        """조건을 모두 만족하는 용어 비트맵 (값이 None이면 그 패싯은 조건 없음)"""
+        bits = self.all if within is None else within & self.all
+        for facet, value in criteria.items():
+            if value is None:
+                continue
+            bits &= self.bitmaps[facet].get(value, 0)
+            if not bits:
+                break
+        return bits
+
+    def select(self, ids: Optional[Iterable[int]] = None, **criteria) -> Iterable[int]:
+        """조건을 모두 만족하는 ID (오름차순, ids가 있으면 그 안에서만)
+
+        조건이 없으면 비트맵을 거치지 않고, 후보가 비트맵 크기에 비해 적으면
+        비트맵을 만드는 대신 보관한 패싯 값으로 직접 확인합니다.
+        """
+        criteria = {facet: value for facet, value in criteria.items() if value is not None}
+        if ids is None:
+            return iter_bits(self.match(**criteria))
+
+        ids = sorted(ids)
+        if not criteria:
+            return ids
+        if len(ids) * 64 < self.all.bit_length():
+            positions = [(list(self.defaults).index(facet), value) for facet, value in criteria.items()]
+            values = self._values
+            return [doc_id for doc_id in ids
+                    if doc_id in values and all(values[doc_id][i] == value for i, value in positions)]
+        return iter_bits(self.match(bitmap_from_ids(ids), **criteria))
+
+    def histogram(self, ids: Optional[Iterable[int]] = None) -> Dict[str, Dict[Any, int]]:
+        """ID 목록(없으면 전체)의 패싯별 값 개수
+
+        후보가 비트맵 크기에 비해 적으면 보관한 패싯 값을 한 번 순회해 세고,
+        많으면 후보 비트맵과 값별 비트맵의 교집합 비트 수로 계산합니다.
+        """
+        if ids is None:
+            return self.counts()
+
+        ids = list(ids)
+        if len(ids) == len(self._values):
+            # 색인의 ID 전체
+            return self.counts()
+        if len(ids) * 64 >= self.all.bit_length():
+            return self.counts(bitmap_from_ids(ids))
+
+        result: Dict[str, Dict[Any, int]] = {facet: {} for facet in self.defaults}
+        columns = list(result.values())
+        for doc_id in ids:
+            values = self._values.get(doc_id)
+            if values is None:
+                continue
+            for counts, value in zip(columns, values):
+                counts[value] = counts.get(value, 0) + 1
+        return result
+
+    def counts(self, within: Optional[int] = None) -> Dict[str, Dict[Any, int]]:
+        """패싯별 값 개수 (within이 있으면 그 비트맵 안에서만)"""
+        result = {}
+        for facet, bitmaps in self.bitmaps.items():
+            if within is None:
+                result[facet] = {value: popcount(bits) for value, bits in bitmaps.items()}
+            else:
+                counts = {value: popcount(bits & within) for value, bits in bitmaps.items()}
+                result[facet] = {value: count for value, count in counts.items() if count}
+        return result
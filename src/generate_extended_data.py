@@ -123,6 +123,7 @@ class ExtendedDataGenerator:
         print(f"현재: {current_count}개 → 목표: {target_count}개")
         
         generated_count = 0
+        new_terms = []
         
         # 카테고리별로 용어 생성
         categories = list(self.base_terms.keys())
@@ -143,8 +144,7 @@ class ExtendedDataGenerator:
                         base_term, category, variation_num, i + 1
                     )
                     
-                    # 데이터베이스에 추가
-                    term_id = self.manager.add_enhanced_term(**enhanced_term)
+                    new_terms.append(enhanced_term)
                     generated_count += 1
                     
                     if generated_count % 100 == 0:
@@ -173,7 +173,7 @@ class ExtendedDataGenerator:
                     # 일반적인 농업용어 생성
                     enhanced_term = self._create_generic_term(category, i + 1)
                     
-                    term_id = self.manager.add_enhanced_term(**enhanced_term)
+                    new_terms.append(enhanced_term)
                     generated_count += 1
                     
                     if generated_count % 50 == 0:
@@ -182,6 +182,10 @@ class ExtendedDataGenerator:
                 except Exception as e:
                     print(f"  ❌ 오류 (추가 항목 {i+1}): {e}")
         
+        # 생성한 용어를 한 번에 추가 (파일 저장 1회)
+        print(f"\n💾 {len(new_terms)}개 용어 저장 중...")
+        self.manager.add_enhanced_terms_bulk(new_terms)
+        
         print(f"\n🎉 총 {generated_count}개의 농업용어 생성 완료!")
         
         # 최종 통계 출력
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+HTTP 캐시 헤더와 조건부 요청 도우미
+ETag / If-None-Match helpers for Flask responses
+
+응답마다 강한 ETag와 Cache-Control을 붙이고, 클라이언트가 보낸 If-None-Match가 같으면
+본문을 만들지 않고 304를 돌려줍니다.
+gzip을 받는 클라이언트에는 압축 본문이 나갈 수 있으므로 ETag에 "-gzip"을 붙입니다 (static_pages와 같은 방식).
+요청 헤더만으로 정하므로 200과 304, 어느 워커가 응답하든 같은 ETag입니다.
+읽기 API의 ETag는 관리자 데이터 세대와 정규화한 요청 주소로 만들므로 계산 없이 바로 비교할 수 있습니다.
+"""
+
+import hashlib
+import os
+from functools import wraps
+from typing import Callable, Optional
+from urllib.parse import urlencode
+
+from flask import Response, current_app, request
+
+# 내용이 바뀔 수 있는 주소: 캐시는 하되 매번 ETag로 확인 (바뀌지 않았으면 304)
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# 데이터 세대는 서버를 다시 시작하면 0부터 다시 세므로 프로세스 시작마다 다른 값을 ETag에 섞음
+_SERVER_TAG = os.urandom(8).hex()
+
+
+def representation_etag(etag: str) -> str:
+    """Accept-Encoding에 따른 표현별 ETag (gzip을 받으면 "-gzip"을 붙임)"""
+    return f"{etag}-gzip" if accepts_encoding("gzip") else etag
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str = REVALIDATE_CACHE_CONTROL) -> Response:
+    """응답에 표현별 강한 ETag, Vary와 Cache-Control 설정"""
+    response.set_etag(representation_etag(etag))
+    response.vary.add("Accept-Encoding")
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+
+def not_modified(etag: str, cache_control: str = REVALIDATE_CACHE_CONTROL) -> Optional[Response]:
+    """요청의 If-None-Match가 etag와 같으면 304 응답 (아니면 None)"""
+    if not request.if_none_match.contains_weak(representation_etag(etag)):
+        return None
+    return set_cache_headers(Response(status=304), etag, cache_control)
+
+
+def accepts_encoding(encoding: str) -> bool:
+    """클라이언트가 Accept-Encoding으로 encoding을 받는지"""
+    return request.accept_encodings[encoding] > 0
+
+
+def query_etag(generation: int) -> str:
+    """데이터 세대 + 요청 경로 + 정규화한 쿼리(빈 값 제외, 이름순)로 만든 ETag"""
+    args = sorted((key, value) for key, value in request.args.items(multi=True) if value != "")
+    source = f"{_SERVER_TAG}|{generation}|{request.path}?{urlencode(args)}"
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:24]
+
+
+def conditional_get(data_generation: Callable[[], int]) -> Callable:
+    """읽기 API 뷰에 조건부 요청 적용하는 데코레이터
+
+    If-None-Match가 현재 ETag와 같으면 뷰를 실행하지 않고 304를 반환하고,
+    아니면 뷰의 200 응답에 ETag를 붙입니다 (오류 응답은 그대로).
+    """
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = query_etag(data_generation())
+            cached = not_modified(etag)
+            if cached:
+                return cached
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                set_cache_headers(response, etag)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+농업용어 검색 색인 파일
+Versioned on-disk snapshot of the in-memory search indexes
+
+서버를 다시 시작할 때마다 모든 색인(n-gram 역색인, 패싯 비트맵 등)을 새로 만들지 않도록
+색인 객체를 데이터 JSON 옆의 .idx 파일에 저장해 두고, 시작할 때 읽어서 복원합니다.
+색인은 역직렬화되어 프로세스 메모리에 올라가므로, 여러 워커가 공유하려면
+pre-fork 서버(gunicorn.conf.py)로 마스터에서 한 번 읽고 fork합니다.
+
+파일 구조: MAGIC | 헤더 길이(uint32 LE) | 헤더(JSON) | 본문(pickle)
+헤더에는 형식 버전, 데이터 파일 내용 해시, 색인 코드 지문이 들어 있어
+하나라도 다르면 파일을 쓰지 않고 색인을 다시 만듭니다.
+본문은 이 서버가 직접 만든 로컬 빌드 산출물이므로 pickle로 직렬화합니다 (외부에서 받은 파일은 읽지 마세요).
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import struct
+import sys
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+INDEX_MAGIC = b"AGRIIDX\n"
+# 저장하는 색인 구조가 바뀌면 올림
+INDEX_VERSION = 1
+
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+def index_path_for(data_file_path: str) -> str:
+    """데이터 파일에 대응하는 색인 파일 경로 (확장자를 .idx로)"""
+    return os.path.splitext(data_file_path)[0] + ".idx"
+
+
+def content_hash(raw: bytes) -> str:
+    """데이터 파일 내용 해시 (SHA-256)"""
+    return hashlib.sha256(raw).hexdigest()
+
+
+def code_fingerprint(module_names: Iterable[str]) -> str:
+    """색인을 만드는 모듈 소스의 해시 (코드가 바뀌면 이전 색인 파일을 쓰지 않음)"""
+    digest = hashlib.sha256()
+    for name in sorted(module_names):
+        module = sys.modules.get(name)
+        path = getattr(module, "__file__", None)
+        digest.update(name.encode("utf-8"))
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def write_index_file(index_path: str, data_hash: str, fingerprint: str, state: Any) -> int:
+    """색인 상태를 파일에 원자적으로 저장하고 파일 크기(바이트)를 반환"""
+    payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    header = json.dumps({
+        "version": INDEX_VERSION,
+        "content_hash": data_hash,
+        "fingerprint": fingerprint,
+        "python": list(sys.version_info[:2]),
+        "created": datetime.now().isoformat(),
+        "payload_size": len(payload)
+    }, separators=(",", ":")).encode("utf-8")
+
+    directory = os.path.dirname(index_path) or '.'
+    os.makedirs(directory, exist_ok=True)
+
+    # 여러 워커가 동시에 만들어도 서로의 임시 파일을 덮어쓰지 않도록 PID를 붙임
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(INDEX_MAGIC)
+        f.write(_HEADER_LENGTH.pack(len(header)))
+        f.write(header)
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, index_path)
+    return len(INDEX_MAGIC) + _HEADER_LENGTH.size + len(header) + len(payload)
+
+
+def read_index_file(index_path: str, data_hash: str, fingerprint: str) -> Optional[Any]:
+    """데이터 해시와 코드 지문이 맞는 색인 파일의 상태 (없거나 맞지 않거나 손상되면 None)
+
+    헤더를 먼저 읽어 확인하므로 맞지 않는 파일은 본문을 읽지 않습니다.
+    """
+    try:
+        with open(index_path, "rb") as f:
+            if f.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                return None
+            (length,) = _HEADER_LENGTH.unpack(f.read(_HEADER_LENGTH.size))
+            header = json.loads(f.read(length).decode("utf-8"))
+
+            if (header.get("version") != INDEX_VERSION
+                    or header.get("content_hash") != data_hash
+                    or header.get("fingerprint") != fingerprint
+                    or header.get("python") != list(sys.version_info[:2])):
+                return None
+
+            payload = f.read(header["payload_size"])
+            if len(payload) != header["payload_size"]:
+                return None
+            return pickle.loads(payload)
+    except (OSError, ValueError, KeyError, struct.error, pickle.UnpicklingError,
+            EOFError, AttributeError, ImportError):
+        return None
+
+
+if __name__ == "__main__":
+    # 빌드 단계: 데이터 파일의 색인 파일을 (필요하면) 다시 만듦
+    import time
+
+    from enhanced_term_manager import EnhancedAgriculturalTermManager
+
+    data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+    data_paths = sys.argv[1:] or [os.path.join(data_dir, "enhanced_agricultural_terms.json")]
+
+    print("🗂️ 검색 색인 파일 빌드")
+    for data_path in data_paths:
+        started = time.perf_counter()
+        manager = EnhancedAgriculturalTermManager(data_path)
+        elapsed = (time.perf_counter() - started) * 1000
+        index_path = index_path_for(data_path)
+        size = os.path.getsize(index_path) if os.path.exists(index_path) else 0
+        state = "최신 색인 사용" if manager.index_file_loaded else "색인 새로 생성"
+        print(f"  ✅ {os.path.basename(data_path)} → {os.path.basename(index_path)}: "
+              f"{len(manager.data['terms']):,}개 용어, {size / 1024 / 1024:.1f}MB ({state}, {elapsed:.0f}ms)")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+크메르어 문자열 정규화
+Khmer grapheme-cluster normalization
+
+입력기마다 코엥(្) 하위자음, 모음, 기호의 입력 순서가 달라 같은 단어가 다른 코드열이 됩니다.
+NFC 정규화 후 음절(자음 + 결합 기호) 단위로 표준 순서로 재배열하고 폭 없는 공백을 제거합니다.
+"""
+
+import re
+import unicodedata
+
+COENG = "\u17D2"
+RO = "\u179A"
+REGISTER_SHIFTERS = "\u17C9\u17CA"
+ROBAT = "\u17CC"
+
+# 분리 입력된 복합 모음 ( េ + ី → ើ, េ + ា → ោ)
+SPLIT_VOWELS = {
+    "\u17C1\u17B8": "\u17BE",
+    "\u17C1\u17B6": "\u17C4",
+}
+
+ZERO_WIDTH = dict.fromkeys(map(ord, "\u200B\u200C\u200D\u2060\uFEFF"))
+
+KHMER_CHAR_RE = re.compile(r"[\u1780-\u17FF\u19E0-\u19FF]")
+
+# 재배열이 필요한 패턴: 코엥 앞의 모음/기호, 코엥-로 뒤의 다른 코엥, 모음 뒤의 음역 기호, 분리 모음
+NEEDS_REORDER_RE = re.compile(
+    "[\u17B4-\u17D1\u17D3\u17DD]\u17D2"
+    "|\u17D2\u179A\u17D2"
+    "|[\u17B6-\u17C5\u17CC][\u17C9\u17CA]"
+    "|\u17C1[\u17B6\u17B8]"
+)
+
+
+def _is_base(char: str) -> bool:
+    """음절의 기저 문자 (자음, 독립 모음)"""
+    return "\u1780" <= char <= "\u17B3"
+
+
+def _is_mark(char: str) -> bool:
+    """기저 문자 뒤에 붙는 결합 문자"""
+    return "\u17B4" <= char <= "\u17D3" or char == "\u17DD"
+
+
+def _reorder_cluster(base: str, marks: str) -> str:
+    """음절 하나를 표준 순서로 재배열
+
+    기저 문자, 코엥 하위자음(로 ្រ는 마지막), 음역 기호, 로밧, 모음, 기타 기호 순
+    """
+    subscripts, shifters, robat, vowels, signs = [], [], [], [], []
+
+    i = 0
+    while i < len(marks):
+        char = marks[i]
+        if char == COENG and i + 1 < len(marks) and _is_base(marks[i + 1]):
+            subscripts.append(marks[i:i + 2])
+            i += 2
+            continue
+        if char in REGISTER_SHIFTERS:
+            shifters.append(char)
+        elif char == ROBAT:
+            robat.append(char)
+        elif "\u17B6" <= char <= "\u17C5":
+            vowels.append(char)
+        else:
+            signs.append(char)
+        i += 1
+
+    subscripts.sort(key=lambda pair: pair[1] == RO)
+
+    vowel_text = "".join(vowels)
+    for split, combined in SPLIT_VOWELS.items():
+        vowel_text = vowel_text.replace(split, combined)
+
+    return base + "".join(subscripts) + "".join(shifters) + "".join(robat) + vowel_text + "".join(signs)
+
+
+def contains_khmer(text: str) -> bool:
+    """크메르 문자가 포함되어 있는지 여부"""
+    return bool(KHMER_CHAR_RE.search(text))
+
+
+def normalize_khmer(text: str) -> str:
+    """크메르어 문자열 정규화 (NFC, 음절 내 표준 순서, 폭 없는 공백 제거)"""
+    if not text:
+        return text
+
+    text = unicodedata.normalize("NFC", text).translate(ZERO_WIDTH)
+    if not NEEDS_REORDER_RE.search(text):
+        return text
+
+    result = []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if not _is_base(char):
+            result.append(char)
+            i += 1
+            continue
+
+        # 기저 문자 뒤의 결합 문자(코엥 + 자음 포함)를 모아 한 음절로 처리
+        j = i + 1
+        while j < len(text):
+            if text[j] == COENG and j + 1 < len(text) and _is_base(text[j + 1]):
+                j += 2
+            elif _is_mark(text[j]):
+                j += 1
+            else:
+                break
+
+        result.append(_reorder_cluster(char, text[i + 1:j]))
+        i = j
+
+    return "".join(result)
+
+
+def is_khmer_query(text: str) -> bool:
+    """공백을 제외한 모든 문자가 크메르 문자인 질의인지 여부"""
+    stripped = "".join(text.split())
+    return bool(stripped) and all(KHMER_CHAR_RE.match(char) for char in stripped)
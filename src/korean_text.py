@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+한글 자모 처리
+Hangul jamo decomposition, initial-consonant (choseong) and sound-alike keys
+"""
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+# 호환용 자모 (키보드 입력과 같은 코드)
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+             "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+# 겹자모는 입력 순서대로 풀어서 "입력 중인 글자"가 접두어가 되도록 함 (과 → ㄱㅗㅏ, 닭 → ㄷㅏㄹㄱ)
+COMPOUND_JAMO = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ",
+    "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ"
+}
+
+# 발음 표기에서 서로 바꿔 적는 비슷한 소리 (된소리 → 예사소리, ㅐ → ㅔ)
+SIMILAR_JAMO = str.maketrans({
+    "ㄲ": "ㄱ", "ㄸ": "ㄷ", "ㅃ": "ㅂ", "ㅆ": "ㅅ", "ㅉ": "ㅈ",
+    "ㅐ": "ㅔ", "ㅒ": "ㅖ"
+})
+
+CONSONANTS = set("ㄱㄲㄳㄴㄵㄶㄷㄸㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅃㅄㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ")
+
+
+def is_hangul_syllable(char: str) -> bool:
+    """완성형 한글 음절 여부"""
+    return HANGUL_BASE <= ord(char) <= HANGUL_LAST
+
+
+def decompose_hangul(text: str) -> str:
+    """한글 음절을 자모열로 분해 (겹자모도 분해, 한글 외 문자는 소문자로 유지)"""
+    result = []
+    for char in text:
+        if is_hangul_syllable(char):
+            offset = ord(char) - HANGUL_BASE
+            cho, rest = divmod(offset, 21 * 28)
+            jung, jong = divmod(rest, 28)
+            jamo = CHOSEONG[cho] + JUNGSEONG[jung] + JONGSEONG[jong]
+        else:
+            jamo = char.lower()
+        result.append("".join(COMPOUND_JAMO.get(j, j) for j in jamo))
+    return "".join(result)
+
+
+def choseong_key(text: str) -> str:
+    """초성 검색 키 (공백 제거, 한글 음절은 초성만)"""
+    result = []
+    for char in text:
+        if char.isspace():
+            continue
+        if is_hangul_syllable(char):
+            result.append(CHOSEONG[(ord(char) - HANGUL_BASE) // (21 * 28)])
+        else:
+            result.append(char.lower())
+    return "".join(result)
+
+
+def is_choseong_query(text: str) -> bool:
+    """초성(자음)만으로 된 질의인지 여부 (예: "ㅂㄹ")"""
+    stripped = "".join(text.split())
+    return bool(stripped) and all(char in CONSONANTS for char in stripped)
+
+
+def sound_key(text: str) -> str:
+    """소리 검색 키 (자모 분해, 공백/기호 제거, 비슷한 자모 통합)
+
+    "크룽 욘 까시깜"과 "크룽욘가시깜"은 같은 키가 됩니다.
+    """
+    jamo = decompose_hangul("".join(char for char in text if char.isalnum()))
+    return jamo.translate(SIMILAR_JAMO)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+농업용어 학습 순서 색인과 순위 엔진
+Sorted (learning_order, id) index and the learning_order ranking engine
+
+용어를 (learning_order, id) 오름차순 키 목록으로 유지합니다.
+추가/수정은 이진 탐색 위치에만 반영하므로 일일 단어 조회는 전체 정렬 없이 위치 구간만 잘라 냅니다.
+
+순위 엔진은 빈도, 난이도, 카테고리 균형으로 전체 learning_order를 한 번의 정렬로 다시 계산하고,
+순서 값 사이에 간격(LEARNING_ORDER_STEP)을 두어 이후 용어 하나의 추가/수정은 이웃 사이 값으로만 배치합니다.
+"""
+
+from bisect import bisect_left, insort
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# learning_order가 없는 용어의 기본 순서 (맨 뒤)
+DEFAULT_LEARNING_ORDER = 999999
+
+# 순위 엔진 버전 (메타데이터 learning_order_ranking에 기록, 있으면 새 용어도 엔진으로 배치)
+RANKING_VERSION = 1
+
+# 전체 재계산 시 순위 사이 간격 (개별 배치가 들어갈 여유)
+LEARNING_ORDER_STEP = 1000
+
+# 난이도 단계 (기초 먼저)
+DIFFICULTY_RANKS = {"기초": 0, "중급": 1, "고급": 2}
+
+
+def learning_order_key(term: Dict[str, Any]) -> Tuple[int, int]:
+    """학습 순서 정렬 키 (같은 순서이면 ID 순)"""
+    return (term.get("learning_order", DEFAULT_LEARNING_ORDER), term.get("id"))
+
+
+class LearningOrderIndex:
+    """(learning_order, id) 오름차순으로 정렬된 용어 키 목록"""
+
+    def __init__(self, terms: Iterable[Dict[str, Any]] = ()):
+        self._orders: Dict[int, int] = {}
+        self.keys: List[Tuple[int, int]] = []
+        self.build(terms)
+
+    def build(self, terms: Iterable[Dict[str, Any]]) -> None:
+        """용어 전체로 다시 구성 (정렬 한 번)"""
+        self.keys = sorted(learning_order_key(term) for term in terms)
+        self._orders = {doc_id: order for order, doc_id in self.keys}
+
+    def add(self, term: Dict[str, Any]) -> None:
+        """용어 추가 (이미 있으면 새 learning_order 위치로 이동)"""
+        self.remove(term.get("id"))
+        key = learning_order_key(term)
+        self._orders[key[1]] = key[0]
+        insort(self.keys, key)
+
+    def remove(self, doc_id: int) -> None:
+        """용어 제거"""
+        order = self._orders.pop(doc_id, None)
+        if order is None:
+            return
+        position = bisect_left(self.keys, (order, doc_id))
+        del self.keys[position]
+
+    def position(self, doc_id: int) -> int:
+        """학습 순서에서 용어의 위치 (0부터, 없으면 -1)"""
+        order = self._orders.get(doc_id)
+        if order is None:
+            return -1
+        return bisect_left(self.keys, (order, doc_id))
+
+    def slice(self, start: int, stop: int) -> List[int]:
+        """학습 순서 start ~ stop 구간의 용어 ID (리스트 슬라이스와 같은 의미)"""
+        return [doc_id for _, doc_id in self.keys[start:stop]]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+def level_score(term: Dict[str, Any]) -> int:
+    """빈도/난이도 단계 점수 (낮을수록 먼저, 기존 learning_order 식과 같은 가중치: 빈도 1단계 = 1, 난이도 1단계 = 3)"""
+    frequency_score = 6 - term.get("frequency_level", 3)
+    return frequency_score + 3 * DIFFICULTY_RANKS.get(term.get("difficulty_level"), 1)
+
+
+class LearningOrderRanker:
+    """빈도, 난이도, 카테고리 균형으로 학습 순서를 정하는 순위 엔진
+
+    순위 키는 (단계 점수, 같은 점수·카테고리 안에서의 차례, 카테고리 순서, ID)이므로
+    같은 단계 점수 안에서는 카테고리를 번갈아 배치해 하루 분량이 한 카테고리에 몰리지 않습니다.
+    개별 배치 후 다른 용어의 차례는 다시 매기지 않으며, 다음 전체 재계산 때 정리됩니다.
+    """
+
+    def __init__(self, categories: Sequence[str] = ()):
+        self._category_ranks = {category: rank for rank, category in enumerate(categories)}
+        self._keys: Dict[int, Tuple] = {}
+        self._groups: Dict[Tuple[int, str], List[int]] = {}
+
+    def _category_rank(self, category: str) -> Tuple[int, str]:
+        """카테고리 정렬 값 (기본 카테고리 목록 순서, 목록에 없으면 그 뒤에 이름 순)"""
+        return (self._category_ranks.get(category, len(self._category_ranks)), category)
+
+    @staticmethod
+    def _group(term: Dict[str, Any]) -> Tuple[int, str]:
+        return (level_score(term), term.get("category", ""))
+
+    def index_terms(self, terms: Iterable[Dict[str, Any]]) -> None:
+        """용어 전체의 순위 키 계산 (learning_order는 바꾸지 않음)"""
+        self._keys = {}
+        self._groups = {}
+        for term in sorted(terms, key=itemgetter("id")):
+            group = self._group(term)
+            members = self._groups.setdefault(group, [])
+            self._keys[term["id"]] = (group[0], len(members), self._category_rank(group[1]), term["id"])
+            members.append(term["id"])
+
+    def rank(self, terms: Iterable[Dict[str, Any]]) -> Dict[int, int]:
+        """전체 용어의 learning_order를 한 번의 정렬로 계산 (ID → 순위 × LEARNING_ORDER_STEP)"""
+        self.index_terms(terms)
+        ordered = sorted(self._keys.items(), key=itemgetter(1))
+        return {doc_id: (position + 1) * LEARNING_ORDER_STEP for position, (doc_id, _) in enumerate(ordered)}
+
+    def add(self, term: Dict[str, Any]) -> Tuple:
+        """용어 하나의 순위 키를 다시 계산 (다른 용어의 키는 그대로)"""
+        doc_id = term["id"]
+        self.remove(doc_id)
+
+        group = self._group(term)
+        members = self._groups.setdefault(group, [])
+        insort(members, doc_id)
+        key = (group[0], bisect_left(members, doc_id), self._category_rank(group[1]), doc_id)
+        self._keys[doc_id] = key
+        return key
+
+    def remove(self, doc_id: int) -> None:
+        """용어 제거"""
+        key = self._keys.pop(doc_id, None)
+        if key is None:
+            return
+        members = self._groups[(key[0], key[2][1])]
+        del members[bisect_left(members, doc_id)]
+
+    def place(self, term: Dict[str, Any], index: LearningOrderIndex) -> Optional[int]:
+        """다른 용어는 그대로 두고 term이 들어갈 learning_order (이웃 사이에 빈 값이 없으면 None)
+
+        index에서 term을 빼고, 순위 키로 이진 탐색한 위치의 앞뒤 learning_order 중간 값을 씁니다.
+        """
+        key = self.add(term)
+        index.remove(term["id"])
+
+        keys = index.keys
+        low, high = 0, len(keys)
+        while low < high:
+            middle = (low + high) // 2
+            if self._keys[keys[middle][1]] < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        previous = keys[low - 1][0] if low else 0
+        following = keys[low][0] if low < len(keys) else previous + 2 * LEARNING_ORDER_STEP
+        if following - previous < 2:
+            return None
+        return (previous + following) // 2
+
+
+if __name__ == "__main__":
+    # 전체 learning_order 재계산 작업 (TERM_STORAGE_BACKEND에 따라 JSON 또는 SQLite)
+    import sys
+    import time
+
+    from term_storage import create_enhanced_term_manager
+
+    data_file_path = sys.argv[1] if len(sys.argv) > 1 else None
+    manager = create_enhanced_term_manager(data_file_path)
+
+    print("🔢 학습 순서 전체 재계산")
+    started = time.perf_counter()
+    changed = manager.recompute_learning_order()
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"  ✅ {manager._term_count():,}개 용어 중 {changed:,}개 변경 ({elapsed:.0f}ms)")
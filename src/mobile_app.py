@@ -4,7 +4,8 @@
 Mobile Learning App for Cambodian Agricultural Terms
 """
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for, send_from_directory
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, send_from_directory
+import gzip
 import os
 import sys
 from datetime import datetime
@@ -13,7 +14,13 @@ import json
 # 현재 디렉토리를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from enhanced_term_manager import EnhancedAgriculturalTermManager
+from term_storage import create_enhanced_term_manager
+from pagination import clamp_page_size
+from review_scheduler import ReviewScheduler
+from daily_packs import DailyPackStore, PACK_CACHE_CONTROL, format_word
+from http_cache import accepts_encoding, conditional_get, not_modified, set_cache_headers
+from static_pages import PageCache
+from compression import ResponseCompressor
 
 app = Flask(__name__, 
            template_folder=os.path.join(os.path.dirname(__file__), '..', 'templates'),
@@ -21,8 +28,36 @@ app = Flask(__name__,
 
 app.secret_key = 'mobile_learning_app_secret_2024'
 
+# JSON/HTML 응답 gzip 압축 (RESPONSE_COMPRESSION_LEVEL, RESPONSE_COMPRESSION_MIN_SIZE)
+compressor = ResponseCompressor()
+compressor.init_app(app)
+
 # 전역 매니저 인스턴스
-enhanced_manager = EnhancedAgriculturalTermManager()
+enhanced_manager = create_enhanced_term_manager()
+
+# pre-fork 워커끼리 용어 변경 공유 (요청마다 다른 워커가 바꾼 데이터를 먼저 반영)
+app.before_request(enhanced_manager.refresh)
+
+# 학습자별 복습 일정 (응답 저널 + 스냅샷, 새 카드는 학습 순서대로)
+review_scheduler = ReviewScheduler(
+    os.path.join(os.path.dirname(__file__), '..', 'data', 'review_state.json'),
+    new_cards=enhanced_manager.get_learning_order_ids
+)
+
+# 일일 단어 묶음 (gzip 미리 압축, 내용 해시 이름, 용어가 바뀌면 다음 요청에서 다시 만듦)
+daily_packs = DailyPackStore(enhanced_manager)
+
+def _read_page(file_name):
+    """저장소 최상위의 HTML 파일 본문"""
+    with open(os.path.join(os.path.dirname(app.root_path), file_name), 'rb') as f:
+        return f.read()
+
+# 5,000단어 학습 앱 페이지 (각 2.5MB, 한 번 렌더링해 gzip/deflate 압축본과 함께 메모리에 보관)
+page_cache = PageCache()
+page_cache.register('v3_5000', lambda: render_template('agricultural_learning_v3_5000.html'))
+page_cache.register('v3_5000_optimized', lambda: render_template('agricultural_learning_v3_5000_optimized.html'))
+page_cache.register('agri_search', lambda: _read_page('Agri-search.html'))
+page_cache.register('cambodia_agri_app', lambda: _read_page('Cambodia_Agri_App_5000.html'))
 
 @app.route('/')
 def index():
@@ -47,17 +82,17 @@ def agricultural_learning_v3():
 @app.route('/mobile/v3/5000')
 def agricultural_learning_v3_5000():
     """5,000개 농업용어 학습 앱 V3"""
-    return render_template('agricultural_learning_v3_5000.html')
+    return page_cache.response('v3_5000')
 
 @app.route('/mobile/v3/5000/optimized') 
 def agricultural_learning_v3_5000_optimized():
     """5,000개 농업용어 학습 앱 V3 (성능 최적화)"""
-    return render_template('agricultural_learning_v3_5000_optimized.html')
+    return page_cache.response('v3_5000_optimized')
 
 @app.route('/agri-search')
 def agri_search():
     """Agri-Search: 캄보디아 농업용어 검색 시스템"""
-    return send_from_directory(os.path.dirname(app.root_path), 'Agri-search.html')
+    return page_cache.response('agri_search')
 
 @app.route('/cambodia-agri-app')
 def cambodia_agri_app():
@@ -66,14 +101,10 @@ def cambodia_agri_app():
 
 @app.route('/download/cambodia-agri-app')
 def download_cambodia_agri_app():
-    """Cambodia Agri App 다운로드"""
-    return send_from_directory(
-        os.path.dirname(app.root_path), 
-        'Cambodia_Agri_App_5000.html',
-        as_attachment=True,
-        download_name='Cambodia_Agri_App_5000.html'
-    )
+    """Cambodia Agri App 다운로드 (Range 요청으로 이어 받기 지원)"""
+    return page_cache.response('cambodia_agri_app', download_name='Cambodia_Agri_App_5000.html')
 @app.route('/api/daily_words')
+@conditional_get(enhanced_manager.get_data_generation)
 def api_daily_words():
     """일일 학습 단어 API"""
     try:
@@ -99,33 +130,172 @@ def api_daily_words():
 
 @app.route('/api/daily-words/<int:day>')
 def api_daily_words_improved(day):
-    """개선된 일일 학습 단어 API"""
+    """개선된 일일 학습 단어 API (그날이 든 묶음의 ETag로 확인, 바뀌지 않았으면 304)"""
     try:
+        pack = daily_packs.pack_for_day(day)
+        etag = f"{pack['etag']}-{day}" if pack else None
+        if etag:
+            cached = not_modified(etag)
+            if cached:
+                return cached
+        
         # 일일 단어 가져오기 (10개)
         words = enhanced_manager.get_daily_words(day, 10)
         
         # 개선된 앱에 맞는 형식으로 변환
-        formatted_words = []
-        for word in words:
-            formatted_word = {
-                'id': word.get('id'),
-                'korean': word.get('korean_term', ''),
-                'khmer': word.get('khmer_term', ''),
-                'pronunciation': word.get('khmer_pronunciation', ''),
-                'category': word.get('category', ''),
-                'definition_ko': word.get('korean_definition', ''),
-                'definition_km': word.get('khmer_definition', ''),
-                'example_ko': word.get('korean_example', ''),
-                'example_km': word.get('khmer_example', ''),
-                'example_pronunciation': word.get('khmer_example_pronunciation', ''),
-                'frequency': word.get('frequency_level', 3),
-                'difficulty': word.get('difficulty_level', '중급'),
-                'tags': word.get('tags', [])
-            }
-            formatted_words.append(formatted_word)
+        formatted_words = [format_word(word) for word in words]
+        
+        response = jsonify(formatted_words)
+        return set_cache_headers(response, etag) if etag else response
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/daily-packs/manifest.json')
+def api_daily_pack_manifest():
+    """일일 단어 묶음 목록 (매번 ETag로 확인, 묶음이 바뀌지 않았으면 304)"""
+    try:
+        manifest = daily_packs.refresh()
+        cached = not_modified(manifest['etag'])
+        if cached:
+            return cached
+        return set_cache_headers(jsonify(manifest), manifest['etag'])
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/daily-packs/<name>')
+def api_daily_pack(name):
+    """일일 단어 묶음 (내용 해시 이름이므로 만료 없이 캐시, gzip을 받지 않는 클라이언트에는 풀어서)"""
+    try:
+        pack = daily_packs.pack(name)
+        if pack is None:
+            return jsonify({
+                'success': False,
+                'error': f'묶음을 찾을 수 없습니다: {name}'
+            }), 404
+        
+        etag, compressed = pack
+        cached = not_modified(etag, PACK_CACHE_CONTROL)
+        if cached:
+            return cached
+        
+        if accepts_encoding('gzip'):
+            response = Response(compressed, mimetype='application/json')
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = Response(gzip.decompress(compressed), mimetype='application/json')
+        response.headers['Vary'] = 'Accept-Encoding'
+        return set_cache_headers(response, etag, PACK_CACHE_CONTROL)
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/review/next')
+def api_review_next():
+    """다음 복습 카드 API (복습 시각이 지난 카드 먼저, 모자라면 학습 순서의 새 카드)"""
+    try:
+        learner = request.args.get('learner', '')
+        limit = clamp_page_size(request.args.get('limit', 10))
+        new_limit = request.args.get('new_limit')
+        new_limit = max(0, int(new_limit)) if new_limit not in (None, '') else None
+        
+        cards = []
+        for card in review_scheduler.next_cards(learner, limit, new_limit):
+            word = enhanced_manager.get_term_by_id(card['term_id'])
+            if word:
+                cards.append({**card, 'word': format_word(word)})
+        
+        return jsonify({
+            'success': True,
+            'learner': learner,
+            'cards': cards,
+            'count': len(cards)
+        })
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/review/answer', methods=['POST'])
+def api_review_answer():
+    """복습 응답 API (grade: 0~5 또는 again/hard/good/easy, SM-2로 다음 복습 시각 계산)"""
+    try:
+        payload = request.get_json(silent=True) or {}
+        term_id = int(payload.get('term_id') or 0)
+        if not enhanced_manager.get_term_by_id(term_id):
+            raise ValueError(f"용어를 찾을 수 없습니다: {payload.get('term_id')}")
+        
+        card = review_scheduler.answer(payload.get('learner', ''), term_id, payload.get('grade', ''),
+                                       event_id=payload.get('event_id'))
+        
+        return jsonify({
+            'success': True,
+            'card': card
+        })
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/sync', methods=['POST'])
+def api_sync():
+    """오프라인 학습 기록 동기화 API
+
+    본문: {"learner": ..., "events": [{"event_id", "term_id", "grade", "at"}, ...], "since": 이전 cursor}
+    또는 응답 목록만 (학습자는 첫 응답의 learner). 이미 반영한 event_id는 건너뛰므로 재전송해도 안전합니다.
+    """
+    try:
+        payload = request.get_json(silent=True)
+        if isinstance(payload, list):
+            payload = {'events': payload}
+        if not isinstance(payload, dict):
+            raise ValueError("JSON 본문이 필요합니다")
         
-        return jsonify(formatted_words)
+        events = payload.get('events') or []
+        learner = payload.get('learner')
+        if not learner and isinstance(events, list) and events and isinstance(events[0], dict):
+            learner = events[0].get('learner')
+        
+        result = review_scheduler.sync(
+            learner or '', events, payload.get('since') or 0,
+            is_known_term=lambda term_id: enhanced_manager.get_term_by_id(term_id) is not None
+        )
+        
+        return jsonify({
+            'success': True,
+            'learner': learner,
+            **result
+        })
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -133,22 +303,33 @@ def api_daily_words_improved(day):
         }), 500
 
 @app.route('/api/words_by_category')
+@conditional_get(enhanced_manager.get_data_generation)
 def api_words_by_category():
-    """카테고리별 단어 API"""
+    """카테고리별 단어 API (cursor/page_size 커서 페이지, 예전 limit은 page_size와 같음)"""
     try:
         category = request.args.get('category', '')
-        limit = request.args.get('limit')
-        limit = int(limit) if limit else None
+        cursor = request.args.get('cursor', '')
+        # 1 ~ MAX_PAGE_SIZE로 제한 (limit만 주면 학습 순서 앞의 limit개)
+        page_size = clamp_page_size(request.args.get('page_size') or request.args.get('limit'))
         
-        words = enhanced_manager.get_words_by_category(category, limit)
+        page = enhanced_manager.search_enhanced_page(category=category, cursor=cursor, page_size=page_size)
+        words = page['terms']
         
         return jsonify({
             'success': True,
             'category': category,
             'words': words,
-            'total_count': len(words)
+            'count': len(words),
+            'total_count': page['total_count'],
+            'next_cursor': page['next_cursor']
         })
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+        
     except Exception as e:
         return jsonify({
             'success': False,
@@ -156,39 +337,96 @@ def api_words_by_category():
         }), 500
 
 @app.route('/api/search_enhanced')
+@conditional_get(enhanced_manager.get_data_generation)
 def api_search_enhanced():
-    """확장된 검색 API"""
+    """확장된 검색 API (cursor/page_size 커서 페이지, 예전 limit은 page_size와 같음)"""
     try:
         keyword = request.args.get('keyword', '')
         category = request.args.get('category', '')
         difficulty = request.args.get('difficulty', '')
         frequency = int(request.args.get('frequency', 0))
         verified_only = request.args.get('verified_only') == 'true'
-        limit = request.args.get('limit')
-        limit = int(limit) if limit else None
+        cursor = request.args.get('cursor', '')
+        # 1 ~ MAX_PAGE_SIZE로 제한 (limit만 주면 상위 limit개)
+        page_size = clamp_page_size(request.args.get('page_size') or request.args.get('limit'))
+        mode = request.args.get('mode', '')
+        fuzzy = request.args.get('fuzzy') in ('1', 'true')
+        sort = request.args.get('sort', '')
+        with_facets = request.args.get('facets') in ('1', 'true')
         
-        results = enhanced_manager.search_enhanced_terms(
+        filters = dict(
             keyword=keyword,
             category=category,
             difficulty_level=difficulty,
             frequency_level=frequency,
             verified_only=verified_only,
-            limit=limit
+            mode=mode,
+            fuzzy=fuzzy,
+            sort=sort
         )
         
-        return jsonify({
+        page = enhanced_manager.search_enhanced_page(cursor=cursor, page_size=page_size,
+                                                     facets=with_facets, **filters)
+        results = page['terms']
+        
+        response = {
             'success': True,
             'results': results,
             'count': len(results),
+            'total_count': page['total_count'],
+            'next_cursor': page['next_cursor'],
             'search_params': {
                 'keyword': keyword,
                 'category': category,
                 'difficulty': difficulty,
                 'frequency': frequency,
-                'verified_only': verified_only
+                'verified_only': verified_only,
+                'mode': mode,
+                'fuzzy': fuzzy,
+                'sort': sort
             }
+        }
+        if with_facets:
+            # 현재 검색 결과 전체의 패싯별 용어 수
+            response['facets'] = _facet_payload(page['facets'])
+        
+        return jsonify(response)
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/suggest')
+@conditional_get(enhanced_manager.get_data_generation)
+def api_suggest():
+    """자동완성 API (용어 접두어 일치, 빈도 높은 순)"""
+    try:
+        query = request.args.get('q', '')
+        lang = request.args.get('lang', '')
+        limit = clamp_page_size(request.args.get('limit', 10))
+        
+        suggestions = enhanced_manager.suggest_terms(query, lang, limit)
+        
+        return jsonify({
+            'success': True,
+            'query': query,
+            'lang': lang,
+            'suggestions': suggestions
         })
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -196,6 +434,7 @@ def api_search_enhanced():
         }), 500
 
 @app.route('/api/learning_statistics')
+@conditional_get(enhanced_manager.get_data_generation)
 def api_learning_statistics():
     """학습 통계 API"""
     try:
@@ -208,7 +447,52 @@ def api_learning_statistics():
             'error': str(e)
         }), 500
 
+def _facet_payload(counts):
+    """패싯 개수를 API 응답 형식으로 (쿼리 매개변수와 같은 이름)"""
+    return {
+        'category': counts['category'],
+        'difficulty': counts['difficulty_level'],
+        'frequency': counts['frequency_level'],
+        'verified': counts['verified']
+    }
+
+@app.route('/api/facets')
+@conditional_get(enhanced_manager.get_data_generation)
+def api_facets():
+    """패싯별 용어 수 API (카테고리, 난이도, 빈도, 검증 여부 사이드바용)"""
+    try:
+        counts = enhanced_manager.get_facet_counts()
+        
+        return jsonify({
+            'success': True,
+            'total_count': sum(counts['verified'].values()),
+            'facets': _facet_payload(counts)
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/cache_stats')
+def api_cache_stats():
+    """조회 결과 캐시 통계 API (적중/실패/제거 횟수, 캐시 크기 조정용)"""
+    try:
+        return jsonify({
+            'success': True,
+            'cache': enhanced_manager.get_query_cache_stats(),
+            'compression': compressor.stats()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/categories')
+@conditional_get(enhanced_manager.get_data_generation)
 def api_categories():
     """카테고리 목록 API"""
     return jsonify({
@@ -420,6 +704,26 @@ def after_request(response):
     response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE')
     return response
 
+def warm_caches():
+    """첫 요청 전에 만들어 둘 캐시 (학습 앱 페이지 사전 압축, 일일 단어 묶음) 준비하고 페이지별 크기 반환"""
+    with app.app_context():
+        page_sizes = page_cache.warm()
+    daily_packs.refresh()
+    return page_sizes
+
+def before_fork():
+    """pre-fork 서버(gunicorn) 마스터에서 워커를 만들기 전 호출
+    
+    캐시와 색인을 미리 만들어 워커가 copy-on-write로 공유하게 하고, 워커가 물려받으면 안 되는 파일/연결을 닫습니다.
+    """
+    warm_caches()
+    enhanced_manager.before_fork()
+    review_scheduler.before_fork()
+
+def after_fork():
+    """pre-fork 서버 워커가 시작될 때 호출 (워커 전용 DB 연결 열기)"""
+    enhanced_manager.after_fork()
+
 if __name__ == '__main__':
     print("🚀 캄보디아 농업용어 모바일 학습 앱을 시작합니다...")
     
@@ -427,6 +731,10 @@ if __name__ == '__main__':
     stats = enhanced_manager.get_learning_statistics()
     print(f"📊 현재 용어 수: {stats['total_terms']:,}")
     
+    # 대용량 학습 앱 페이지 사전 렌더링/압축, 일일 단어 묶음
+    page_sizes = warm_caches()
+    print(f"📄 학습 앱 페이지 {len(page_sizes)}개 사전 압축 완료 ({sum(page_sizes.values()) / 1024 / 1024:.1f}MB)")
+    
     if stats['total_terms'] < 100:
         print("📚 샘플 데이터 생성 중...")
         enhanced_manager.generate_sample_enhanced_data(200)
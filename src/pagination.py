@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+농업용어 검색 결과 커서 페이지
+Keyset (cursor) pagination over sorted term keys
+
+정렬 키는 (정렬 값..., 용어 ID) 튜플이라 용어마다 유일하고, 커서는 마지막으로 보낸 용어의 정렬 키입니다.
+다음 페이지는 커서보다 큰 키 중 앞의 page_size개이므로 사이에 용어가 추가/삭제되어도 중복이나 누락 없이 이어집니다.
+"""
+
+import base64
+import heapq
+import json
+from bisect import bisect_right
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+# 기본/최대 페이지 크기
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def clamp_page_size(page_size) -> int:
+    """요청한 페이지 크기를 1 ~ MAX_PAGE_SIZE로 제한 (없으면 기본값)"""
+    if page_size in (None, ""):
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(page_size), MAX_PAGE_SIZE))
+
+
+def encode_cursor(sort: str, key: Sequence) -> str:
+    """정렬 이름과 정렬 키를 URL에 쓸 수 있는 커서 문자열로"""
+    payload = json.dumps([sort] + list(key), separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], sort: str) -> Optional[Tuple]:
+    """커서 문자열을 정렬 키로 (커서가 없으면 None)
+
+    다른 정렬의 커서이거나 형식이 잘못되면 ValueError
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor}") from e
+
+    if (not isinstance(payload, list) or len(payload) < 2 or payload[0] != sort
+            or not all(isinstance(value, (int, float)) for value in payload[1:])):
+        raise ValueError(f"이 정렬({sort or '기본'})의 커서가 아닙니다: {cursor}")
+    return tuple(payload[1:])
+
+
+def paginate(keys: Iterable[Tuple], after: Optional[Tuple], page_size: int) -> Tuple[List[Tuple], bool]:
+    """정렬 키 중 after보다 큰 앞의 page_size개와 다음 페이지가 있는지 여부
+
+    키 전체를 정렬하지 않고 page_size + 1개만 힙으로 고릅니다.
+    """
+    if after is not None:
+        keys = (key for key in keys if key > after)
+    page = heapq.nsmallest(page_size + 1, keys)
+    return page[:page_size], len(page) > page_size
+
+
+def paginate_sorted(ids: List[int], after: Optional[Tuple], page_size: int) -> Tuple[List[int], bool]:
+    """이미 오름차순인 ID 목록에서 after 다음 page_size개 (이진 탐색)"""
+    start = bisect_right(ids, after[0]) if after is not None else 0
+    return ids[start:start + page_size], start + page_size < len(ids)
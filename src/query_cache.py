@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+농업용어 조회 결과 캐시
+Bounded LRU cache of query results stamped with a data generation counter
+
+자주 반복되는 조회(카테고리 목록, 1일차 단어, 자주 쓰는 키워드) 결과를 정규화한 인자로 보관합니다.
+항목마다 계산을 시작할 때의 데이터 세대(generation)를 기록하고, 용어가 바뀔 때마다 세대를 올리므로
+이전 세대 항목은 따로 무효화하지 않아도 다시 제공되지 않습니다.
+"""
+
+import functools
+import inspect
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+# 기본 최대 항목 수 (QUERY_CACHE_SIZE 환경 변수로 조정, 0이면 캐시 사용 안 함)
+DEFAULT_CACHE_SIZE = 512
+
+
+def default_cache_size() -> int:
+    """환경 변수에 지정한 캐시 크기 (없거나 잘못되면 기본값)"""
+    try:
+        return max(0, int(os.environ.get("QUERY_CACHE_SIZE", DEFAULT_CACHE_SIZE)))
+    except ValueError:
+        return DEFAULT_CACHE_SIZE
+
+
+class QueryCache:
+    """세대 번호를 붙인 LRU 조회 결과 캐시 (스레드 안전)"""
+
+    def __init__(self, maxsize: int = None):
+        self.maxsize = default_cache_size() if maxsize is None else maxsize
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale = 0
+        self._entries: "OrderedDict[Hashable, Tuple[int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def bump_generation(self) -> None:
+        """데이터가 바뀌었음을 기록 (이전 세대 항목은 더 이상 제공하지 않음)"""
+        with self._lock:
+            self.generation += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """key의 결과를 반환 (없거나 이전 세대이면 계산해서 보관)"""
+        if self.maxsize <= 0:
+            return compute()
+
+        with self._lock:
+            generation = self.generation
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == generation:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.stale += 1
+            self.misses += 1
+
+        # 계산은 잠금 밖에서 (계산 중 데이터가 바뀌면 이 항목은 이전 세대가 되어 제공되지 않음)
+        result = compute()
+
+        with self._lock:
+            self._entries[key] = (generation, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def clear(self) -> None:
+        """모든 항목과 통계 초기화"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.stale = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/실패/제거 횟수와 현재 크기"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "generation": self.generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "stale": self.stale,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+def cached_query(method: Callable) -> Callable:
+    """관리자 조회 메서드 결과를 self._query_cache에 보관하는 데코레이터
+
+    키는 (메서드 이름, 기본값을 채운 인자)이므로 위치 인자와 키워드 인자 호출이 같은 항목을 씁니다.
+    결과 목록(dict)은 얕게 복사해서 반환하므로 호출한 쪽이 목록을 바꿔도 캐시에는 영향이 없습니다.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = getattr(self, "_query_cache", None)
+        if cache is None:
+            return method(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__,) + tuple(
+            value for name, value in bound.arguments.items() if name != "self"
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return method(self, *args, **kwargs)
+
+        result = cache.get_or_compute(key, lambda: method(self, *args, **kwargs))
+        if isinstance(result, list):
+            return list(result)
+        if isinstance(result, dict):
+            return dict(result)
+        return result
+
+    return wrapper
@@ -0,0 +1,593 @@
+#!/usr/bin/env python3
+"""
+농업용어 간격 반복 복습 스케줄러
+SM-2 spaced-repetition scheduler with per-learner due heaps
+
+학습자마다 카드 상태(용어 ID, 다음 복습 시각, 간격, 난이도 계수, 반복/실패 횟수)를
+array 열(column)로 보관하고, 다음 복습 시각의 최소 힙으로 복습할 카드를 꺼냅니다.
+힙 항목은 (복습 시각 << SLOT_BITS | 카드 위치) 정수 하나이며, 답할 때마다 새 항목을 넣고
+이전 항목은 꺼낼 때 시각이 다르면 버립니다 (지연 삭제).
+
+응답은 저널(data/review_state.journal)에 먼저 기록하고, 임계값을 넘으면 스냅샷(review_state.json)으로 압축합니다.
+오프라인 중 쌓인 응답은 sync()로 한 번에 받아 event_id로 중복을 거르고 fsync 한 번으로 기록합니다.
+"""
+
+import heapq
+import json
+import os
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from datetime import datetime
+from operator import itemgetter
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Union
+
+from term_journal import TermJournal, atomic_write_text, process_lock
+
+# SM-2 기본/최소 난이도 계수
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+
+# 틀린 카드는 같은 학습 시간 안에 다시 나오도록 10분 뒤로
+RELEARN_SECONDS = 10 * 60
+DAY_SECONDS = 24 * 60 * 60
+MAX_INTERVAL_DAYS = 36500
+
+# 응답 등급 (SM-2는 0~5, 3 이상이 정답)
+GRADE_NAMES = {"again": 1, "hard": 3, "good": 4, "easy": 5}
+
+# 힙 항목의 카드 위치 비트 수 (학습자당 최대 약 1,600만 장)
+SLOT_BITS = 24
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+MAX_LEARNER_ID_LENGTH = 64
+MAX_EVENT_ID_LENGTH = 64
+
+# 동기화 한 번에 받는 최대 응답 수와, 중복 확인을 위해 학습자별로 기억하는 최근 event_id 수
+MAX_SYNC_EVENTS = 1000
+MAX_REMEMBERED_EVENTS = 5000
+
+# 변경분(delta)의 카드 열 이름
+CHANGE_COLUMNS = ("term_id", "due", "interval_days", "ease", "repetitions", "lapses")
+
+
+def parse_grade(grade: Union[int, str]) -> int:
+    """응답 등급 (0~5 정수 또는 again/hard/good/easy, 잘못되면 ValueError)"""
+    if isinstance(grade, str) and grade.lower() in GRADE_NAMES:
+        return GRADE_NAMES[grade.lower()]
+    try:
+        value = int(grade)
+    except (TypeError, ValueError):
+        value = -1
+    if not 0 <= value <= 5:
+        raise ValueError(f"응답 등급은 0~5 또는 {', '.join(GRADE_NAMES)} 중 하나여야 합니다: {grade}")
+    return value
+
+
+def validate_learner_id(learner_id: Any) -> str:
+    """학습자 ID 확인 (비어 있거나 너무 길면 ValueError)"""
+    if not isinstance(learner_id, str) or not learner_id.strip():
+        raise ValueError("학습자 ID(learner)가 필요합니다")
+    if len(learner_id) > MAX_LEARNER_ID_LENGTH:
+        raise ValueError(f"학습자 ID는 {MAX_LEARNER_ID_LENGTH}자 이하여야 합니다")
+    return learner_id
+
+
+def parse_event_time(value: Any, now: int) -> int:
+    """응답 시각 (epoch 초/밀리초 또는 ISO 8601 문자열, 없으면 now, 미래 시각은 now로 제한)"""
+    if value in (None, ""):
+        return now
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            try:
+                value = datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                raise ValueError(f"잘못된 응답 시각입니다: {value}")
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ValueError(f"잘못된 응답 시각입니다: {value}")
+    # JavaScript Date.now()는 밀리초
+    seconds = value / 1000 if value > 1e11 else value
+    return min(int(seconds), now)
+
+
+def sm2_review(repetitions: int, interval: int, ease: float, grade: int) -> tuple:
+    """SM-2 한 번 적용 → (반복 횟수, 간격 일수, 난이도 계수)"""
+    if grade >= 3:
+        if repetitions == 0:
+            interval = 1
+        elif repetitions == 1:
+            interval = 6
+        else:
+            interval = min(MAX_INTERVAL_DAYS, max(1, round(interval * ease)))
+        repetitions += 1
+    else:
+        repetitions = 0
+        interval = 1
+
+    ease = max(MIN_EASE, ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+    return repetitions, interval, ease
+
+
+class LearnerDeck:
+    """학습자 한 명의 카드 상태 (카드 위치별 array 열 + 복습 시각 최소 힙)"""
+
+    __slots__ = ("term_ids", "due", "interval", "ease", "repetitions", "lapses", "updated",
+                 "slots", "heap", "new_position", "events")
+
+    def __init__(self):
+        self.term_ids = array('I')
+        self.due = array('q')
+        self.interval = array('I')
+        self.ease = array('f')
+        self.repetitions = array('H')
+        self.lapses = array('H')
+        # 카드를 마지막으로 바꾼 저널 순번 (동기화 변경분 계산용)
+        self.updated = array('q')
+        # 용어 ID → 카드 위치 (-1이면 카드 없음, dict 대신 ID로 바로 찾는 array)
+        self.slots = array('i')
+        self.heap: List[int] = []
+        # 학습 순서에서 이 위치 앞의 용어는 모두 이미 카드가 있음 (새 카드 탐색 시작점)
+        self.new_position = 0
+        # 최근 반영한 event_id → 반영한 용어 ID (삽입 순서, 오래된 것부터 버림, 이전 스냅샷에서 읽은 것은 None)
+        self.events: Dict[str, Optional[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.term_ids)
+
+    def slot_of(self, term_id: int) -> int:
+        """용어의 카드 위치 (없으면 -1)"""
+        return self.slots[term_id] if 0 <= term_id < len(self.slots) else -1
+
+    def _index_slot(self, term_id: int, slot: int) -> None:
+        if term_id >= len(self.slots):
+            self.slots.extend(array('i', [-1]) * (term_id + 1 - len(self.slots)))
+        self.slots[term_id] = slot
+
+    def _push(self, slot: int) -> None:
+        heapq.heappush(self.heap, (self.due[slot] << SLOT_BITS) | slot)
+        # 지연 삭제로 쌓인 이전 항목이 많아지면 힙을 다시 구성
+        if len(self.heap) > 2 * len(self.term_ids) + 64:
+            self.rebuild_heap()
+
+    def rebuild_heap(self) -> None:
+        """현재 복습 시각으로 힙 재구성"""
+        self.heap = [(due << SLOT_BITS) | slot for slot, due in enumerate(self.due)]
+        heapq.heapify(self.heap)
+
+    def knows_event(self, event_id: str) -> bool:
+        """이미 반영한 event_id인지"""
+        return event_id in self.events
+
+    def remember_event(self, event_id: str, term_id: int) -> None:
+        """반영한 event_id와 용어 기록 (최근 MAX_REMEMBERED_EVENTS개만)"""
+        self.events[event_id] = term_id
+        if len(self.events) > MAX_REMEMBERED_EVENTS:
+            del self.events[next(iter(self.events))]
+
+    def event_card(self, event_id: str, term_id: int) -> Dict[str, Any]:
+        """이미 반영한 event_id의 카드 상태 (그 응답을 반영한 용어 기준, 카드가 없으면 새 카드)"""
+        original = self.events.get(event_id)
+        if original is not None:
+            term_id = original
+        slot = self.slot_of(term_id)
+        if slot < 0:
+            return {"term_id": term_id, "new": True}
+        return self.card(slot)
+
+    def answer(self, term_id: int, grade: int, now: int, seq: int = 0) -> int:
+        """응답 반영 (카드가 없으면 새로 만듦) 후 카드 위치 반환"""
+        slot = self.slot_of(term_id)
+        if slot < 0:
+            slot = len(self.term_ids)
+            self._index_slot(term_id, slot)
+            self.term_ids.append(term_id)
+            self.due.append(now)
+            self.interval.append(0)
+            self.ease.append(DEFAULT_EASE)
+            self.repetitions.append(0)
+            self.lapses.append(0)
+            self.updated.append(0)
+
+        if grade < 3 and self.repetitions[slot] > 0:
+            self.lapses[slot] = min(self.lapses[slot] + 1, 0xFFFF)
+        repetitions, interval, ease = sm2_review(
+            self.repetitions[slot], self.interval[slot], self.ease[slot], grade)
+        self.repetitions[slot] = min(repetitions, 0xFFFF)
+        self.interval[slot] = interval
+        self.ease[slot] = ease
+        self.due[slot] = now + (interval * DAY_SECONDS if grade >= 3 else RELEARN_SECONDS)
+        self.updated[slot] = seq
+        self._push(slot)
+        return slot
+
+    def due_slots(self, now: int, limit: int) -> List[int]:
+        """복습 시각이 now 이하인 카드 위치 (이른 순 limit개, 힙에서 꺼낸 뒤 다시 넣음)"""
+        heap = self.heap
+        taken: List[int] = []
+        slots: List[int] = []
+        while heap and len(slots) < limit:
+            key = heap[0]
+            due = key >> SLOT_BITS
+            if due > now:
+                break
+            heapq.heappop(heap)
+            slot = key & SLOT_MASK
+            if self.due[slot] != due or slot in slots:
+                # 이전 응답의 항목 (지연 삭제)
+                continue
+            taken.append(key)
+            slots.append(slot)
+        for key in taken:
+            heapq.heappush(heap, key)
+        return slots
+
+    def card(self, slot: int) -> Dict[str, Any]:
+        """카드 상태 dict"""
+        return {
+            "term_id": self.term_ids[slot],
+            "new": False,
+            "due": datetime.fromtimestamp(self.due[slot]).isoformat(),
+            "interval_days": self.interval[slot],
+            "ease": round(self.ease[slot], 3),
+            "repetitions": self.repetitions[slot],
+            "lapses": self.lapses[slot]
+        }
+
+    def changes_since(self, seq: int) -> Dict[str, List]:
+        """저널 순번 seq 이후 바뀐 카드 (열 목록 형식, due는 epoch 초)"""
+        slots = [slot for slot, updated in enumerate(self.updated) if updated > seq]
+        return {
+            "term_id": [self.term_ids[slot] for slot in slots],
+            "due": [self.due[slot] for slot in slots],
+            "interval_days": [self.interval[slot] for slot in slots],
+            "ease": [round(self.ease[slot], 3) for slot in slots],
+            "repetitions": [self.repetitions[slot] for slot in slots],
+            "lapses": [self.lapses[slot] for slot in slots]
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """스냅샷용 dict"""
+        return {
+            "term_ids": self.term_ids.tolist(),
+            "due": self.due.tolist(),
+            "interval": self.interval.tolist(),
+            "ease": self.ease.tolist(),
+            "repetitions": self.repetitions.tolist(),
+            "lapses": self.lapses.tolist(),
+            "updated": self.updated.tolist(),
+            "new_position": self.new_position,
+            "events": dict(self.events)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LearnerDeck":
+        """스냅샷에서 복원 (힙은 한 번에 구성)"""
+        deck = cls()
+        deck.term_ids = array('I', data["term_ids"])
+        deck.due = array('q', data["due"])
+        deck.interval = array('I', data["interval"])
+        deck.ease = array('f', data["ease"])
+        deck.repetitions = array('H', data["repetitions"])
+        deck.lapses = array('H', data["lapses"])
+        deck.updated = array('q', data.get("updated") or [0] * len(deck.term_ids))
+        for slot, term_id in enumerate(deck.term_ids):
+            deck._index_slot(term_id, slot)
+        deck.new_position = data.get("new_position", 0)
+        events = data.get("events", {})
+        # 이전 형식 스냅샷은 event_id 목록 (반영한 용어는 모름)
+        deck.events = dict(events) if isinstance(events, dict) else dict.fromkeys(events)
+        deck.rebuild_heap()
+        return deck
+
+
+class ReviewScheduler:
+    """학습자별 SM-2 복습 일정 (응답은 저널에 기록하고 스냅샷으로 압축)
+
+    new_cards(start, count): 학습 순서 start번째부터 count개 용어 ID (복습할 카드가 모자랄 때 새 카드로 사용)
+    """
+
+    def __init__(self, state_path: str, new_cards: Callable[[int, int], List[int]],
+                 compact_threshold_bytes: int = 4 * 1024 * 1024, clock: Callable[[], float] = time.time):
+        self.state_path = state_path
+        self._new_cards = new_cards
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._compaction_lock = threading.Lock()
+        self._compaction_thread = None
+        self.journal = TermJournal(os.path.splitext(state_path)[0] + '.journal', compact_threshold_bytes)
+        self.decks: Dict[str, LearnerDeck] = {}
+
+        # pre-fork 워커처럼 여러 프로세스가 같은 상태 파일을 쓰면 파일 잠금 안에서
+        # 마지막으로 읽은 저널 위치 이후 다른 프로세스가 기록한 응답을 먼저 반영
+        # 압축 세대는 잠금 파일에 기록 (압축할 때마다 올라가며, 다르면 저널 위치가 무의미하므로 다시 읽음)
+        self._process_lock_path = os.path.splitext(state_path)[0] + '.lock'
+        self._epoch = ""
+        self._journal_offset = 0
+
+        with self._lock, process_lock(self._process_lock_path) as lock_file:
+            self._load_snapshot()
+            replayed = self._replay_journal()
+            self._mark_journal_read(lock_file)
+        if replayed:
+            self.compact()
+
+    @contextmanager
+    def _shared_state(self) -> Iterator[Optional[IO[str]]]:
+        """다른 프로세스와 상태를 맞춘 뒤 잠금 안에서 작업 (잠금 파일을 넘겨줌)"""
+        with self._lock, process_lock(self._process_lock_path) as lock_file:
+            self._catch_up(lock_file)
+            yield lock_file
+
+    @staticmethod
+    def _read_epoch(lock_file: Optional[IO[str]]) -> str:
+        if lock_file is None:
+            return ""
+        lock_file.seek(0)
+        return lock_file.read().strip()
+
+    def _mark_journal_read(self, lock_file: Optional[IO[str]]) -> None:
+        """현재 저널 끝까지 반영했음을 기록"""
+        self._epoch = self._read_epoch(lock_file)
+        self._journal_offset = self.journal.disk_size()
+
+    def _catch_up(self, lock_file: Optional[IO[str]]) -> None:
+        """다른 프로세스가 기록한 응답 반영 (그 사이 압축되었으면 스냅샷부터 다시 읽음)"""
+        if self._read_epoch(lock_file) == self._epoch:
+            if self.journal.disk_size() > self._journal_offset:
+                entries, self._journal_offset = self.journal.read_from(self._journal_offset)
+                for entry in entries:
+                    self._apply(entry)
+            return
+
+        # 열어 둔 파일은 회전된 이전 로그이므로 다음 기록 때 다시 열도록 닫음
+        self.journal.close()
+        self._load_snapshot()
+        self._replay_journal()
+        self._mark_journal_read(lock_file)
+
+    def _load_snapshot(self) -> None:
+        """스냅샷 파일 로드 (없으면 빈 상태)"""
+        self._snapshot_seq = 0
+        self.decks = {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return
+        self._snapshot_seq = snapshot.get("metadata", {}).get("journal_seq", 0)
+        self.decks = {learner_id: LearnerDeck.from_dict(data)
+                      for learner_id, data in snapshot.get("learners", {}).items()}
+
+    def _replay_journal(self) -> int:
+        """스냅샷 이후의 응답을 재적용하고 재적용한 수 반환"""
+        replayed = 0
+        for entry in self.journal.entries():
+            if entry.get("seq", 0) <= self._snapshot_seq:
+                continue
+            self._apply(entry)
+            replayed += 1
+        self.journal.last_seq = max(self.journal.last_seq, self._snapshot_seq)
+        return replayed
+
+    def _apply(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """저널 항목 하나를 메모리 상태에 반영"""
+        if entry["op"] != "answer":
+            return {}
+        deck = self.decks.get(entry["learner"])
+        if deck is None:
+            deck = self.decks[entry["learner"]] = LearnerDeck()
+        if entry.get("event_id"):
+            deck.remember_event(entry["event_id"], entry["term_id"])
+        slot = deck.answer(entry["term_id"], entry["grade"], entry["at"], entry.get("seq", 0))
+        return deck.card(slot)
+
+    def _now(self, now: Optional[float]) -> int:
+        return int(self._clock() if now is None else now)
+
+    def _event_entry(self, learner_id: str, event: Any, now: int) -> Dict[str, Any]:
+        """클라이언트 응답 하나를 저널 항목으로 (잘못되면 ValueError)
+
+        event_id가 없으면 (용어, 응답 시각, 등급)으로 만들어 같은 응답을 다시 보내도 한 번만 반영합니다.
+        """
+        if not isinstance(event, dict):
+            raise ValueError("응답은 JSON 객체여야 합니다")
+        if event.get("learner") not in (None, "", learner_id):
+            raise ValueError(f"다른 학습자의 응답입니다: {event.get('learner')}")
+        try:
+            term_id = int(event.get("term_id"))
+        except (TypeError, ValueError):
+            raise ValueError(f"잘못된 용어 ID입니다: {event.get('term_id')}")
+        if term_id < 0:
+            raise ValueError(f"잘못된 용어 ID입니다: {term_id}")
+
+        grade = parse_grade(event.get("grade"))
+        at = parse_event_time(event.get("at"), now)
+        event_id = str(event.get("event_id") or f"{term_id}:{at}:{grade}")
+        if len(event_id) > MAX_EVENT_ID_LENGTH:
+            raise ValueError(f"event_id는 {MAX_EVENT_ID_LENGTH}자 이하여야 합니다")
+        return {"op": "answer", "learner": learner_id, "term_id": term_id, "grade": grade,
+                "at": at, "event_id": event_id}
+
+    def answer(self, learner_id: str, term_id: int, grade: Union[int, str],
+               now: Optional[float] = None, event_id: Optional[str] = None) -> Dict[str, Any]:
+        """응답 기록 후 갱신된 카드 상태 반환 (이미 반영한 event_id이면 기록하지 않고 현재 상태)"""
+        learner_id = validate_learner_id(learner_id)
+        if int(term_id) < 0:
+            raise ValueError(f"잘못된 용어 ID입니다: {term_id}")
+        entry = {"op": "answer", "learner": learner_id, "term_id": int(term_id),
+                 "grade": parse_grade(grade), "at": self._now(now)}
+        if event_id:
+            entry = self._event_entry(learner_id, {**entry, "event_id": event_id}, entry["at"])
+
+        with self._shared_state() as lock_file:
+            deck = self.decks.get(learner_id)
+            if event_id and deck is not None and deck.knows_event(entry["event_id"]):
+                return deck.event_card(entry["event_id"], entry["term_id"])
+            seq = self.journal.append(entry["op"], **{k: v for k, v in entry.items() if k != "op"})
+            self._mark_journal_read(lock_file)
+            card = self._apply({"seq": seq, **entry})
+
+        if self.journal.needs_compaction():
+            self._start_background_compaction()
+        return card
+
+    def sync(self, learner_id: str, events: List[Any], since: int = 0,
+             is_known_term: Optional[Callable[[int], bool]] = None,
+             now: Optional[float] = None) -> Dict[str, Any]:
+        """오프라인 중 쌓인 응답을 한 번에 반영하고 저널 순번 since 이후 바뀐 카드를 반환
+
+        잘못된 응답은 rejected로 돌려주고 나머지는 반영합니다.
+        새 응답은 응답 시각 순으로 저널에 한 번에 기록(fsync 한 번)하며,
+        이미 반영한 event_id는 건너뛰므로 연결이 끊겨 같은 묶음을 다시 보내도 안전합니다.
+        반환한 cursor를 다음 동기화의 since로 보내면 그 사이 바뀐 카드만 받습니다.
+        """
+        learner_id = validate_learner_id(learner_id)
+        if not isinstance(events, list):
+            raise ValueError("events는 목록이어야 합니다")
+        if len(events) > MAX_SYNC_EVENTS:
+            raise ValueError(f"한 번에 최대 {MAX_SYNC_EVENTS}개 응답까지 동기화할 수 있습니다")
+        since = int(since or 0)
+        now = self._now(now)
+
+        entries = []
+        rejected = []
+        for index, event in enumerate(events):
+            try:
+                entry = self._event_entry(learner_id, event, now)
+                if is_known_term is not None and not is_known_term(entry["term_id"]):
+                    raise ValueError(f"용어를 찾을 수 없습니다: {entry['term_id']}")
+                entries.append(entry)
+            except ValueError as e:
+                event_id = event.get("event_id") if isinstance(event, dict) else None
+                rejected.append({"index": index, "event_id": event_id, "error": str(e)})
+        entries.sort(key=itemgetter("at"))
+
+        with self._shared_state() as lock_file:
+            deck = self.decks.get(learner_id)
+            fresh = []
+            batch_ids = set()
+            for entry in entries:
+                event_id = entry["event_id"]
+                if event_id in batch_ids or (deck is not None and deck.knows_event(event_id)):
+                    continue
+                batch_ids.add(event_id)
+                fresh.append(entry)
+
+            seqs = self.journal.append_many(fresh)
+            self._mark_journal_read(lock_file)
+            for seq, entry in zip(seqs, fresh):
+                self._apply({"seq": seq, **entry})
+
+            deck = self.decks.get(learner_id)
+            changes = deck.changes_since(since) if deck is not None else {column: [] for column in CHANGE_COLUMNS}
+            cursor = self.journal.last_seq
+
+        if self.journal.needs_compaction():
+            self._start_background_compaction()
+        return {
+            "accepted": len(fresh),
+            "duplicates": len(entries) - len(fresh),
+            "rejected": rejected,
+            "cursor": cursor,
+            "changes": changes
+        }
+
+    def next_cards(self, learner_id: str, limit: int = 10, new_limit: Optional[int] = None,
+                   now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """복습할 카드 (복습 시각이 지난 카드 먼저, 모자라면 학습 순서의 새 카드로 채움)"""
+        learner_id = validate_learner_id(learner_id)
+        now = self._now(now)
+        new_limit = limit if new_limit is None else new_limit
+
+        with self._shared_state():
+            deck = self.decks.get(learner_id) or LearnerDeck()
+            cards = [deck.card(slot) for slot in deck.due_slots(now, limit)]
+            new_count = min(limit - len(cards), new_limit)
+            if new_count > 0:
+                cards.extend({"term_id": term_id, "new": True} for term_id in self._new_term_ids(deck, new_count))
+        return cards
+
+    def _new_term_ids(self, deck: LearnerDeck, count: int) -> List[int]:
+        """아직 카드가 없는 용어를 학습 순서대로 count개"""
+        term_ids: List[int] = []
+        position = deck.new_position
+        leading = True
+        window = max(count * 2, 20)
+        while len(term_ids) < count:
+            candidates = self._new_cards(position, window)
+            if not candidates:
+                break
+            for term_id in candidates:
+                if deck.slot_of(term_id) >= 0:
+                    if leading:
+                        deck.new_position = position + 1
+                else:
+                    leading = False
+                    if len(term_ids) < count:
+                        term_ids.append(term_id)
+                position += 1
+        return term_ids
+
+    def learner_stats(self, learner_id: str, now: Optional[float] = None) -> Dict[str, Any]:
+        """학습자 카드 수와 지금 복습할 카드 수"""
+        learner_id = validate_learner_id(learner_id)
+        now = self._now(now)
+        with self._shared_state():
+            deck = self.decks.get(learner_id)
+            if deck is None:
+                return {"cards": 0, "due": 0, "lapses": 0}
+            return {
+                "cards": len(deck),
+                "due": sum(1 for due in deck.due if due <= now),
+                "lapses": sum(deck.lapses)
+            }
+
+    def before_fork(self) -> None:
+        """pre-fork 서버 마스터에서 워커를 만들기 전 호출 (진행 중인 압축을 기다리고 저널 파일을 닫음)
+
+        워커는 fork한 뒤 처음 요청에서 잠금 파일의 압축 세대와 저널을 확인해 다른 워커의 응답을 반영합니다.
+        """
+        if self._compaction_thread is not None:
+            self._compaction_thread.join()
+        with self._lock:
+            self.journal.close()
+
+    def _start_background_compaction(self) -> None:
+        """백그라운드 압축 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+        self._compaction_thread = threading.Thread(target=self.compact, daemon=True)
+        self._compaction_thread.start()
+
+    def compact(self) -> None:
+        """저널을 스냅샷에 반영하고 반영된 저널 정리
+
+        다른 프로세스가 이전 스냅샷을 늦게 덮어쓰지 않도록 스냅샷 저장까지 파일 잠금 안에서 합니다.
+        """
+        with self._compaction_lock:
+            with self._shared_state() as lock_file:
+                snapshot = {
+                    "metadata": {
+                        "version": 1,
+                        "journal_seq": self.journal.last_seq,
+                        "learners": len(self.decks),
+                        "last_updated": datetime.now().isoformat()
+                    },
+                    "learners": {learner_id: deck.to_dict() for learner_id, deck in self.decks.items()}
+                }
+                self.journal.rotate()
+
+                # 카드 열이 길어 들여쓰기 없이 저장
+                atomic_write_text(self.state_path, json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")))
+                self.journal.discard_rotated()
+
+                # 다른 프로세스가 이전 저널 위치로 새 저널을 읽지 않도록 압축 세대를 바꿈
+                if lock_file is not None:
+                    lock_file.seek(0)
+                    lock_file.truncate()
+                    lock_file.write(f"{os.getpid()}-{self.journal.last_seq}-{time.time_ns()}")
+                    lock_file.flush()
+                self._mark_journal_read(lock_file)
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+농업용어 검색 색인
+In-memory character n-gram inverted index for substring search
+"""
+
+import heapq
+from array import array
+from bisect import insort
+from itertools import chain
+from operator import add
+from typing import Dict, List, Set, Tuple
+
+from korean_text import decompose_hangul, choseong_key, is_choseong_query, sound_key
+from khmer_text import normalize_khmer
+
+_EMPTY = array('I')
+
+# 용어 표제어 필드 (자동완성, 오타 허용 검색 대상)
+HEADWORD_FIELDS = ("korean_term", "khmer_term", "english_term", "khmer_pronunciation")
+
+# 크메르어 발음의 한글 표기 필드 (소리 검색 대상)
+PRONUNCIATION_FIELDS = ("khmer_pronunciation", "pronunciation_ko")
+
+
+class NgramIndex:
+    """문자 n-gram(1~3글자) 역색인
+
+    문서별 검색 텍스트를 그대로 보관하므로 검색 결과는 `query in text`와 동일합니다.
+    질의 길이가 max_n 이하이면 게시 목록 자체가 정답이고,
+    더 길면 가장 짧은 게시 목록들의 교집합을 후보로 삼아 원문으로 확인합니다.
+    게시 목록은 메모리를 줄이기 위해 array('I')로 보관합니다.
+    """
+
+    def __init__(self, max_n: int = 3):
+        self.max_n = max_n
+        self.postings: Dict[str, array] = {}
+        self.texts: Dict[int, str] = {}
+
+    @staticmethod
+    def _grams(text: str, n: int) -> Set[str]:
+        """텍스트의 n-gram 집합"""
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def _all_grams(self, text: str) -> Set[str]:
+        """1~max_n 글자 n-gram 전체 (중복 제거)"""
+        grams = set(text)
+        ngrams = list(text)
+        for n in range(2, self.max_n + 1):
+            # (n-1)-gram 뒤에 다음 글자를 붙여 n-gram 생성
+            ngrams = list(map(add, ngrams, text[n - 1:]))
+            grams.update(ngrams)
+        return grams
+
+    def add(self, doc_id: int, text: str) -> None:
+        """문서 추가 (이미 있으면 교체)"""
+        if doc_id in self.texts:
+            self.remove(doc_id)
+
+        self.texts[doc_id] = text
+        postings = self.postings
+        for gram in self._all_grams(text):
+            try:
+                postings[gram].append(doc_id)
+            except KeyError:
+                postings[gram] = array('I', (doc_id,))
+
+    def remove(self, doc_id: int) -> None:
+        """문서 제거"""
+        text = self.texts.pop(doc_id, None)
+        if text is None:
+            return
+
+        for gram in self._all_grams(text):
+            posting = self.postings.get(gram)
+            if posting is not None:
+                posting.remove(doc_id)
+                if not posting:
+                    del self.postings[gram]
+
+    def search(self, query: str) -> Set[int]:
+        """query를 부분 문자열로 포함하는 문서 ID 집합"""
+        if not query:
+            return set(self.texts)
+
+        n = min(len(query), self.max_n)
+        if len(query) == n:
+            return set(self.postings.get(query, _EMPTY))
+
+        posting_lists = sorted((self.postings.get(gram, _EMPTY) for gram in self._grams(query, n)), key=len)
+
+        # 가장 희소한 두 목록만 교집합하고 나머지는 원문 확인으로 대체
+        candidates = set(posting_lists[0])
+        if candidates and len(posting_lists) > 1:
+            candidates.intersection_update(posting_lists[1])
+
+        texts = self.texts
+        return {doc_id for doc_id in candidates if query in texts[doc_id]}
+
+
+class HangulIndex:
+    """한국어 용어의 자모 분해/초성 색인
+
+    "빌"처럼 입력 중인 음절은 자모열(ㅂㅣㄹ)이 "비료"(ㅂㅣㄹㅛ)의 부분열이 되므로 자모 색인에서,
+    "ㅂㄹ"처럼 자음만 입력한 질의는 초성 색인에서 찾습니다.
+    """
+
+    def __init__(self):
+        self.jamo = NgramIndex()
+        self.choseong = NgramIndex()
+
+    def add(self, doc_id: int, korean_term: str) -> None:
+        """용어 추가 (이미 있으면 교체)"""
+        self.jamo.add(doc_id, decompose_hangul(korean_term))
+        self.choseong.add(doc_id, choseong_key(korean_term))
+
+    def remove(self, doc_id: int) -> None:
+        """용어 제거"""
+        self.jamo.remove(doc_id)
+        self.choseong.remove(doc_id)
+
+    def search(self, query: str) -> Set[int]:
+        """초성 또는 자모 부분열로 일치하는 용어 ID 집합"""
+        if is_choseong_query(query):
+            return self.choseong.search(choseong_key(query))
+        return self.jamo.search(decompose_hangul(query))
+
+
+class PhoneticIndex:
+    """크메르어 발음 한글 표기의 소리 키 색인
+
+    표기를 미리 소리 키(자모 분해, 공백 제거, ㄲ/ㄱ·ㅆ/ㅅ·ㅐ/ㅔ 등 통합)로 바꿔 n-gram 색인에 넣으므로
+    질의도 소리 키로 바꾸기만 하면 일반 부분 문자열 검색과 같은 비용으로 찾습니다.
+    """
+
+    def __init__(self, fields: Tuple[str, ...] = PRONUNCIATION_FIELDS):
+        self.fields = fields
+        self.keys = NgramIndex()
+
+    def add(self, doc_id: int, term: Dict) -> None:
+        """용어 추가 (이미 있으면 교체, 필드 사이는 소리 키에 없는 "|"로 구분)"""
+        self.keys.add(doc_id, "|".join(sound_key(term.get(field) or "") for field in self.fields))
+
+    def remove(self, doc_id: int) -> None:
+        """용어 제거"""
+        self.keys.remove(doc_id)
+
+    def search(self, query: str) -> Set[int]:
+        """소리 키가 질의의 소리 키를 포함하는 용어 ID 집합"""
+        return self.keys.search(sound_key(query))
+
+
+class _TrieNode:
+    """압축 트라이 노드 (간선 레이블, 자식, 이 노드에서 끝나는 항목, 하위 트리 상위 k개)"""
+
+    __slots__ = ("label", "children", "entries", "top")
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.entries: List[tuple] = []
+        self.top: List[tuple] = []
+
+
+class PrefixTrie:
+    """상위 k개를 미리 계산해 두는 접두어 트라이 (자동완성용)
+
+    항목은 (순위 키, ID) 튜플이며 작을수록 앞에 옵니다.
+    각 노드가 하위 트리의 상위 k개를 정렬된 목록으로 보관하므로
+    질의는 접두어를 따라 내려간 뒤 그 노드의 목록을 잘라 반환하면 됩니다.
+    """
+
+    def __init__(self, top_k: int = 20):
+        self.top_k = top_k
+        self.root = _TrieNode()
+
+    def _path(self, key: str, create: bool) -> List[_TrieNode]:
+        """key까지의 노드 경로 (create이면 필요한 노드를 만들고 간선을 분할)"""
+        node = self.root
+        path = [node]
+        i = 0
+        while i < len(key):
+            child = node.children.get(key[i])
+            if child is None:
+                if not create:
+                    return []
+                child = _TrieNode(key[i:])
+                node.children[key[i]] = child
+                path.append(child)
+                return path
+
+            label = child.label
+            common = 0
+            limit = min(len(label), len(key) - i)
+            while common < limit and label[common] == key[i + common]:
+                common += 1
+
+            if common < len(label):
+                if not create:
+                    return []
+                # 간선 분할: 공통 부분을 새 중간 노드로
+                middle = _TrieNode(label[:common])
+                middle.top = list(child.top)
+                child.label = label[common:]
+                middle.children[child.label[0]] = child
+                node.children[key[i]] = middle
+                child = middle
+
+            node = child
+            path.append(node)
+            i += common
+        return path
+
+    def insert(self, key: str, item: tuple) -> None:
+        """key에 항목 추가"""
+        path = self._path(key, create=True)
+        for node in path:
+            top = node.top
+            if len(top) < self.top_k or item < top[-1]:
+                insort(top, item)
+                if len(top) > self.top_k:
+                    top.pop()
+        path[-1].entries.append(item)
+
+    def remove(self, key: str, item: tuple) -> None:
+        """key의 항목 제거 (경로의 상위 k개를 아래에서부터 다시 계산)"""
+        path = self._path(key, create=False)
+        if not path or item not in path[-1].entries:
+            return
+        path[-1].entries.remove(item)
+
+        for depth in range(len(path) - 1, -1, -1):
+            node = path[depth]
+            if depth and not node.entries and not node.children:
+                parent = path[depth - 1]
+                del parent.children[node.label[0]]
+                continue
+            if item in node.top:
+                sources = chain(node.entries, *(child.top for child in node.children.values()))
+                node.top = heapq.nsmallest(self.top_k, sources)
+
+    def top(self, prefix: str, limit: int) -> List[tuple]:
+        """prefix로 시작하는 키의 상위 limit개 항목"""
+        node = self.root
+        i = 0
+        while i < len(prefix):
+            node = node.children.get(prefix[i])
+            if node is None:
+                return []
+            label = node.label
+            rest = prefix[i:i + len(label)]
+            if not label.startswith(rest):
+                return []
+            i += len(label)
+        return node.top[:limit]
+
+
+def suggest_key(text: str) -> str:
+    """자동완성 키 (크메르어 정규화 후 한글은 자모로 분해, 나머지는 소문자)
+
+    자모로 분해하므로 "빌"처럼 입력 중인 음절도 "비료"의 접두어가 됩니다.
+    """
+    return decompose_hangul(normalize_khmer(text))
+
+
+class SuggestIndex:
+    """언어별 접두어 트라이 모음 (빈도 높은 순 자동완성)"""
+
+    FIELDS = {
+        "ko": "korean_term",
+        "km": "khmer_term",
+        "en": "english_term",
+        "pron": "khmer_pronunciation",
+    }
+
+    def __init__(self, top_k: int = 20):
+        self.top_k = top_k
+        self.tries = {lang: PrefixTrie(top_k) for lang in self.FIELDS}
+        self._keys: Dict[int, Tuple[tuple, Dict[str, str]]] = {}
+
+    def add(self, doc_id: int, term: Dict) -> None:
+        """용어 추가 (이미 있으면 교체)"""
+        if doc_id in self._keys:
+            self.remove(doc_id)
+
+        # 빈도 높은 순, 같으면 ID 순
+        item = (-(term.get("frequency_level") or 3), doc_id)
+        keys = {}
+        for lang, field in self.FIELDS.items():
+            key = suggest_key((term.get(field) or "").strip())
+            if key:
+                keys[lang] = key
+                self.tries[lang].insert(key, item)
+        self._keys[doc_id] = (item, keys)
+
+    def remove(self, doc_id: int) -> None:
+        """용어 제거"""
+        entry = self._keys.pop(doc_id, None)
+        if entry is None:
+            return
+        item, keys = entry
+        for lang, key in keys.items():
+            self.tries[lang].remove(key, item)
+
+    def suggest(self, query: str, lang: str = "", limit: int = 10) -> List[int]:
+        """query로 시작하는 용어 ID (lang이 없으면 모든 언어를 합쳐 중복 제거)"""
+        if lang and lang not in self.tries:
+            raise ValueError(f"지원하지 않는 언어입니다: {lang}")
+
+        prefix = suggest_key(query.lstrip())
+        limit = max(0, min(limit, self.top_k))
+        if not prefix or not limit:
+            return []
+
+        if lang:
+            return [doc_id for _, doc_id in self.tries[lang].top(prefix, limit)]
+
+        results = []
+        seen = set()
+        for _, doc_id in heapq.merge(*(trie.top(prefix, limit) for trie in self.tries.values())):
+            if doc_id not in seen:
+                seen.add(doc_id)
+                results.append(doc_id)
+                if len(results) == limit:
+                    break
+        return results
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """인접 문자 교환을 포함한 편집 거리 (max_distance를 넘으면 max_distance + 1)"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if a == b:
+        return 0
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+class FuzzyIndex:
+    """표제어 단어의 삭제 변형 색인 (SymSpell 방식 오타 허용 검색)
+
+    단어마다 앞 prefix_length 글자에서 최대 max_distance 글자를 지운 변형을 미리 색인해 두고,
+    질의 단어의 삭제 변형과 겹치는 단어만 편집 거리로 확인하므로 전체 용어를 훑지 않습니다.
+    한글은 음절 단위로 비교하고, 숫자만으로 된 단어(변형 번호)는 색인하지 않습니다.
+    """
+
+    def __init__(self, max_distance: int = 2, prefix_length: int = 7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.words: Dict[str, array] = {}
+        self.deletes: Dict[str, Set[str]] = {}
+        self._doc_words: Dict[int, Tuple[str, ...]] = {}
+
+    @staticmethod
+    def tokens(text: str) -> List[str]:
+        """검색 단어 목록 (크메르어 정규화, 소문자, 숫자만으로 된 단어 제외)"""
+        return [token for token in normalize_khmer(text).lower().split() if not token.isdigit()]
+
+    def allowed_distance(self, word: str) -> int:
+        """단어 길이별 허용 거리 (1글자 0, 2~4글자 1, 그 이상 max_distance)"""
+        if len(word) <= 1:
+            return 0
+        if len(word) <= 4:
+            return min(1, self.max_distance)
+        return self.max_distance
+
+    def _variants(self, word: str, distance: int) -> Set[str]:
+        """앞부분에서 최대 distance 글자를 지운 변형 (원형 포함)"""
+        variants = {word[:self.prefix_length]}
+        frontier = set(variants)
+        for _ in range(distance):
+            frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+            variants |= frontier
+        return variants
+
+    def add(self, doc_id: int, texts) -> None:
+        """문서의 표제어 추가 (이미 있으면 교체)"""
+        if doc_id in self._doc_words:
+            self.remove(doc_id)
+
+        words = tuple({token for text in texts if text for token in self.tokens(text)})
+        self._doc_words[doc_id] = words
+        for word in words:
+            posting = self.words.get(word)
+            if posting is None:
+                self.words[word] = array('I', (doc_id,))
+                for variant in self._variants(word, self.max_distance):
+                    self.deletes.setdefault(variant, set()).add(word)
+            else:
+                posting.append(doc_id)
+
+    def remove(self, doc_id: int) -> None:
+        """문서 제거"""
+        for word in self._doc_words.pop(doc_id, ()):
+            posting = self.words[word]
+            posting.remove(doc_id)
+            if not posting:
+                del self.words[word]
+                for variant in self._variants(word, self.max_distance):
+                    variant_words = self.deletes.get(variant)
+                    if variant_words is not None:
+                        variant_words.discard(word)
+                        if not variant_words:
+                            del self.deletes[variant]
+
+    def lookup(self, word: str) -> Dict[str, int]:
+        """word와 허용 거리 안에 있는 색인 단어 → 거리"""
+        max_distance = self.allowed_distance(word)
+        candidates = set()
+        for variant in self._variants(word, max_distance):
+            candidates.update(self.deletes.get(variant, ()))
+
+        matches = {}
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                matches[candidate] = distance
+        return matches
+
+    def search(self, query: str) -> Dict[int, int]:
+        """질의 단어가 모두 (오타를 허용해) 표제어에 있는 문서 ID → 거리 합계"""
+        words = self.tokens(query)
+        if not words:
+            return {}
+
+        result: Dict[int, int] = {}
+        for n, word in enumerate(words):
+            distances: Dict[int, int] = {}
+            for candidate, distance in self.lookup(word).items():
+                for doc_id in self.words[candidate]:
+                    if distance < distances.get(doc_id, self.max_distance + 1):
+                        distances[doc_id] = distance
+
+            if n == 0:
+                result = distances
+            else:
+                result = {doc_id: result[doc_id] + distance
+                          for doc_id, distance in distances.items() if doc_id in result}
+
+        return {doc_id: distance for doc_id, distance in result.items() if distance <= self.max_distance}
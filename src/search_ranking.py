@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+농업용어 검색 결과 순위
+BM25 relevance ranking with per-field weights
+
+표제어에 일치한 용어가 정의나 예문에만 일치한 용어보다 앞에 오도록 필드별 가중치를 둔 BM25로 점수를 매깁니다.
+토큰은 단어별 문자 2-gram(한 글자 단어는 그 글자)이라 조사가 붙은 한국어("비료를")나 띄어쓰지 않는 크메르어에도 일치합니다.
+"""
+
+import heapq
+import math
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from khmer_text import normalize_khmer
+
+# BM25 기본 매개변수
+K1 = 1.2
+B = 0.75
+
+
+def _normalize(text: str) -> str:
+    """순위 계산용 텍스트 (크메르어 정규화, 소문자)"""
+    return normalize_khmer(text).lower() if text else ""
+
+
+def query_tokens(text: str) -> List[str]:
+    """질의 토큰 (단어별 문자 2-gram, 한 글자 단어는 그 글자, 중복 제거)"""
+    tokens = []
+    for word in _normalize(text).split():
+        grams = [word] if len(word) == 1 else [word[i:i + 2] for i in range(len(word) - 1)]
+        for gram in grams:
+            if gram not in tokens:
+                tokens.append(gram)
+    return tokens
+
+
+def _document_tokens(text: str) -> Set[str]:
+    """문서 빈도 계산용 토큰 (단어별 문자 1-gram과 2-gram)"""
+    tokens = set()
+    for word in text.split():
+        tokens.update(word)
+        tokens.update(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class RelevanceIndex:
+    """필드 가중 BM25 점수 계산기
+
+    필드별 문서 길이와 길이 합계, 토큰별 문서 빈도(IDF 표)를 용어 추가/삭제 때마다 갱신하므로
+    질의 시에는 후보 용어 텍스트에서 질의 토큰이 나오는 위치만 찾아 필드별 빈도를 셉니다.
+    용어의 필드 텍스트는 줄바꿈으로 이어 한 문자열로 보관하고 필드 시작 위치로 필드를 구분합니다.
+    계산한 (토큰, 용어) 점수는 최근 토큰 cache_size개까지 보관하고, 용어가 바뀌면 모두 버립니다.
+    """
+
+    def __init__(self, field_weights: Dict[str, float], cache_size: int = 256):
+        self.fields: Tuple[str, ...] = tuple(field_weights)
+        self.weights: Tuple[float, ...] = tuple(field_weights.values())
+        self.texts: Dict[int, str] = {}
+        self.starts: Dict[int, Tuple[int, ...]] = {}
+        self.lengths: Dict[int, Tuple[int, ...]] = {}
+        self.total_lengths: List[int] = [0] * len(self.fields)
+        self.document_frequency: Dict[str, int] = {}
+        self.cache_size = cache_size
+        self._token_scores: "OrderedDict[str, Dict[int, float]]" = OrderedDict()
+
+    def add(self, doc_id: int, term: Dict) -> None:
+        """용어 추가 (이미 있으면 교체)"""
+        if doc_id in self.texts:
+            self.remove(doc_id)
+        self._token_scores.clear()
+
+        field_texts = [self._field_text(term.get(field)) for field in self.fields]
+        starts = []
+        offset = 0
+        for text in field_texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        lengths = tuple(len(text.replace(" ", "")) for text in field_texts)
+
+        text = "\n".join(field_texts)
+        self.texts[doc_id] = text
+        self.starts[doc_id] = tuple(starts)
+        self.lengths[doc_id] = lengths
+        for i, length in enumerate(lengths):
+            self.total_lengths[i] += length
+
+        document_frequency = self.document_frequency
+        for token in _document_tokens(text):
+            document_frequency[token] = document_frequency.get(token, 0) + 1
+
+    def remove(self, doc_id: int) -> None:
+        """용어 제거"""
+        text = self.texts.pop(doc_id, None)
+        if text is None:
+            return
+        self._token_scores.clear()
+
+        del self.starts[doc_id]
+        for i, length in enumerate(self.lengths.pop(doc_id)):
+            self.total_lengths[i] -= length
+
+        document_frequency = self.document_frequency
+        for token in _document_tokens(text):
+            count = document_frequency[token] - 1
+            if count:
+                document_frequency[token] = count
+            else:
+                del document_frequency[token]
+
+    @staticmethod
+    def _field_text(value) -> str:
+        """필드 값을 한 줄 텍스트로 (태그 목록은 공백으로 연결)"""
+        if isinstance(value, (list, tuple)):
+            value = " ".join(value)
+        return " ".join(_normalize(value or "").split())
+
+    def idf(self, token: str) -> float:
+        """토큰의 IDF (BM25, 항상 양수)"""
+        total = len(self.texts)
+        frequency = self.document_frequency.get(token, 0)
+        return math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+
+    def _token_cache(self, token: str) -> Dict[int, float]:
+        """토큰별 용어 점수 캐시 (최근 사용 순으로 cache_size개 유지)"""
+        cache = self._token_scores.get(token)
+        if cache is None:
+            cache = self._token_scores[token] = {}
+            if len(self._token_scores) > self.cache_size:
+                self._token_scores.popitem(last=False)
+            return cache
+
+        try:
+            self._token_scores.move_to_end(token)
+        except KeyError:
+            # 다른 요청이 캐시를 비운 경우 (점수는 그대로 유효)
+            pass
+        return cache
+
+    def score(self, query: str, doc_ids: Iterable[int]) -> Dict[int, float]:
+        """후보 용어별 BM25 점수"""
+        doc_ids = list(doc_ids)
+        scores = dict.fromkeys(doc_ids, 0.0)
+        if not self.texts:
+            return scores
+
+        total = len(self.texts)
+        # 필드별 (가중치 × (k1 + 1), 평균 길이)
+        fields = [(weight * (K1 + 1), max(length / total, 1e-9))
+                  for weight, length in zip(self.weights, self.total_lengths)]
+
+        for token in query_tokens(query):
+            idf = self.idf(token)
+            cache = self._token_cache(token)
+            for doc_id in doc_ids:
+                token_score = cache.get(doc_id)
+                if token_score is None:
+                    token_score = cache[doc_id] = self._token_score(token, idf, doc_id, fields)
+                scores[doc_id] += token_score
+        return scores
+
+    def _token_score(self, token: str, idf: float, doc_id: int, fields: List[Tuple[float, float]]) -> float:
+        """용어 하나에서 토큰 하나의 필드 가중 BM25 점수"""
+        text = self.texts.get(doc_id)
+        if text is None:
+            return 0.0
+
+        position = text.find(token)
+        if position < 0:
+            return 0.0
+
+        # 토큰이 나온 위치로 필드별 빈도 계산
+        starts = self.starts[doc_id]
+        frequencies: Dict[int, int] = {}
+        while position >= 0:
+            field = bisect_right(starts, position) - 1
+            frequencies[field] = frequencies.get(field, 0) + 1
+            position = text.find(token, position + len(token))
+
+        lengths = self.lengths[doc_id]
+        score = 0.0
+        for field, frequency in frequencies.items():
+            weight, average = fields[field]
+            norm = K1 * (1 - B + B * lengths[field] / average)
+            score += weight * idf * frequency / (frequency + norm)
+        return score
+
+    def rank(self, query: str, terms: List[Dict], limit: Optional[int] = None, tiebreak=None) -> List[Dict]:
+        """용어 목록을 점수 높은 순으로 정렬 (limit이 있으면 상위 limit개만)
+
+        tiebreak: 점수가 같을 때의 정렬 키 (기본은 입력 순서)
+        """
+        scores = self.score(query, (term.get("id") for term in terms))
+        if tiebreak is None:
+            keyed = [(-scores[term.get("id")], i, term) for i, term in enumerate(terms)]
+        else:
+            keyed = [(-scores[term.get("id")], tiebreak(term), i, term) for i, term in enumerate(terms)]
+
+        if limit:
+            keyed = heapq.nsmallest(limit, keyed)
+        else:
+            keyed.sort()
+        return [entry[-1] for entry in keyed]
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+대용량 학습 앱 페이지 사전 렌더링/사전 압축
+Pre-rendered, precompressed in-memory page variants (identity, gzip, deflate)
+
+5,000단어가 들어 있는 학습 앱 페이지(각 2.5MB)를 요청마다 렌더링하거나 파일에서 읽지 않도록
+처음 한 번 렌더링한 바이트와 gzip/deflate 압축본을 메모리에 보관하고,
+Accept-Encoding에 맞는 본문을 Content-Length, 강한 ETag와 함께 그대로 보냅니다.
+Range 요청(이어 받기)은 압축하지 않은 본문 기준으로 206 부분 응답을 돌려줍니다.
+"""
+
+import gzip
+import hashlib
+import threading
+import zlib
+from typing import Callable, Dict, Optional, Union
+
+from flask import Response, abort, request
+
+# 지원하는 압축 방식 (클라이언트 선호도가 같으면 앞의 것)
+ENCODINGS = ("gzip", "deflate")
+
+# 사전 압축은 한 번만 하므로 최대 압축
+COMPRESS_LEVEL = 9
+
+# 다시 시작하기 전까지 바뀌지 않지만 배포 후 새 페이지를 받도록 매번 ETag로 확인
+PAGE_CACHE_CONTROL = "no-cache"
+
+
+class PrecompressedPage:
+    """렌더링한 페이지 본문과 압축본"""
+
+    __slots__ = ("variants", "etag", "mimetype")
+
+    def __init__(self, body: bytes, mimetype: str = "text/html"):
+        self.variants: Dict[str, bytes] = {
+            "identity": body,
+            # 같은 본문이면 같은 바이트가 나오도록 gzip 헤더 시각을 0으로
+            "gzip": gzip.compress(body, compresslevel=COMPRESS_LEVEL, mtime=0),
+            # HTTP deflate는 zlib 형식
+            "deflate": zlib.compress(body, COMPRESS_LEVEL)
+        }
+        self.etag = hashlib.sha256(body).hexdigest()[:24]
+        self.mimetype = mimetype
+
+    def variant_etag(self, encoding: str) -> str:
+        """압축 방식별 ETag (본문 바이트가 다르므로 방식마다 다름)"""
+        return self.etag if encoding == "identity" else f"{self.etag}-{encoding}"
+
+
+class PageCache:
+    """이름별 사전 렌더링 페이지 (처음 요청하거나 warm()할 때 한 번 만듦)"""
+
+    def __init__(self):
+        self._renderers: Dict[str, Callable[[], Union[str, bytes]]] = {}
+        self._mimetypes: Dict[str, str] = {}
+        self._pages: Dict[str, PrecompressedPage] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, render: Callable[[], Union[str, bytes]], mimetype: str = "text/html") -> None:
+        """페이지 등록 (render는 본문 문자열이나 바이트를 반환, 파일이 없으면 FileNotFoundError)"""
+        self._renderers[name] = render
+        self._mimetypes[name] = mimetype
+
+    def get(self, name: str) -> Optional[PrecompressedPage]:
+        """사전 렌더링 페이지 (원본 파일이 없으면 None)"""
+        page = self._pages.get(name)
+        if page is not None:
+            return page
+
+        with self._lock:
+            page = self._pages.get(name)
+            if page is None:
+                try:
+                    body = self._renderers[name]()
+                except FileNotFoundError:
+                    return None
+                if isinstance(body, str):
+                    body = body.encode("utf-8")
+                page = self._pages[name] = PrecompressedPage(body, self._mimetypes[name])
+        return page
+
+    def warm(self) -> Dict[str, int]:
+        """등록한 페이지를 모두 미리 만들고 이름별 원본 크기 반환 (파일이 없는 페이지 제외)"""
+        sizes = {}
+        for name in self._renderers:
+            page = self.get(name)
+            if page is not None:
+                sizes[name] = len(page.variants["identity"])
+        return sizes
+
+    def response(self, name: str, download_name: Optional[str] = None) -> Response:
+        """현재 요청에 맞는 응답 (압축 방식 협상, ETag 확인, Range 부분 응답, 원본이 없으면 404)"""
+        page = self.get(name)
+        if page is None:
+            abort(404)
+
+        # 이어 받기는 압축하지 않은 본문의 바이트 위치 기준
+        encoding = None if request.range else request.accept_encodings.best_match(ENCODINGS)
+        encoding = encoding or "identity"
+        body = page.variants[encoding]
+
+        response = Response(body, mimetype=page.mimetype)
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = PAGE_CACHE_CONTROL
+        response.set_etag(page.variant_etag(encoding))
+        if download_name:
+            response.headers.set("Content-Disposition", "attachment", filename=download_name)
+        return response.make_conditional(request, accept_ranges=True, complete_length=len(body))
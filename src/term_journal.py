@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+농업용어 변경 저널 (Write-Ahead Journal)
+Append-only mutation journal for the term managers
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import IO, Callable, Dict, Any, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # Windows (개발 서버 단일 프로세스에서만 사용)
+    fcntl = None
+
+
+def atomic_write_text(file_path: str, text: str) -> None:
+    """임시 파일에 기록 후 교체하여 파일을 원자적으로 저장"""
+    directory = os.path.dirname(file_path) or '.'
+    os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+
+    # 같은 파일시스템 안에서의 교체는 원자적이므로 기존 파일이 잘리지 않음
+    os.replace(tmp_path, file_path)
+
+
+def atomic_write_json(file_path: str, data: Any) -> None:
+    """JSON 파일 원자적 저장"""
+    atomic_write_text(file_path, json.dumps(data, ensure_ascii=False, indent=2))
+
+
+@contextmanager
+def process_lock(lock_path: str) -> Iterator[Optional[IO[str]]]:
+    """여러 프로세스(pre-fork 워커) 사이의 배타 잠금
+
+    잠근 잠금 파일을 넘겨주므로 잠금 안에서 작은 공유 값(압축 세대 등)을 읽고 쓸 수 있습니다.
+    fcntl이 없는 플랫폼에서는 잠그지 않고 None을 넘깁니다.
+    """
+    if fcntl is None:
+        yield None
+        return
+    os.makedirs(os.path.dirname(lock_path) or '.', exist_ok=True)
+    with open(lock_path, 'a+', encoding='utf-8') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield f
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class SharedVersion:
+    """여러 프로세스(pre-fork 워커)가 같은 데이터를 바꿀 때의 공유 변경 번호
+
+    잠금 파일에 "변경 번호 압축 세대"를 기록합니다. 바꾸는 프로세스는 lock() 안에서 다른 프로세스의
+    변경을 먼저 반영한 뒤 기록하고 bump()로 번호를 올립니다. 다른 프로세스는 요청마다 changed()로
+    (잠그지 않고) 번호만 비교해 바뀌었을 때만 잠금 안에서 따라잡습니다.
+    같은 번호까지 반영한 프로세스는 데이터도 같으므로 응답 ETag의 데이터 세대로 씁니다.
+    """
+
+    def __init__(self, lock_path: str):
+        self.lock_path = lock_path
+        # 이 프로세스가 반영한 변경 번호와 압축 세대
+        self.version = 0
+        self.epoch = 0
+        self._thread_lock = threading.RLock()
+        self._file: Optional[IO[str]] = None
+        self._depth = 0
+
+    @staticmethod
+    def _parse(text: str) -> Tuple[int, int]:
+        try:
+            version, epoch = text.split()
+            return int(version), int(epoch)
+        except ValueError:
+            return 0, 0
+
+    def changed(self) -> bool:
+        """다른 프로세스가 바꿨는지 (잠그지 않고 읽으므로 True이면 lock() 안에서 다시 확인)"""
+        try:
+            with open(self.lock_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except FileNotFoundError:
+            text = ""
+        return self._parse(text) != (self.version, self.epoch)
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """프로세스 간 배타 잠금 (같은 프로세스 안에서는 다시 잡을 수 있음)"""
+        with self._thread_lock:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                return
+
+            with process_lock(self.lock_path) as lock_file:
+                self._file, self._depth = lock_file, 1
+                try:
+                    yield
+                finally:
+                    self._file, self._depth = None, 0
+
+    def current(self) -> Tuple[int, int]:
+        """잠금 안에서 읽은 현재 (변경 번호, 압축 세대) (잠금 파일이 없는 플랫폼에서는 이 프로세스의 값)"""
+        if self._file is None:
+            return self.version, self.epoch
+        self._file.seek(0)
+        return self._parse(self._file.read())
+
+    def is_current(self) -> bool:
+        """잠금 안에서 다른 프로세스의 변경을 모두 반영했는지"""
+        return self.current() == (self.version, self.epoch)
+
+    def mark_seen(self) -> None:
+        """잠금 안에서 현재 번호까지 반영했음을 기록"""
+        self.version, self.epoch = self.current()
+
+    def bump(self, compacted: bool = False) -> None:
+        """잠금 안에서 변경을 기록한 뒤 호출 (변경 번호를, 압축이면 데이터는 같으므로 압축 세대만 올림)"""
+        version, epoch = self.current()
+        if compacted:
+            epoch += 1
+        else:
+            version += 1
+        self.version, self.epoch = version, epoch
+        if self._file is not None:
+            self._file.seek(0)
+            self._file.truncate()
+            self._file.write(f"{version} {epoch}")
+            self._file.flush()
+
+
+def shared_mutation(method: Callable) -> Callable:
+    """관리자 변경 메서드를 self._shared_state() 안에서 (다른 프로세스의 변경을 반영한 뒤) 실행하는 데코레이터"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._shared_state():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class TermJournal:
+    """추가 전용 변경 로그
+
+    각 변경은 순번(seq)이 붙은 JSON 한 줄로 기록됩니다.
+    스냅샷 메타데이터의 journal_seq 이하 항목은 이미 반영된 것으로 보고 건너뜁니다.
+    """
+
+    def __init__(self, journal_path: str, compact_threshold_bytes: int = 1024 * 1024):
+        self.journal_path = journal_path
+        self.rotated_path = f"{journal_path}.prev"
+        self.compact_threshold_bytes = compact_threshold_bytes
+        self.last_seq = 0
+        self._file = None
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """회전된 로그와 현재 로그의 항목을 순서대로 읽기"""
+        for path in (self.rotated_path, self.journal_path):
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 기록 도중 중단된 마지막 줄은 무시
+                        continue
+                    self.last_seq = max(self.last_seq, entry.get("seq", 0))
+                    yield entry
+
+    def append(self, op: str, **payload) -> int:
+        """변경 항목 기록 (fsync 후 순번 반환)"""
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.journal_path) or '.', exist_ok=True)
+            self._file = open(self.journal_path, 'a', encoding='utf-8')
+
+        self.last_seq += 1
+        entry = {"seq": self.last_seq, "op": op, **payload}
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        return self.last_seq
+
+    def append_many(self, entries: List[Dict[str, Any]]) -> List[int]:
+        """여러 항목을 한 번에 기록 (fsync 한 번, 항목별 순번 반환)
+
+        각 항목은 "op" 키와 나머지 내용을 가진 dict
+        """
+        if not entries:
+            return []
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.journal_path) or '.', exist_ok=True)
+            self._file = open(self.journal_path, 'a', encoding='utf-8')
+
+        seqs = []
+        lines = []
+        for entry in entries:
+            self.last_seq += 1
+            seqs.append(self.last_seq)
+            lines.append(json.dumps({"seq": self.last_seq, **entry}, ensure_ascii=False) + "\n")
+        self._file.write("".join(lines))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        return seqs
+
+    def read_from(self, offset: int) -> Tuple[List[Dict[str, Any]], int]:
+        """현재 로그에서 offset 바이트 이후 완성된 줄의 항목과 다음 offset (다른 프로세스가 추가한 항목 읽기)"""
+        try:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], offset
+
+        # 기록 중인 마지막 줄은 다음에 읽음
+        end = data.rfind(b"\n") + 1
+        entries = []
+        for line in data[:end].splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line.decode('utf-8'))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            self.last_seq = max(self.last_seq, entry.get("seq", 0))
+            entries.append(entry)
+        return entries, offset + end
+
+    def disk_size(self) -> int:
+        """디스크의 현재 로그 파일 크기 (다른 프로세스가 추가한 부분 포함)"""
+        try:
+            return os.path.getsize(self.journal_path)
+        except OSError:
+            return 0
+
+    def size(self) -> int:
+        """현재 로그 파일 크기 (바이트)"""
+        if self._file is not None:
+            return self._file.tell()
+        try:
+            return os.path.getsize(self.journal_path)
+        except OSError:
+            return 0
+
+    def needs_compaction(self) -> bool:
+        """압축 임계값 초과 여부"""
+        return self.size() >= self.compact_threshold_bytes
+
+    def rotate(self) -> None:
+        """현재 로그를 .prev로 넘기고 새 로그 시작"""
+        self.close()
+        if not os.path.exists(self.journal_path):
+            return
+
+        if os.path.exists(self.rotated_path):
+            # 이전 압축이 끝나지 못한 경우 기존 .prev 뒤에 이어 붙임
+            with open(self.journal_path, 'r', encoding='utf-8') as src, \
+                    open(self.rotated_path, 'a', encoding='utf-8') as dst:
+                dst.write(src.read())
+                dst.flush()
+                os.fsync(dst.fileno())
+            os.remove(self.journal_path)
+        else:
+            os.replace(self.journal_path, self.rotated_path)
+
+    def discard_rotated(self) -> None:
+        """스냅샷에 반영된 회전 로그 삭제"""
+        if os.path.exists(self.rotated_path):
+            os.remove(self.rotated_path)
+
+    def close(self) -> None:
+        """로그 파일 닫기"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -6,19 +6,65 @@ Agricultural Terms Manager for Korean-Khmer Dictionary
 
 import json
 import os
+import threading
+from contextlib import contextmanager
+from itertools import islice
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterable, Iterator
 import uuid
 
+from term_journal import SharedVersion, TermJournal, atomic_write_text, process_lock, shared_mutation
+from search_index import NgramIndex, SuggestIndex
+from search_ranking import RelevanceIndex
+from facet_index import FacetIndex
+from query_cache import QueryCache, cached_query
+from pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor, paginate, paginate_sorted
+
 class AgriculturalTermManager:
-    def __init__(self, data_file_path: str = None):
+    # 관련도 정렬(BM25) 필드 가중치 (표제어 > 태그 > 정의)
+    RELEVANCE_FIELDS = {
+        "korean_term": 3.0,
+        "khmer_term": 3.0,
+        "english_term": 2.5,
+        "tags": 1.5,
+        "korean_definition": 1.0,
+        "khmer_definition": 1.0
+    }
+    
+    def __init__(self, data_file_path: str = None, compact_threshold_bytes: int = 1024 * 1024):
         """농업용어 관리자 초기화"""
         if data_file_path is None:
             self.data_file_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'agricultural_terms.json')
         else:
             self.data_file_path = data_file_path
         
-        self.data = self._load_data()
+        # 변경은 저널에 추가 기록하고, 스냅샷은 임계값 도달 시 백그라운드에서 압축
+        self._lock = threading.RLock()
+        self._compaction_lock = threading.Lock()
+        self._compaction_thread = None
+        self.journal = TermJournal(
+            os.path.splitext(self.data_file_path)[0] + '.journal',
+            compact_threshold_bytes
+        )
+        
+        # 조회 결과 캐시 (변경될 때마다 세대가 올라가 이전 결과는 쓰지 않음)
+        self._query_cache = QueryCache()
+        
+        # 여러 프로세스(pre-fork 워커)가 같은 저널에 기록하므로 변경 번호와 읽은 저널 위치로 서로의 변경을 반영
+        self._shared = SharedVersion(self.data_file_path + '.lock')
+        self._compaction_lock_path = os.path.splitext(self.data_file_path)[0] + '.compact.lock'
+        self._journal_offset = 0
+        
+        with self._lock, self._shared.lock():
+            self.data = self._load_data()
+            self._rebuild_indexes()
+            replayed = self._replay_journal()
+            self._journal_offset = self.journal.disk_size()
+            self._shared.mark_seen()
+        
+        # 재적용한 항목이 있으면 깨끗한 스냅샷으로 정리
+        if replayed:
+            self.compact()
     
     def _load_data(self) -> Dict[str, Any]:
         """데이터 파일 로드"""
@@ -42,19 +88,174 @@ class AgriculturalTermManager:
             raise Exception(f"데이터 파일 형식 오류: {e}")
     
     def _save_data(self, data: Dict[str, Any] = None) -> None:
-        """데이터 파일 저장"""
+        """데이터 파일 저장 (전체 스냅샷)"""
         if data is None:
             data = self.data
         
-        # 메타데이터 업데이트
+        with self._lock:
+            text = self._serialize_snapshot(data)
+        atomic_write_text(self.data_file_path, text)
+    
+    def _serialize_snapshot(self, data: Dict[str, Any]) -> str:
+        """메타데이터를 갱신하고 스냅샷 JSON 문자열 생성"""
         data["metadata"]["total_terms"] = len(data["terms"])
         data["metadata"]["last_updated"] = datetime.now().isoformat()
+        data["metadata"]["journal_seq"] = self.journal.last_seq
+        
+        return json.dumps(data, ensure_ascii=False, indent=2)
+    
+    def _rebuild_indexes(self) -> None:
+        """메모리 색인 구성 (ID → 용어, 다음 ID 카운터, 검색 n-gram, 자동완성, 관련도, 패싯 비트맵)"""
+        self._terms_by_id = {term.get("id"): term for term in self.data["terms"]}
+        
+        self._search_index = NgramIndex()
+        self._suggest_index = SuggestIndex()
+        self._relevance_index = RelevanceIndex(self.RELEVANCE_FIELDS)
+        for term in self.data["terms"]:
+            self._search_index.add(term.get("id"), self._searchable_text(term))
+            self._suggest_index.add(term.get("id"), term)
+            self._relevance_index.add(term.get("id"), term)
+        
+        self._facet_index = FacetIndex()
+        self._facet_index.add_many(self.data["terms"])
+        
+        max_id = max(self._terms_by_id, default=0) or 0
+        metadata = self.data["metadata"]
+        metadata["next_id"] = max(metadata.get("next_id", 1), max_id + 1)
+        self._query_cache.bump_generation()
+    
+    def _replay_journal(self) -> int:
+        """스냅샷 이후의 저널 항목을 재적용하고 재적용한 항목 수 반환"""
+        snapshot_seq = self.data["metadata"].get("journal_seq", 0)
+        replayed = 0
+        
+        for entry in self.journal.entries():
+            if entry.get("seq", 0) <= snapshot_seq:
+                continue
+            self._apply_mutation(entry)
+            replayed += 1
+        
+        self.journal.last_seq = max(self.journal.last_seq, snapshot_seq)
+        return replayed
+    
+    @contextmanager
+    def _shared_state(self) -> Iterator[None]:
+        """다른 프로세스의 변경을 반영한 뒤 잠금 안에서 작업"""
+        with self._lock, self._shared.lock():
+            self._catch_up()
+            yield
+    
+    def _catch_up(self) -> None:
+        """다른 프로세스가 저널에 기록한 변경 반영 (못 읽은 변경이 스냅샷으로 압축되었으면 스냅샷부터 다시 읽음)"""
+        if self._shared.is_current():
+            return
         
-        # 디렉토리 생성 (없는 경우)
-        os.makedirs(os.path.dirname(self.data_file_path), exist_ok=True)
+        version, epoch = self._shared.current()
+        if epoch != self._shared.epoch:
+            # 열어 둔 파일은 회전된 이전 저널이므로 다음 기록 때 다시 열도록 닫음
+            self.journal.close()
+            if version != self._shared.version:
+                self.data = self._load_data()
+                self._rebuild_indexes()
+                self._replay_journal()
+                self._journal_offset = self.journal.disk_size()
+                self._shared.mark_seen()
+                return
+            # 압축 전에 모두 반영했으므로 새 저널의 처음부터 읽음
+            self._journal_offset = 0
         
-        with open(self.data_file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        applied_seq = self.journal.last_seq
+        entries, self._journal_offset = self.journal.read_from(self._journal_offset)
+        for entry in entries:
+            if entry.get("seq", 0) > applied_seq:
+                self._apply_mutation(entry)
+        self._shared.mark_seen()
+    
+    def refresh(self) -> None:
+        """다른 프로세스(pre-fork 워커)가 바꾼 데이터 반영 (요청마다 호출, 바뀌지 않았으면 잠금 파일만 읽음)"""
+        if self._shared.changed():
+            with self._shared_state():
+                pass
+    
+    def _apply_mutation(self, entry: Dict[str, Any]) -> None:
+        """저널 항목 하나를 메모리 데이터에 반영"""
+        op = entry["op"]
+        
+        if op == "add":
+            term = entry["term"]
+            self.data["terms"].append(term)
+            self._terms_by_id[term["id"]] = term
+            self._search_index.add(term["id"], self._searchable_text(term))
+            self._suggest_index.add(term["id"], term)
+            self._relevance_index.add(term["id"], term)
+            self._facet_index.add(term["id"], term)
+            metadata = self.data["metadata"]
+            metadata["next_id"] = max(metadata["next_id"], term["id"] + 1)
+        elif op == "update":
+            term = self._terms_by_id.get(entry["id"])
+            if term:
+                term.update(entry["fields"])
+                self._search_index.add(term["id"], self._searchable_text(term))
+                self._suggest_index.add(term["id"], term)
+                self._relevance_index.add(term["id"], term)
+                self._facet_index.add(term["id"], term)
+        elif op == "delete":
+            term = self._terms_by_id.pop(entry["id"], None)
+            if term:
+                self._search_index.remove(term["id"])
+                self._suggest_index.remove(term["id"])
+                self._relevance_index.remove(term["id"])
+                self._facet_index.remove(term["id"])
+                for i, candidate in enumerate(self.data["terms"]):
+                    if candidate is term:
+                        del self.data["terms"][i]
+                        break
+        
+        self._query_cache.bump_generation()
+    
+    def _record_mutation(self, op: str, **payload) -> None:
+        """변경을 저널에 기록한 뒤 메모리에 반영"""
+        with self._shared_state():
+            seq = self.journal.append(op, **payload)
+            self._apply_mutation({"seq": seq, "op": op, **payload})
+            
+            self.data["metadata"]["total_terms"] = len(self.data["terms"])
+            self.data["metadata"]["last_updated"] = datetime.now().isoformat()
+            self._journal_offset = self.journal.disk_size()
+            self._shared.bump()
+        
+        if self.journal.needs_compaction():
+            self._start_background_compaction()
+    
+    def _start_background_compaction(self) -> None:
+        """백그라운드 압축 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+        
+        self._compaction_thread = threading.Thread(target=self.compact, daemon=True)
+        self._compaction_thread.start()
+    
+    def compact(self) -> None:
+        """저널을 스냅샷에 반영하고 반영된 저널 정리
+        
+        회전할 때 압축 세대를 올려 다른 프로세스가 새 저널의 처음부터 읽게 합니다.
+        스냅샷을 쓰는 동안 스냅샷을 다시 읽는 프로세스는 이전 스냅샷과 회전된 저널(.prev)로 같은 데이터를 얻고,
+        압축은 프로세스 사이에도 한 번에 하나만 하므로 .prev를 지울 때 다른 압축의 항목을 지우지 않습니다.
+        """
+        with self._compaction_lock, process_lock(self._compaction_lock_path):
+            # 일관된 시점의 스냅샷을 만들고 저널을 회전 (쓰기는 잠시만 대기)
+            with self._shared_state():
+                text = self._serialize_snapshot(self.data)
+                self.journal.rotate()
+                self._journal_offset = 0
+                self._shared.bump(compacted=True)
+            
+            # 파일 기록은 잠금 밖에서 원자적으로 수행
+            atomic_write_text(self.data_file_path, text)
+            
+            # 회전된 저널은 다른 프로세스가 스냅샷을 다시 읽는 중이 아닐 때 삭제
+            with self._shared.lock():
+                self.journal.discard_rotated()
     
     def add_term(self, 
                  korean_term: str,
@@ -74,79 +275,156 @@ class AgriculturalTermManager:
         if tags is None:
             tags = []
         
-        # 새 ID 생성 (기존 최대 ID + 1)
-        existing_ids = [term.get("id", 0) for term in self.data["terms"]]
-        new_id = max(existing_ids, default=0) + 1
-        
-        new_term = {
-            "id": new_id,
-            "korean_term": korean_term,
-            "khmer_term": khmer_term,
-            "english_term": english_term,
-            "category": category,
-            "korean_definition": korean_definition,
-            "khmer_definition": khmer_definition,
-            "usage_example": usage_example,
-            "related_terms": related_terms,
-            "difficulty_level": difficulty_level,
-            "tags": tags,
-            "created_date": datetime.now().isoformat(),
-            "updated_date": datetime.now().isoformat(),
-            "verified": False
-        }
-        
-        self.data["terms"].append(new_term)
-        self._save_data()
+        with self._shared_state():
+            new_id = self._next_term_id()
+            
+            new_term = {
+                "id": new_id,
+                "korean_term": korean_term,
+                "khmer_term": khmer_term,
+                "english_term": english_term,
+                "category": category,
+                "korean_definition": korean_definition,
+                "khmer_definition": khmer_definition,
+                "usage_example": usage_example,
+                "related_terms": related_terms,
+                "difficulty_level": difficulty_level,
+                "tags": tags,
+                "created_date": datetime.now().isoformat(),
+                "updated_date": datetime.now().isoformat(),
+                "verified": False
+            }
+            
+            self._record_mutation("add", term=new_term)
         
         return new_id
     
+    def _next_term_id(self) -> int:
+        """새 ID (메타데이터의 next_id 카운터, 삭제된 ID는 재사용하지 않음)"""
+        return self.data["metadata"]["next_id"]
+    
+    @staticmethod
+    def _searchable_text(term: Dict[str, Any]) -> str:
+        """키워드 검색 대상 텍스트 (한국어, 크메르어, 영어, 정의, 태그)"""
+        return " ".join([
+            term.get("korean_term", ""),
+            term.get("khmer_term", ""),
+            term.get("english_term", ""),
+            term.get("korean_definition", ""),
+            term.get("khmer_definition", ""),
+            " ".join(term.get("tags", []))
+        ]).lower()
+    
     def get_term_by_id(self, term_id: int) -> Optional[Dict[str, Any]]:
         """ID로 용어 검색"""
-        for term in self.data["terms"]:
-            if term.get("id") == term_id:
-                return term
-        return None
+        return self._terms_by_id.get(term_id)
     
+    @cached_query
     def search_terms(self, 
                     keyword: str = "", 
                     category: str = "", 
                     difficulty_level: str = "",
-                    verified_only: bool = False) -> List[Dict[str, Any]]:
-        """용어 검색"""
-        results = []
-        keyword_lower = keyword.lower()
+                    verified_only: bool = False,
+                    sort: str = "",
+                    limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """용어 검색 (sort="relevance"이면 키워드 관련도(BM25) 높은 순, 아니면 추가된 순)"""
+        term_ids = iter(self._search_ids(keyword, category, difficulty_level, verified_only))
         
-        for term in self.data["terms"]:
-            # 검증된 용어만 필터링
-            if verified_only and not term.get("verified", False):
-                continue
-                
-            # 카테고리 필터링
-            if category and term.get("category", "") != category:
-                continue
-                
-            # 난이도 필터링
-            if difficulty_level and term.get("difficulty_level", "") != difficulty_level:
-                continue
-            
-            # 키워드 검색 (한국어, 크메르어, 영어, 정의에서)
-            if keyword:
-                searchable_text = " ".join([
-                    term.get("korean_term", ""),
-                    term.get("khmer_term", ""),
-                    term.get("english_term", ""),
-                    term.get("korean_definition", ""),
-                    term.get("khmer_definition", ""),
-                    " ".join(term.get("tags", []))
-                ]).lower()
-                
-                if keyword_lower not in searchable_text:
-                    continue
-            
-            results.append(term)
+        if sort == "relevance" and keyword:
+            return self._relevance_index.rank(keyword, [self._terms_by_id[term_id] for term_id in term_ids], limit)
         
-        return results
+        # ID(추가된) 순서이므로 limit이 있으면 앞의 limit개만 꺼냄
+        if limit:
+            term_ids = islice(term_ids, limit)
+        return [self._terms_by_id[term_id] for term_id in term_ids]
+    
+    def get_query_cache_stats(self) -> Dict[str, Any]:
+        """조회 결과 캐시 적중/실패/제거 횟수"""
+        return self._query_cache.stats()
+    
+    def get_data_generation(self) -> int:
+        """데이터 세대 (용어가 추가/수정/삭제될 때마다 올라가는 프로세스 공유 변경 번호, 응답 캐시 검증용)"""
+        return self._shared.version
+    
+    def before_fork(self) -> None:
+        """pre-fork 서버가 워커를 만들기 전 마스터에서 호출 (진행 중인 압축을 기다리고 열어 둔 저널 파일을 닫음)"""
+        if self._compaction_thread is not None:
+            self._compaction_thread.join()
+        self.journal.close()
+    
+    def after_fork(self) -> None:
+        """워커 프로세스가 시작될 때 호출 (JSON 저장소는 색인을 마스터와 공유하므로 할 일 없음)"""
     
+    def _search_ids(self,
+                    keyword: str = "",
+                    category: str = "",
+                    difficulty_level: str = "",
+                    verified_only: bool = False) -> Iterable[int]:
+        """검색 조건을 만족하는 용어 ID (오름차순)"""
+        matched_ids = None
+        if keyword:
+            # n-gram 색인으로 키워드(한국어, 크메르어, 영어, 정의, 태그)를 포함하는 용어만 추림
+            matched_ids = self._search_index.search(keyword.lower())
+        
+        # 검증 여부, 카테고리, 난이도 필터는 패싯 비트맵 AND
+        return self._facet_index.select(
+            matched_ids,
+            category=category or None,
+            difficulty_level=difficulty_level or None,
+            verified=True if verified_only else None
+        )
+    
+    @cached_query
+    def search_terms_page(self,
+                          keyword: str = "",
+                          category: str = "",
+                          difficulty_level: str = "",
+                          verified_only: bool = False,
+                          sort: str = "",
+                          cursor: str = "",
+                          page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """용어 검색 결과 한 페이지 (terms, next_cursor, total_count)
+        
+        cursor는 이전 페이지의 next_cursor (첫 페이지는 빈 문자열), 잘못된 커서는 ValueError
+        """
+        sort = "relevance" if sort == "relevance" and keyword else "id"
+        after = decode_cursor(cursor, sort)
+        term_ids = list(self._search_ids(keyword, category, difficulty_level, verified_only))
+        
+        if sort == "relevance":
+            scores = self._relevance_index.score(keyword, term_ids)
+            keys, has_more = paginate(((-scores[term_id], term_id) for term_id in term_ids), after, page_size)
+            page_ids = [key[-1] for key in keys]
+        else:
+            # ID 순서 그대로이므로 커서 위치는 이진 탐색
+            page_ids, has_more = paginate_sorted(term_ids, after, page_size)
+            keys = [(term_id,) for term_id in page_ids]
+        
+        return {
+            "terms": [self._terms_by_id[term_id] for term_id in page_ids],
+            "next_cursor": encode_cursor(sort, keys[-1]) if has_more else None,
+            "total_count": len(term_ids)
+        }
+    
+    def suggest_terms(self, query: str, lang: str = "", limit: int = 10) -> List[Dict[str, Any]]:
+        """자동완성 후보 (용어 접두어 일치, 빈도 높은 순)
+        
+        lang: "ko" 한국어, "km" 크메르어, "en" 영어, "pron" 크메르어 발음, "" 전체
+        """
+        suggestions = []
+        for term_id in self._suggest_index.suggest(query, lang, limit):
+            term = self.get_term_by_id(term_id)
+            if term:
+                suggestions.append({
+                    "id": term_id,
+                    "korean_term": term.get("korean_term", ""),
+                    "khmer_term": term.get("khmer_term", ""),
+                    "english_term": term.get("english_term", ""),
+                    "category": term.get("category", "")
+                })
+        return suggestions
+    
+    @shared_mutation
     def update_term(self, term_id: int, **kwargs) -> bool:
         """용어 정보 수정"""
         term = self.get_term_by_id(term_id)
@@ -160,48 +438,47 @@ class AgriculturalTermManager:
             "related_terms", "difficulty_level", "tags", "verified"
         ]
         
-        for field, value in kwargs.items():
-            if field in allowed_fields:
-                term[field] = value
+        fields = {field: value for field, value in kwargs.items() if field in allowed_fields}
+        fields["updated_date"] = datetime.now().isoformat()
         
-        term["updated_date"] = datetime.now().isoformat()
-        self._save_data()
+        self._record_mutation("update", id=term_id, fields=fields)
         
         return True
     
+    @shared_mutation
     def delete_term(self, term_id: int) -> bool:
         """용어 삭제"""
-        for i, term in enumerate(self.data["terms"]):
-            if term.get("id") == term_id:
-                del self.data["terms"][i]
-                self._save_data()
-                return True
-        return False
+        if not self.get_term_by_id(term_id):
+            return False
+        
+        self._record_mutation("delete", id=term_id)
+        return True
+    
+    def get_facet_counts(self) -> Dict[str, Dict[Any, int]]:
+        """패싯(category, difficulty_level, frequency_level, verified) 값별 용어 수 (비트맵 popcount)"""
+        return self._facet_index.counts()
     
     def get_categories(self) -> List[str]:
         """모든 카테고리 목록 반환"""
-        categories = set()
-        for term in self.data["terms"]:
-            if term.get("category"):
-                categories.add(term["category"])
-        return sorted(list(categories))
+        return sorted(category for category in self._facet_index.bitmaps["category"] if category)
     
     def get_statistics(self) -> Dict[str, Any]:
         """용어 통계 정보"""
         total_terms = len(self.data["terms"])
-        verified_terms = len([t for t in self.data["terms"] if t.get("verified", False)])
+        
+        # 카테고리/난이도별 통계는 패싯 비트맵 popcount (값이 없으면 미분류, 중급)
+        facet_counts = self.get_facet_counts()
+        verified_terms = facet_counts["verified"].get(True, 0)
         
         category_stats = {}
-        difficulty_stats = {}
+        for category, count in facet_counts["category"].items():
+            category = category or "미분류"
+            category_stats[category] = category_stats.get(category, 0) + count
         
-        for term in self.data["terms"]:
-            # 카테고리별 통계
-            category = term.get("category", "미분류")
-            category_stats[category] = category_stats.get(category, 0) + 1
-            
-            # 난이도별 통계
-            difficulty = term.get("difficulty_level", "중급")
-            difficulty_stats[difficulty] = difficulty_stats.get(difficulty, 0) + 1
+        difficulty_stats = {}
+        for difficulty, count in facet_counts["difficulty_level"].items():
+            difficulty = difficulty or "중급"
+            difficulty_stats[difficulty] = difficulty_stats.get(difficulty, 0) + count
         
         return {
             "total_terms": total_terms,
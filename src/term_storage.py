@@ -0,0 +1,872 @@
+#!/usr/bin/env python3
+"""
+농업용어 SQLite 저장소
+SQLite storage backend for the term managers
+
+기존 관리자와 같은 공개 메서드를 제공하므로 app.py, mobile_app.py는 그대로 동작합니다.
+TERM_STORAGE_BACKEND=sqlite 환경변수로 선택하며, DB 파일이 없으면 JSON에서 한 번 이전합니다.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Optional, Any, Iterable, Iterator, Tuple
+
+from term_manager import AgriculturalTermManager
+from enhanced_term_manager import EnhancedAgriculturalTermManager
+from search_index import HangulIndex, PhoneticIndex, SuggestIndex, FuzzyIndex
+from search_ranking import RelevanceIndex
+from khmer_text import normalize_khmer, contains_khmer
+from query_cache import QueryCache, cached_query
+from facet_index import FACET_DEFAULTS, facet_histogram
+from pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor, paginate
+from learning_order import LearningOrderIndex, LearningOrderRanker, RANKING_VERSION
+from term_journal import SharedVersion, shared_mutation
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL DEFAULT '',
+    difficulty_level TEXT NOT NULL DEFAULT '',
+    frequency_level INTEGER NOT NULL DEFAULT 0,
+    verified INTEGER NOT NULL DEFAULT 0,
+    learning_order INTEGER NOT NULL DEFAULT 999999,
+    search_text TEXT NOT NULL DEFAULT '',
+    body TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_terms_category ON terms (category, learning_order);
+CREATE INDEX IF NOT EXISTS idx_terms_difficulty ON terms (difficulty_level);
+CREATE INDEX IF NOT EXISTS idx_terms_frequency ON terms (frequency_level);
+CREATE INDEX IF NOT EXISTS idx_terms_verified ON terms (verified);
+CREATE INDEX IF NOT EXISTS idx_terms_learning_order ON terms (learning_order, id);
+"""
+
+
+class SQLiteTermStore:
+    """용어 테이블 접근 (인덱스 컬럼 + 전체 JSON 본문)"""
+
+    def __init__(self, db_path: str, searchable_text):
+        self.db_path = db_path
+        self._searchable_text = searchable_text
+        self._lock = threading.RLock()
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.conn = self._connect()
+        self.conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def close(self) -> None:
+        """연결 닫기 (SQLite 연결은 fork한 프로세스와 공유하면 안 되므로 fork 전에 닫음)"""
+        with self._lock:
+            self.conn.close()
+
+    def reopen(self) -> None:
+        """새 연결 열기 (fork한 워커 프로세스에서 호출)"""
+        with self._lock:
+            self.conn = self._connect()
+
+    def _row_values(self, term: Dict[str, Any]) -> tuple:
+        """용어 dict를 테이블 컬럼 값으로 변환"""
+        return (
+            term["id"],
+            term.get("category", ""),
+            term.get("difficulty_level", ""),
+            term.get("frequency_level", 0),
+            1 if term.get("verified", False) else 0,
+            term.get("learning_order", 999999),
+            self._searchable_text(term),
+            json.dumps(term, ensure_ascii=False)
+        )
+
+    def insert_many(self, terms: Iterable[Dict[str, Any]]) -> None:
+        """여러 용어를 하나의 트랜잭션으로 저장"""
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO terms "
+                "(id, category, difficulty_level, frequency_level, verified, learning_order, search_text, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._row_values(term) for term in terms)
+            )
+
+    def insert(self, term: Dict[str, Any]) -> None:
+        """용어 저장"""
+        self.insert_many([term])
+
+    def get(self, term_id: int) -> Optional[Dict[str, Any]]:
+        """ID로 용어 조회"""
+        with self._lock:
+            row = self.conn.execute("SELECT body FROM terms WHERE id = ?", (term_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update_fields(self, term_id: int, fields: Dict[str, Any]) -> bool:
+        """필드 일부 수정 (읽기-수정-쓰기를 한 트랜잭션으로)"""
+        with self._lock, self.conn:
+            row = self.conn.execute("SELECT body FROM terms WHERE id = ?", (term_id,)).fetchone()
+            if not row:
+                return False
+            term = json.loads(row[0])
+            term.update(fields)
+            self.conn.execute(
+                "REPLACE INTO terms "
+                "(id, category, difficulty_level, frequency_level, verified, learning_order, search_text, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                self._row_values(term)
+            )
+        return True
+
+    def delete(self, term_id: int) -> bool:
+        """용어 삭제"""
+        with self._lock, self.conn:
+            cursor = self.conn.execute("DELETE FROM terms WHERE id = ?", (term_id,))
+        return cursor.rowcount > 0
+
+    @staticmethod
+    def _conditions(keyword: str = "",
+                    category: str = "",
+                    difficulty_level: str = "",
+                    frequency_level: int = 0,
+                    verified_only: bool = False,
+                    ids: Optional[Iterable[int]] = None) -> Tuple[List[str], List[Any]]:
+        """조회 조건을 WHERE 절 목록과 매개변수로"""
+        clauses = []
+        params: List[Any] = []
+
+        if verified_only:
+            clauses.append("verified = 1")
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        if difficulty_level:
+            clauses.append("difficulty_level = ?")
+            params.append(difficulty_level)
+        if frequency_level > 0:
+            clauses.append("frequency_level = ?")
+            params.append(frequency_level)
+        if keyword:
+            clauses.append("instr(search_text, ?) > 0")
+            params.append(keyword.lower())
+        if ids is not None:
+            clauses.append("id IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(list(ids)))
+        return clauses, params
+
+    def query(self,
+              keyword: str = "",
+              category: str = "",
+              difficulty_level: str = "",
+              frequency_level: int = 0,
+              verified_only: bool = False,
+              ids: Optional[Iterable[int]] = None,
+              order_by: str = "id",
+              limit: Optional[int] = None,
+              offset: int = 0,
+              after: Optional[Tuple] = None) -> List[Dict[str, Any]]:
+        """인덱스 컬럼 조건으로 용어 조회
+
+        after: order_by 컬럼 값 튜플, 그보다 뒤의 행만 (커서 페이지, 인덱스 범위 검색)
+        """
+        clauses, params = self._conditions(keyword, category, difficulty_level, frequency_level, verified_only, ids)
+        if after is not None:
+            clauses.append(f"({order_by}) > ({', '.join('?' * len(after))})")
+            params.extend(after)
+
+        sql = "SELECT body FROM terms"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order_by}"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([-1 if limit is None else limit, offset])
+
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def ids(self, order_by: str = "id", limit: Optional[int] = None, offset: int = 0) -> List[int]:
+        """용어 ID만 정렬 순서대로 (본문을 읽지 않는 인덱스 조회)"""
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT id FROM terms ORDER BY {order_by} LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def count_matching(self, **conditions) -> int:
+        """query와 같은 조회 조건에 맞는 용어 수"""
+        clauses, params = self._conditions(**conditions)
+        return self.count(" AND ".join(clauses), tuple(params))
+
+    def facet_histogram(self, **conditions) -> Dict[str, Dict[Any, int]]:
+        """query와 같은 조회 조건에 맞는 용어의 패싯 컬럼별 값 개수 (GROUP BY 한 번)"""
+        clauses, params = self._conditions(**conditions)
+        sql = "SELECT category, difficulty_level, frequency_level, verified, COUNT(*) FROM terms"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " GROUP BY category, difficulty_level, frequency_level, verified"
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+
+        result: Dict[str, Dict[Any, int]] = {facet: {} for facet in FACET_DEFAULTS}
+        for category, difficulty_level, frequency_level, verified, count in rows:
+            for counts, value in zip(result.values(), (category, difficulty_level, frequency_level, bool(verified))):
+                counts[value] = counts.get(value, 0) + count
+        return result
+
+    def count(self, where: str = "", params: tuple = ()) -> int:
+        """조건에 맞는 용어 수"""
+        sql = "SELECT COUNT(*) FROM terms"
+        if where:
+            sql += " WHERE " + where
+        with self._lock:
+            return self.conn.execute(sql, params).fetchone()[0]
+
+    def group_count(self, column: str, default: Any = None) -> Dict[Any, int]:
+        """컬럼 값별 용어 수 (빈 값은 default로 합산)"""
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {column}, COUNT(*) FROM terms GROUP BY {column}"
+            ).fetchall()
+
+        counts: Dict[Any, int] = {}
+        for value, count in rows:
+            if not value and default is not None:
+                value = default
+            counts[value] = counts.get(value, 0) + count
+        return counts
+
+    def max_id(self) -> int:
+        """현재 최대 ID"""
+        with self._lock:
+            return self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM terms").fetchone()[0]
+
+    def load_metadata(self) -> Dict[str, Any]:
+        """메타데이터 읽기"""
+        with self._lock:
+            rows = self.conn.execute("SELECT key, value FROM metadata").fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def save_metadata(self, metadata: Dict[str, Any]) -> None:
+        """메타데이터 저장"""
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value, ensure_ascii=False)) for key, value in metadata.items()]
+            )
+
+    def next_id(self) -> int:
+        """다음 ID (메타데이터 카운터와 최대 ID + 1 중 큰 값)"""
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM metadata WHERE key = 'next_id'").fetchone()
+        stored = json.loads(row[0]) if row else 1
+        return max(stored, self.max_id() + 1)
+
+    def touch(self) -> None:
+        """메타데이터의 용어 수/다음 ID/수정 시각 갱신"""
+        self.save_metadata({
+            "total_terms": self.count(),
+            "next_id": self.next_id(),
+            "last_updated": datetime.now().isoformat()
+        })
+
+
+class _SQLiteManagerMixin:
+    """SQLite 저장소를 쓰는 관리자 공통 부분"""
+
+    # 처음 사용할 때 DB에서 구성하는 프로세스별 색인 (다른 프로세스가 DB를 바꾸면 버리고 다시 구성)
+    LAZY_INDEXES = ("_suggest_index", "_relevance_index")
+
+    def _open_store(self, db_path: str) -> None:
+        self.data_file_path = db_path
+        self.store = SQLiteTermStore(db_path, self._searchable_text)
+        self._lock = self.store._lock
+        self._suggest_index = None
+        self._relevance_index = None
+        self._query_cache = QueryCache()
+
+        # DB는 프로세스 사이에 공유되지만 색인과 조회 캐시는 프로세스별이므로 변경 번호로 오래된 것을 버림
+        self._shared = SharedVersion(db_path + '.lock')
+        with self._shared.lock():
+            self._shared.mark_seen()
+
+    @contextmanager
+    def _shared_state(self) -> Iterator[None]:
+        """다른 프로세스의 변경을 반영한 뒤 잠금 안에서 작업"""
+        with self._lock, self._shared.lock():
+            self._catch_up()
+            yield
+
+    def _catch_up(self) -> None:
+        """다른 프로세스가 DB를 바꿨으면 프로세스별 색인과 조회 캐시를 버림"""
+        if self._shared.is_current():
+            return
+        for name in self.LAZY_INDEXES:
+            setattr(self, name, None)
+        self._query_cache.bump_generation()
+        self._shared.mark_seen()
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """기존 코드 호환용 전체 데이터 (호출 시마다 DB에서 구성)"""
+        return {
+            "metadata": self.store.load_metadata(),
+            "terms": self.store.query()
+        }
+
+    def _next_term_id(self) -> int:
+        return self.store.next_id()
+
+    def _term_count(self) -> int:
+        return self.store.count()
+
+    def get_term_by_id(self, term_id: int) -> Optional[Dict[str, Any]]:
+        """ID로 용어 검색 (기본키 조회)"""
+        return self.store.get(term_id)
+
+    def get_facet_counts(self) -> Dict[str, Dict[Any, int]]:
+        """패싯 값별 용어 수 (인덱스 컬럼 GROUP BY)"""
+        return {
+            "category": self.store.group_count("category"),
+            "difficulty_level": self.store.group_count("difficulty_level"),
+            "frequency_level": self.store.group_count("frequency_level"),
+            "verified": {bool(value): count for value, count in self.store.group_count("verified").items()}
+        }
+
+    def suggest_terms(self, query: str, lang: str = "", limit: int = 10) -> List[Dict[str, Any]]:
+        """자동완성 후보 (접두어 트라이는 처음 사용할 때 구성)"""
+        if self._suggest_index is None:
+            self._suggest_index = SuggestIndex()
+            for term in self.store.query():
+                self._suggest_index.add(term["id"], term)
+        return super().suggest_terms(query, lang, limit)
+
+    def _relevance(self) -> RelevanceIndex:
+        """관련도(BM25) 색인 (처음 사용할 때 구성)"""
+        if self._relevance_index is None:
+            self._relevance_index = RelevanceIndex(self.RELEVANCE_FIELDS)
+            for term in self.store.query():
+                self._relevance_index.add(term["id"], term)
+        return self._relevance_index
+
+    def before_fork(self) -> None:
+        """pre-fork 서버가 워커를 만들기 전 마스터에서 호출
+
+        처음 사용할 때 만드는 색인을 미리 만들어 워커가 copy-on-write로 공유하게 하고 DB 연결을 닫습니다.
+        """
+        self.suggest_terms("")
+        self._relevance()
+        self.store.close()
+
+    def after_fork(self) -> None:
+        """워커 프로세스가 시작될 때 호출 (워커 전용 DB 연결을 새로 엶)"""
+        self.store.reopen()
+
+    def _update_lazy_indexes(self, term_id: int) -> None:
+        """변경된 용어를 자동완성/관련도 색인에 반영 (색인을 만든 경우만)"""
+        indexes = [index for index in (self._suggest_index, self._relevance_index) if index is not None]
+        if not indexes:
+            return
+        term = self.store.get(term_id)
+        for index in indexes:
+            if term:
+                index.add(term_id, term)
+            else:
+                index.remove(term_id)
+
+
+class SQLiteAgriculturalTermManager(_SQLiteManagerMixin, AgriculturalTermManager):
+    """SQLite 기반 농업용어 관리자"""
+
+    def __init__(self, db_path: str = None):
+        if db_path is None:
+            db_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'agricultural_terms.db')
+        self._open_store(db_path)
+
+        if not self.store.load_metadata():
+            self.store.save_metadata({
+                "version": "1.0",
+                "total_terms": 0,
+                "last_updated": datetime.now().isoformat(),
+                "target_count": 3000
+            })
+
+    def _record_mutation(self, op: str, **payload) -> None:
+        """변경을 트랜잭션으로 DB에 반영"""
+        if op == "add":
+            self.store.insert(payload["term"])
+        elif op == "update":
+            self.store.update_fields(payload["id"], payload["fields"])
+        elif op == "delete":
+            self.store.delete(payload["id"])
+        self.store.touch()
+        self._update_lazy_indexes(payload["term"]["id"] if op == "add" else payload["id"])
+        self._query_cache.bump_generation()
+        self._shared.bump()
+
+    def compact(self) -> None:
+        """SQLite는 저널 압축이 필요 없음"""
+        return None
+
+    @cached_query
+    def search_terms(self,
+                     keyword: str = "",
+                     category: str = "",
+                     difficulty_level: str = "",
+                     verified_only: bool = False,
+                     sort: str = "",
+                     limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """용어 검색 (삽입 순서, sort="relevance"이면 관련도 순)"""
+        relevance = sort == "relevance" and bool(keyword)
+        results = self.store.query(
+            keyword=keyword,
+            category=category,
+            difficulty_level=difficulty_level,
+            verified_only=verified_only,
+            order_by="rowid",
+            limit=None if relevance else limit or None
+        )
+        if relevance:
+            return self._relevance().rank(keyword, results, limit)
+        return results
+
+    @cached_query
+    def search_terms_page(self,
+                          keyword: str = "",
+                          category: str = "",
+                          difficulty_level: str = "",
+                          verified_only: bool = False,
+                          sort: str = "",
+                          cursor: str = "",
+                          page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """용어 검색 결과 한 페이지 (ID 순서는 기본키 범위 조회로 page_size개만 읽음)"""
+        sort = "relevance" if sort == "relevance" and keyword else "id"
+        after = decode_cursor(cursor, sort)
+        conditions = dict(keyword=keyword, category=category, difficulty_level=difficulty_level,
+                          verified_only=verified_only)
+
+        if sort == "relevance":
+            results = {term["id"]: term for term in self.store.query(**conditions)}
+            scores = self._relevance().score(keyword, results)
+            keys, has_more = paginate(((-score, term_id) for term_id, score in scores.items()), after, page_size)
+            terms = [results[key[-1]] for key in keys]
+            total_count = len(results)
+        else:
+            terms = self.store.query(order_by="id", after=after, limit=page_size + 1, **conditions)
+            has_more = len(terms) > page_size
+            terms = terms[:page_size]
+            keys = [(term["id"],) for term in terms]
+            total_count = self.store.count_matching(**conditions)
+
+        return {
+            "terms": terms,
+            "next_cursor": encode_cursor(sort, keys[-1]) if has_more else None,
+            "total_count": total_count
+        }
+
+    def get_categories(self) -> List[str]:
+        """모든 카테고리 목록 반환"""
+        return sorted(c for c in self.store.group_count("category") if c)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """용어 통계 정보"""
+        total_terms = self.store.count()
+        verified_terms = self.store.count("verified = 1")
+
+        return {
+            "total_terms": total_terms,
+            "verified_terms": verified_terms,
+            "unverified_terms": total_terms - verified_terms,
+            "progress_percentage": round((total_terms / 3000) * 100, 2),
+            "category_distribution": self.store.group_count("category", "미분류"),
+            "difficulty_distribution": self.store.group_count("difficulty_level", "중급"),
+            "target_count": 3000,
+            "remaining": max(0, 3000 - total_terms)
+        }
+
+
+class SQLiteEnhancedTermManager(_SQLiteManagerMixin, EnhancedAgriculturalTermManager):
+    """SQLite 기반 확장 농업용어 관리자"""
+
+    LAZY_INDEXES = _SQLiteManagerMixin.LAZY_INDEXES + (
+        "_korean_index", "_phonetic_index", "_fuzzy_index", "_learning_order_ranker", "_learning_order_index"
+    )
+
+    def __init__(self, db_path: str = None):
+        self.categories = list(self.DEFAULT_CATEGORIES)
+
+        if db_path is None:
+            db_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'enhanced_agricultural_terms.db')
+        self._open_store(db_path)
+        self._korean_index = None
+        self._phonetic_index = None
+        self._fuzzy_index = None
+        self._learning_order_ranker = None
+        self._learning_order_index = None
+
+        if not self.store.load_metadata():
+            self.store.save_metadata({
+                "version": "2.0",
+                "total_terms": 0,
+                "last_updated": datetime.now().isoformat(),
+                "target_count": 8000,
+                "daily_learning_size": 10,
+                "categories": self.categories
+            })
+
+        # 순위 엔진으로 계산하지 않은 DB는 처음 열 때 한 번 전체 재계산 (이후 편집은 그 용어만 이동)
+        if not self._learning_order_ranked():
+            self.recompute_learning_order()
+
+    def _insert_terms(self, new_terms: List[Dict[str, Any]]) -> None:
+        """새 용어들 저장 (한 트랜잭션)"""
+        placed = True
+        if self._learning_order_ranker is not None or self._learning_order_ranked():
+            for term in new_terms:
+                placed = self._assign_learning_order(term) and placed
+        self.store.insert_many(new_terms)
+        self.store.touch()
+        
+        for term in new_terms:
+            self._update_enhanced_lazy_indexes(term)
+        self._query_cache.bump_generation()
+        self._shared.bump()
+        if not placed:
+            self.recompute_learning_order()
+    
+    def _update_enhanced_lazy_indexes(self, term: Dict[str, Any]) -> None:
+        """추가/수정된 용어를 이미 구성한 색인에만 반영"""
+        if self._korean_index is not None:
+            self._korean_index.add(term["id"], term.get("korean_term", ""))
+        if self._phonetic_index is not None:
+            self._phonetic_index.add(term["id"], term)
+        if self._suggest_index is not None:
+            self._suggest_index.add(term["id"], term)
+        if self._fuzzy_index is not None:
+            self._fuzzy_index.add(term["id"], self._headwords(term))
+        if self._relevance_index is not None:
+            self._relevance_index.add(term["id"], term)
+    
+    @shared_mutation
+    def update_enhanced_term(self, term_id: int, **kwargs) -> bool:
+        """용어 정보 수정 (한 행만 갱신, 빈도/난이도/카테고리가 바뀌면 그 용어만 학습 순서에서 이동)"""
+        term = self.store.get(term_id)
+        if not term:
+            return False
+        
+        fields = {field: value for field, value in kwargs.items() if field in self.EDITABLE_FIELDS}
+        fields["updated_date"] = datetime.now().isoformat()
+        term.update(fields)
+        self._normalize_khmer_fields(term)
+        
+        placed = True
+        if any(field in fields for field in self.RANKING_FIELDS) and (
+                self._learning_order_ranker is not None or self._learning_order_ranked()):
+            placed = self._assign_learning_order(term)
+        self.store.insert(term)
+        self.store.touch()
+        
+        self._update_enhanced_lazy_indexes(term)
+        self._query_cache.bump_generation()
+        self._shared.bump()
+        if not placed:
+            self.recompute_learning_order()
+        return True
+    
+    def _learning_order_state(self) -> Tuple[LearningOrderRanker, LearningOrderIndex]:
+        """학습 순서 순위 엔진과 정렬 색인 (처음 사용할 때 구성)"""
+        if self._learning_order_ranker is None:
+            terms = self.store.query()
+            self._learning_order_ranker = LearningOrderRanker(self.categories)
+            self._learning_order_ranker.index_terms(terms)
+            self._learning_order_index = LearningOrderIndex(terms)
+        return self._learning_order_ranker, self._learning_order_index
+    
+    def _learning_order_ranked(self) -> bool:
+        """전체 learning_order를 순위 엔진으로 계산한 DB인지"""
+        return self.store.load_metadata().get("learning_order_ranking") == RANKING_VERSION
+    
+    @shared_mutation
+    def recompute_learning_order(self) -> int:
+        """전체 learning_order를 순위 엔진으로 한 번에 다시 계산 (바뀐 행만 한 트랜잭션으로 갱신)"""
+        terms = self.store.query()
+        ranker = LearningOrderRanker(self.categories)
+        orders = ranker.rank(terms)
+        changed = [term for term in terms if term.get("learning_order") != orders[term["id"]]]
+        for term in changed:
+            term["learning_order"] = orders[term["id"]]
+        
+        self.store.insert_many(changed)
+        self.store.save_metadata({"learning_order_ranking": RANKING_VERSION})
+        self.store.touch()
+        self._learning_order_ranker = ranker
+        self._learning_order_index = LearningOrderIndex(terms)
+        self._query_cache.bump_generation()
+        self._shared.bump()
+        return len(changed)
+    
+    def _fuzzy_matches(self, keyword: str) -> Dict[int, int]:
+        """오타 허용 검색 (표제어 삭제 변형 색인은 처음 사용할 때 구성)"""
+        if self._fuzzy_index is None:
+            self._fuzzy_index = FuzzyIndex()
+            for term in self.store.query():
+                self._fuzzy_index.add(term["id"], self._headwords(term))
+        return self._fuzzy_index.search(keyword)
+    
+    def _match_keyword(self, keyword: str, mode: str = "") -> set:
+        """자모/초성 검색, 발음 소리 검색 (한국어 용어/발음 색인은 처음 사용할 때 구성)"""
+        if mode == "sound":
+            if self._phonetic_index is None:
+                self._phonetic_index = PhoneticIndex()
+                for term in self.store.query():
+                    self._phonetic_index.add(term["id"], term)
+            return self._phonetic_index.search(keyword)
+        
+        if self._korean_index is None:
+            self._korean_index = HangulIndex()
+            for term in self.store.query():
+                self._korean_index.add(term["id"], term.get("korean_term", ""))
+        return self._korean_index.search(keyword)
+
+    @cached_query
+    def get_daily_words(self, day: int, limit: int = 10) -> List[Dict[str, Any]]:
+        """일일 학습용 단어 가져오기 (learning_order 인덱스 사용)"""
+        return self.store.query(order_by="learning_order, rowid", limit=limit, offset=(day - 1) * limit)
+
+    def get_learning_order_ids(self, start: int, count: int) -> List[int]:
+        """학습 순서 start번째(0부터)부터 count개 용어 ID"""
+        return self.store.ids(order_by="learning_order, id", limit=count, offset=start)
+
+    @cached_query
+    def get_words_by_category(self, category: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """카테고리별 단어 가져오기"""
+        return self.store.query(category=category, order_by="learning_order, rowid", limit=limit or None)
+
+    @cached_query
+    def search_enhanced_terms(self,
+                              keyword: str = "",
+                              category: str = "",
+                              difficulty_level: str = "",
+                              frequency_level: int = 0,
+                              verified_only: bool = False,
+                              limit: Optional[int] = None,
+                              mode: str = "",
+                              fuzzy: bool = False,
+                              sort: str = "") -> List[Dict[str, Any]]:
+        """확장된 용어 검색"""
+        relevance = sort == "relevance" and bool(keyword)
+        fuzzy = fuzzy and bool(keyword)
+        conditions = self._search_conditions(keyword, category, difficulty_level, frequency_level, verified_only, mode)
+        
+        if not fuzzy and not relevance:
+            return self.store.query(order_by="learning_order, id", limit=limit or None, **conditions)
+        
+        results, distances = self._search_candidates(keyword, conditions, fuzzy)
+        if relevance:
+            self._relevance()
+            return self._rank_by_relevance(keyword, results, limit)
+        return self._rank_by_distance(results, distances, limit)
+
+    def _search_conditions(self, keyword: str, category: str, difficulty_level: str,
+                           frequency_level: int, verified_only: bool, mode: str) -> Dict[str, Any]:
+        """검색 조건을 store.query 조건으로 (자모/소리 검색은 ID 목록, 크메르어 키워드는 정규화)"""
+        ids = None
+        if keyword and mode in ("jamo", "sound"):
+            ids = self._match_keyword(keyword, mode)
+            keyword = ""
+        elif contains_khmer(keyword):
+            keyword = normalize_khmer(keyword)
+        
+        return dict(
+            keyword=keyword,
+            ids=ids,
+            category=category,
+            difficulty_level=difficulty_level,
+            frequency_level=frequency_level,
+            verified_only=verified_only
+        )
+
+    def _search_candidates(self, keyword: str, conditions: Dict[str, Any],
+                           fuzzy: bool) -> Tuple[List[Dict[str, Any]], Dict[int, int]]:
+        """정렬 전 검색 결과 전체와 오타 허용 검색의 편집 거리 (학습 순서)"""
+        results = self.store.query(order_by="learning_order, id", **conditions)
+        distances = {}
+        if fuzzy:
+            # 정확히 일치하는 용어(거리 0)와 표제어 오타 후보를 합침
+            distances = self._fuzzy_matches(keyword)
+            exact_ids = {term["id"] for term in results}
+            filters = dict(conditions, keyword="", ids=distances)
+            results.extend(term for term in self.store.query(order_by="learning_order, id", **filters)
+                           if term["id"] not in exact_ids)
+            distances.update(dict.fromkeys(exact_ids, 0))
+        return results, distances
+
+    @cached_query
+    def search_enhanced_page(self,
+                             keyword: str = "",
+                             category: str = "",
+                             difficulty_level: str = "",
+                             frequency_level: int = 0,
+                             verified_only: bool = False,
+                             mode: str = "",
+                             fuzzy: bool = False,
+                             sort: str = "",
+                             cursor: str = "",
+                             page_size: int = DEFAULT_PAGE_SIZE,
+                             facets: bool = False) -> Dict[str, Any]:
+        """확장 검색 결과 한 페이지 (학습 순서는 (learning_order, id) 인덱스 범위 조회로 page_size개만 읽음)"""
+        relevance = sort == "relevance" and bool(keyword)
+        fuzzy = fuzzy and bool(keyword)
+        conditions = self._search_conditions(keyword, category, difficulty_level, frequency_level, verified_only, mode)
+        
+        if not fuzzy and not relevance:
+            after = decode_cursor(cursor, "learning_order")
+            terms = self.store.query(order_by="learning_order, id", after=after, limit=page_size + 1, **conditions)
+            has_more = len(terms) > page_size
+            terms = terms[:page_size]
+            page = {
+                "terms": terms,
+                "next_cursor": encode_cursor("learning_order", (terms[-1].get("learning_order", 999999), terms[-1]["id"]))
+                if has_more else None,
+                "total_count": self.store.count_matching(**conditions)
+            }
+            if facets:
+                page["facets"] = self.store.facet_histogram(**conditions)
+            return page
+        
+        results, distances = self._search_candidates(keyword, conditions, fuzzy)
+        if relevance:
+            self._relevance()
+        by_id = {term["id"]: term for term in results}
+        sort, keys = self._page_keys(results, keyword, sort, fuzzy, distances)
+        keys, has_more = paginate(keys, decode_cursor(cursor, sort), page_size)
+        page = {
+            "terms": [by_id[key[-1]] for key in keys],
+            "next_cursor": encode_cursor(sort, keys[-1]) if has_more else None,
+            "total_count": len(results)
+        }
+        if facets:
+            page["facets"] = facet_histogram(results)
+        return page
+
+    @cached_query
+    def get_search_facets(self,
+                          keyword: str = "",
+                          category: str = "",
+                          difficulty_level: str = "",
+                          frequency_level: int = 0,
+                          verified_only: bool = False,
+                          mode: str = "",
+                          fuzzy: bool = False) -> Dict[str, Dict[Any, int]]:
+        """검색 결과 전체의 패싯별 값 개수 (GROUP BY 한 번, 오타 허용 검색은 결과를 한 번 순회)"""
+        conditions = self._search_conditions(keyword, category, difficulty_level, frequency_level, verified_only, mode)
+        if fuzzy and keyword:
+            return facet_histogram(self._search_candidates(keyword, conditions, True)[0])
+        return self.store.facet_histogram(**conditions)
+
+    def get_learning_statistics(self) -> Dict[str, Any]:
+        """학습용 통계 정보"""
+        total_terms = self.store.count()
+        verified_terms = self.store.count("verified = 1")
+
+        frequency_stats = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
+        frequency_stats.update(self.store.group_count("frequency_level", 3))
+
+        total_days_needed = (total_terms + 9) // 10  # 올림
+
+        return {
+            "total_terms": total_terms,
+            "verified_terms": verified_terms,
+            "unverified_terms": total_terms - verified_terms,
+            "target_count": 8000,
+            "progress_percentage": round((total_terms / 8000) * 100, 2),
+            "category_distribution": self.store.group_count("category", "미분류"),
+            "frequency_distribution": frequency_stats,
+            "difficulty_distribution": self.store.group_count("difficulty_level", "중급"),
+            "remaining": max(0, 8000 - total_terms),
+            "total_learning_days": total_days_needed,
+            "current_day": min(total_days_needed, (total_terms + 9) // 10)
+        }
+
+
+def migrate_json_to_sqlite(json_path: str, db_path: str, enhanced: bool = False) -> int:
+    """JSON 데이터 파일을 SQLite DB로 한 번에 이전 (이전한 용어 수 반환)
+
+    JSON 관리자로 읽으므로 스냅샷에 아직 압축되지 않은 저널의 변경까지 이전됩니다.
+    """
+    source_class = EnhancedAgriculturalTermManager if enhanced else AgriculturalTermManager
+    data = source_class(json_path).data
+
+    manager_class = SQLiteEnhancedTermManager if enhanced else SQLiteAgriculturalTermManager
+    manager = manager_class(db_path)
+
+    terms = data.get("terms", [])
+    if enhanced:
+        for term in terms:
+            manager._normalize_khmer_fields(term)
+
+    manager.store.insert_many(terms)
+    manager.store.save_metadata(data.get("metadata", {}))
+    manager.store.touch()
+
+    return manager.store.count()
+
+
+def _storage_backend() -> str:
+    return os.environ.get("TERM_STORAGE_BACKEND", "json").lower()
+
+
+def create_term_manager(data_file_path: str = None) -> AgriculturalTermManager:
+    """설정된 저장소에 맞는 농업용어 관리자 생성"""
+    if _storage_backend() != "sqlite":
+        return AgriculturalTermManager(data_file_path)
+
+    json_path = data_file_path or os.path.join(os.path.dirname(__file__), '..', 'data', 'agricultural_terms.json')
+    db_path = os.path.splitext(json_path)[0] + '.db'
+    if not os.path.exists(db_path) and os.path.exists(json_path):
+        migrate_json_to_sqlite(json_path, db_path)
+    return SQLiteAgriculturalTermManager(db_path)
+
+
+def create_enhanced_term_manager(data_file_path: str = None) -> EnhancedAgriculturalTermManager:
+    """설정된 저장소에 맞는 확장 농업용어 관리자 생성"""
+    if _storage_backend() != "sqlite":
+        return EnhancedAgriculturalTermManager(data_file_path)
+
+    json_path = data_file_path or os.path.join(os.path.dirname(__file__), '..', 'data', 'enhanced_agricultural_terms.json')
+    db_path = os.path.splitext(json_path)[0] + '.db'
+    if not os.path.exists(db_path) and os.path.exists(json_path):
+        migrate_json_to_sqlite(json_path, db_path, enhanced=True)
+    return SQLiteEnhancedTermManager(db_path)
+
+
+if __name__ == "__main__":
+    # JSON → SQLite 일괄 이전
+    data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+    targets = [
+        ("agricultural_terms.json", False),
+        ("enhanced_agricultural_terms.json", True)
+    ]
+
+    json_paths = [(os.path.join(data_dir, name), enhanced) for name, enhanced in targets]
+    if len(sys.argv) > 1:
+        json_paths = [(path, "enhanced" in os.path.basename(path)) for path in sys.argv[1:]]
+
+    print("🗄️ JSON → SQLite 이전")
+    for json_path, enhanced in json_paths:
+        db_path = os.path.splitext(json_path)[0] + '.db'
+        count = migrate_json_to_sqlite(json_path, db_path, enhanced=enhanced)
+        print(f"  ✅ {os.path.basename(json_path)} → {os.path.basename(db_path)}: {count:,}개 용어")
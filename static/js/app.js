@@ -41,16 +41,34 @@ function initializeSearch() {
     const searchForm = document.querySelector('form[action*="search"]');
     
     if (searchInput) {
-        // 실시간 검색 제안
+        // 실시간 검색 제안 (전체 검색 대신 /api/suggest 자동완성 사용)
+        const suggestionList = document.createElement('datalist');
+        suggestionList.id = 'keyword-suggestions';
+        searchInput.after(suggestionList);
+        searchInput.setAttribute('list', suggestionList.id);
+        searchInput.setAttribute('autocomplete', 'off');
+        
         let searchTimeout;
         searchInput.addEventListener('input', function() {
             clearTimeout(searchTimeout);
-            searchTimeout = setTimeout(() => {
-                if (this.value.length >= 2) {
-                    // 실시간 검색 제안 로직 (필요시 구현)
-                    console.log('검색어:', this.value);
+            searchTimeout = setTimeout(async () => {
+                const query = this.value.trim();
+                if (!query) {
+                    suggestionList.innerHTML = '';
+                    return;
+                }
+                
+                const data = await API.suggestTerms(query);
+                if (data.success) {
+                    suggestionList.innerHTML = '';
+                    data.suggestions.forEach(term => {
+                        const option = document.createElement('option');
+                        option.value = term.korean_term;
+                        option.label = `${term.khmer_term} ${term.english_term || ''}`.trim();
+                        suggestionList.appendChild(option);
+                    });
                 }
-            }, 300);
+            }, 150);
         });
         
         // 엔터키 검색
@@ -193,6 +211,22 @@ const API = {
         }
     },
     
+    // 자동완성 후보
+    suggestTerms: async function(query, lang = '', limit = 10) {
+        try {
+            const url = new URL('/api/suggest', window.location.origin);
+            url.searchParams.append('q', query);
+            if (lang) url.searchParams.append('lang', lang);
+            url.searchParams.append('limit', limit);
+            
+            const response = await fetch(url);
+            return await response.json();
+        } catch (error) {
+            console.error('자동완성 API 오류:', error);
+            return { success: false, error: error.message };
+        }
+    },
+    
     // 통계 정보 가져오기
     getStatistics: async function() {
         try {
@@ -39,10 +39,13 @@ class ImprovedAgriculturalLearningApp {
 
     async loadDailyWords() {
         try {
-            const response = await fetch(`/api/daily-words/${this.currentDay}`);
-            if (!response.ok) throw new Error('단어를 불러올 수 없습니다');
-            
-            this.dailyWords = await response.json();
+            this.dailyWords = await this.loadDailyPackWords(this.currentDay);
+            if (!this.dailyWords) {
+                const response = await fetch(`/api/daily-words/${this.currentDay}`);
+                if (!response.ok) throw new Error('단어를 불러올 수 없습니다');
+                
+                this.dailyWords = await response.json();
+            }
             
             if (this.dailyWords.length === 0) {
                 throw new Error('학습할 단어가 없습니다');
@@ -55,6 +58,27 @@ class ImprovedAgriculturalLearningApp {
         }
     }
 
+    // 일일 단어 묶음에서 해당 날짜 단어 가져오기 (묶음은 내용 해시 이름이라 서비스 워커 캐시에서 바로 제공)
+    async loadDailyPackWords(day) {
+        try {
+            const manifestResponse = await fetch('/api/daily-packs/manifest.json');
+            if (!manifestResponse.ok) return null;
+            
+            const manifest = await manifestResponse.json();
+            const pack = manifest.packs.find(entry => entry.first_day <= day && day <= entry.last_day);
+            if (!pack) return null;
+            
+            const packResponse = await fetch(`/api/daily-packs/${pack.file}`);
+            if (!packResponse.ok) return null;
+            
+            const data = await packResponse.json();
+            return data.days[String(day)] || null;
+        } catch (error) {
+            console.warn('일일 단어 묶음 로드 실패:', error);
+            return null;
+        }
+    }
+
     getSampleWords() {
         return [
             {
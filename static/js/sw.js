@@ -3,7 +3,7 @@
  * PWA 오프라인 지원 및 캐싱
  */
 
-const CACHE_NAME = 'agricultural-terms-v2.0';
+const CACHE_NAME = 'agricultural-terms-v2.1';
 const urlsToCache = [
   '/mobile/improved',
   '/static/js/improved_mobile_app.js',
@@ -45,8 +45,28 @@ self.addEventListener('activate', event => {
   );
 });
 
+// 매번 서버에 확인해야 하는 주소 (ETag로 304를 받고, 오프라인이면 캐시)
+function isRevalidatedRequest(url) {
+  return url.pathname === '/api/daily-packs/manifest.json' || url.pathname.startsWith('/api/daily-words/');
+}
+
 // Fetch 이벤트 처리
 self.addEventListener('fetch', event => {
+  if (isRevalidatedRequest(new URL(event.request.url))) {
+    event.respondWith(
+      fetch(event.request)
+        .then(response => {
+          if (response && response.status === 200) {
+            const responseToCache = response.clone();
+            caches.open(CACHE_NAME).then(cache => cache.put(event.request, responseToCache));
+          }
+          return response;
+        })
+        .catch(() => caches.match(event.request))
+    );
+    return;
+  }
+
   event.respondWith(
     caches.match(event.request)
       .then(response => {